@@ -0,0 +1,140 @@
+"""
+Build step generating the app's image assets. Run it before building the apk, e.g.:
+
+    python IGNORE_BUILD_assets.py --density xhdpi
+
+    - Validates that all third party images are cited (see `IGNORE_BUILD_ensure_images_cited.py`).
+    - Downscales all images of the app for the target screen density
+      (source images are meant for `SOURCE_DENSITY`).
+    - Packs the small ones into a kivy atlas, so that they are loaded from a single file and texture.
+
+Generated files are written to `assets.GENERATED_ASSETS_DIR`, and the app uses them through `assets.asset_uri()`.
+Every image the app uses is generated (even if not downscaled), so that the directories of the source images
+are left out of the apk (see `source.exclude_dirs` of buildozer.spec).
+
+Requires kivy and Pillow (only for building; the app itself doesn't need Pillow).
+"""
+
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+import assets
+from IGNORE_BUILD_ensure_images_cited import ensure_images_cited
+
+
+# Screen densities (as multiples of android's baseline density).
+DENSITIES = {
+    'ldpi': .75,
+    'mdpi': 1.,
+    'hdpi': 1.5,
+    'xhdpi': 2.,
+    'xxhdpi': 3.,
+}
+SOURCE_DENSITY = DENSITIES['xxhdpi']
+
+IMAGES_DIRS = ('own_images', 'third_parties_images')
+# (used only by buildozer, at their original size, e.g. as the app icon)
+EXCLUDED_IMAGES = {'own_images/minustimesminus_icon.png'}
+
+# Images up to this size (pixels, after downscaling) are packed into the atlas.
+ATLAS_MAX_IMAGE_SIZE = 512
+ATLAS_PAGE_SIZE = 1024
+
+
+def source_images():
+    """
+    :return: (list) Paths of the images used by the app.
+    """
+    paths = []
+    for images_dir in IMAGES_DIRS:
+        for file_name in sorted(os.listdir(images_dir)):
+            path = '/'.join([images_dir, file_name])
+            if path not in EXCLUDED_IMAGES and file_name.lower().endswith(('.png', '.jpg')):
+                paths.append(path)
+
+    ids = [assets.atlas_id(path) for path in paths]
+    duplicate_ids = {i for i in ids if ids.count(i) > 1}
+    if duplicate_ids:
+        raise ValueError('Images of same name (atlas id) in different directories: {}'.format(duplicate_ids))
+    return paths
+
+
+def downscale(path, out_path, scale):
+    """
+    :return: (tuple) Size of the downscaled image.
+    """
+    from PIL import Image
+
+    image = Image.open(path)
+    size = tuple(max(1, int(round(v * scale))) for v in image.size)
+    if size != image.size:
+        image = image.resize(size, Image.LANCZOS)
+    image.save(out_path)
+    return size
+
+
+def build(density, out_dir=assets.GENERATED_ASSETS_DIR):
+    """
+    :return: (dict) Source path to generated uri.
+    """
+    from kivy.atlas import Atlas
+
+    ensure_images_cited()
+    scale = min(1., DENSITIES[density] / SOURCE_DENSITY)
+
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir)
+
+    atlas_images = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for path in source_images():
+            temp_path = os.path.join(temp_dir, os.path.basename(path))
+            size = downscale(path=path, out_path=temp_path, scale=scale)
+            if max(size) <= ATLAS_MAX_IMAGE_SIZE:
+                atlas_images.append(temp_path)
+            else:
+                out_path = os.path.join(out_dir, path)
+                os.makedirs(os.path.dirname(out_path), exist_ok=True)
+                # (not re-encoded if not downscaled, which might only enlarge it)
+                shutil.copyfile(temp_path if scale < 1 else path, out_path)
+
+        if atlas_images:
+            Atlas.create(os.path.join(out_dir, assets.ATLAS_NAME), atlas_images, ATLAS_PAGE_SIZE)
+
+    return check_generated(generated_dir=out_dir)
+
+
+def check_generated(generated_dir=assets.GENERATED_ASSETS_DIR):
+    """
+    Since the source images are left out of the apk, all of them have to be generated
+    (see `IGNORE_BUILD_p4a_hook.py`, which calls it before the apk is built).
+
+    :return: (dict) Source path to generated uri.
+    :raise ValueError: If any image isn't generated (e.g. this step wasn't run, or not since an image was added).
+    """
+    uris = {path: assets.asset_uri(path, generated_dir=generated_dir) for path in source_images()}
+    not_generated = sorted(path for path, uri in uris.items() if uri == path)
+    if not_generated:
+        raise ValueError('Images not generated (they would be missing from the apk), '
+                         'run `python IGNORE_BUILD_assets.py` first: {}'.format(not_generated))
+    return uris
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python IGNORE_BUILD_assets.py')
+    parser.add_argument('--density', choices=sorted(DENSITIES, key=DENSITIES.get), default='xhdpi',
+                        help='Screen density of the target devices.')
+    args = parser.parse_args(argv)
+
+    for path, uri in sorted(build(density=args.density).items()):
+        print('{:<50} {}'.format(path, uri))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
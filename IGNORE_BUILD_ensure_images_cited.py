@@ -1,12 +1,21 @@
 import os
 import citations
 
-INCLUDED_IMAGES = set(os.listdir('third_parties_images'))
-CITED_IMAGES = citations.IMAGES_CITED
-FILES_NOT_CITED = INCLUDED_IMAGES - CITED_IMAGES
-if INCLUDED_IMAGES - CITED_IMAGES:
-    raise NotImplementedError('Following image files were not cited: {}'.format(FILES_NOT_CITED))
-
-REDUNDANT_CITATIONS = CITED_IMAGES - INCLUDED_IMAGES
-if REDUNDANT_CITATIONS:
-    print('Found citations without their corresponding image: {}'.format(REDUNDANT_CITATIONS))
\ No newline at end of file
+
+def ensure_images_cited(images_dir='third_parties_images'):
+    """
+    :raise NotImplementedError: If an image isn't cited.
+    """
+    included_images = set(os.listdir(images_dir))
+    cited_images = citations.IMAGES_CITED
+    files_not_cited = included_images - cited_images
+    if files_not_cited:
+        raise NotImplementedError('Following image files were not cited: {}'.format(files_not_cited))
+
+    redundant_citations = cited_images - included_images
+    if redundant_citations:
+        print('Found citations without their corresponding image: {}'.format(redundant_citations))
+
+
+if __name__ == '__main__':
+    ensure_images_cited()
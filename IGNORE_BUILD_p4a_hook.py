@@ -0,0 +1,27 @@
+"""
+Hook of python-for-android (see `p4a.hook` of buildozer.spec).
+
+Fails the build if the images of the app weren't generated by `IGNORE_BUILD_assets.py`,
+since the source images are left out of the apk.
+"""
+
+
+import os
+import sys
+
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def before_apk_build(toolchain):
+    if SOURCE_DIR not in sys.path:
+        sys.path.insert(0, SOURCE_DIR)
+    import IGNORE_BUILD_assets
+
+    cwd = os.getcwd()
+    # (paths of images are relative to the source dir)
+    os.chdir(SOURCE_DIR)
+    try:
+        IGNORE_BUILD_assets.check_generated()
+    finally:
+        os.chdir(cwd)
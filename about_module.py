@@ -1,4 +1,4 @@
-import main
+import core
 
 
 _MIT_LICENCE = """Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
@@ -17,7 +17,7 @@ KIVY_LICENCE = '{}\n\n{}'.format(_KIVY_LICENCE_FIRST_LINE, _MIT_LICENCE)
 DISCLAIMER = '''\n\n\n[b]Disclaimer[/b]\n
 The rewards exist only for cosmetic purposes, and have no real currency value.\n\n'''
 
-ABOUT_TEXT = '[b]{} licence[/b]\n\n'.format(main.APP_NAME)
+ABOUT_TEXT = '[b]{} licence[/b]\n\n'.format(core.APP_NAME)
 ABOUT_TEXT += '[size=12]{}[/size]\n\n\n'.format(PROJECT_LICENCE)
 ABOUT_TEXT += '[b]Kivy licence[/b]\n\n'
 ABOUT_TEXT += '[size=12]{}[/size]'.format(KIVY_LICENCE)
@@ -22,8 +22,12 @@ Examples of what should NOT be implemented:
 """
 
 
+import collections
 import decimal
+import operator
 import random
+import threading
+
 import languages
 
 
@@ -36,6 +40,214 @@ DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP = {
 
 TOTAL_DIFFICULTY_LVLS = len(DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP)
 
+# Terms are stored as fixed-point integers, scaled by 10**decimals
+# (e.g. with 1 decimal, -2.3 is stored as -23).
+TERMS_TYPE_TO_DECIMALS_MAP = {
+    'int': 0,
+    'float': 1,
+}
+
+OPERATION_TO_FUNC_MAP = {
+    'addition': operator.add,
+    'multiplication': operator.mul,
+}
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def fixed_point_as_string(scaled_num, decimals):
+    """
+    Formats a fixed-point integer with the given number of decimals.
+
+    E.g. (-23, 1) -> '-2.3', (5, 2) -> '0.05', (7, 0) -> '7'.
+
+    :param scaled_num: (int) Number multiplied by 10**decimals.
+    :param decimals: (int)
+    :return: (str)
+    """
+    if not decimals:
+        return str(scaled_num)
+
+    int_part, decimal_part = divmod(abs(scaled_num), 10 ** decimals)
+    sign = '-' if scaled_num < 0 else ''
+    return '{sign}{int_part}.{decimal_part:0{decimals}d}'.format(
+        sign=sign, int_part=int_part, decimal_part=decimal_part, decimals=decimals)
+
+
+def fixed_point_as_number(scaled_num, decimals):
+    """
+    Converts a fixed-point integer to an int (no decimals) or an exact Decimal.
+
+    :param scaled_num: (int)
+    :param decimals: (int)
+    :return: (int or Decimal)
+    """
+    if not decimals:
+        return scaled_num
+    return decimal.Decimal(scaled_num).scaleb(-decimals)
+
+
+def fixed_point_equal(scaled_num_1, decimals_1, scaled_num_2, decimals_2):
+    """
+    Exact comparison of fixed-point numbers having different numbers of decimals.
+
+    :return: (bool)
+    """
+    if decimals_1 < decimals_2:
+        return scaled_num_1 * 10 ** (decimals_2 - decimals_1) == scaled_num_2
+    return scaled_num_1 == scaled_num_2 * 10 ** (decimals_1 - decimals_2)
+
+
+# (various languages use different marks as decimal separators; see `languages` module)
+DECIMAL_SEPARATORS = '.,'
+
+
+def parse_answer(answer_str, separators=DECIMAL_SEPARATORS):
+    """
+    Parses an answer as typed on the numpad:
+    optional sign, digits and at most one decimal separator (e.g. '-2.30', '+7', '3,5', '4.').
+
+    :param answer_str: (str)
+    :param separators: (str) Accepted decimal separators.
+    :return: (tuple or None) (fixed-point int, decimals), or None if the answer is not a number.
+    """
+    length = len(answer_str)
+    index = 0
+    negative = False
+    if length and answer_str[0] in '+-':
+        negative = answer_str[0] == '-'
+        index = 1
+
+    scaled_num = 0
+    digits = 0
+    decimals = 0
+    separator_found = False
+    while index < length:
+        char = answer_str[index]
+        if '0' <= char <= '9':
+            scaled_num = scaled_num * 10 + ord(char) - 48
+            digits += 1
+            if separator_found:
+                decimals += 1
+        elif char in separators and not separator_found:
+            separator_found = True
+        else:
+            return None
+        index += 1
+
+    if not digits:
+        return None
+
+    if negative:
+        scaled_num = -scaled_num
+    return scaled_num, decimals
+
+
+def term_as_string(term, zero_sign, term_str=None):
+    """
+    Converts a single term to its signed string.
+
+    0 gets the given sign explicitly instead of using `{:+f}` for all terms' formatting
+    since the latter can't achieve that.
+
+    :param term: (num)
+    :param zero_sign: (str) '+' or '-'; used only when term is 0.
+    :param term_str: (str) Already formatted term (e.g. a fixed-point term); defaults to `str(term)`.
+    :return: (str)
+    """
+    if term_str is None:
+        term_str = str(term)
+
+    if term > 0:
+        return '+' + term_str
+    elif term == 0:
+        # lstrip() since sometimes a -0.0 can be given
+        return zero_sign + term_str.lstrip('-')
+    else:
+        return term_str
+
+
+def join_terms_strings(terms_as_strings, op_type):
+    """
+    Creates the operation string presented to the user out of the terms' strings.
+
+    :param terms_as_strings: (list)
+    :param op_type: (str)
+    :return: (str)
+    """
+    if op_type == 'addition':
+        # (whitespace between terms for better visibility)
+        return ' '.join(terms_as_strings)
+
+    elif op_type == 'multiplication':
+        # (whitespace between terms for better visibility)
+        return ' '.join(['({})'.format(t) for t in terms_as_strings])
+
+    else:
+        raise NotImplementedError('{}'.format(op_type))
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Counter-based random numbers
+#
+# Each (seed, counter) pair is a separate SplitMix64 stream, whose values depend only on the pair;
+# there is no shared state, so e.g. question #k of a seed can be recreated directly
+# (and generation can be split across processes in any way).
+_MASK_64 = (1 << 64) - 1
+_SPLITMIX_GAMMA = 0x9E3779B97F4A7C15
+
+
+def _mix_64(z):
+    """
+    SplitMix64 finalizer.
+
+    :param z: (int) 64-bit
+    :return: (int) 64-bit
+    """
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return z ^ (z >> 31)
+
+
+class CounterRandom(object):
+    """
+    Implements the parts of the `random.Random` interface used by the generators
+    (`random`, `randint`, `choice`) on top of a SplitMix64 stream keyed by (seed, counter).
+
+    Only integer operations and exactly representable floats are used,
+    so the results are bit-identical on every platform.
+    """
+
+    def __init__(self, seed, counter=0):
+        """
+        :param seed: (int)
+        :param counter: (int) E.g. question number.
+        """
+        self._state = _mix_64((_mix_64((seed + _SPLITMIX_GAMMA) & _MASK_64) ^ counter) & _MASK_64)
+
+    def next_64(self):
+        self._state = (self._state + _SPLITMIX_GAMMA) & _MASK_64
+        return _mix_64(self._state)
+
+    def random(self):
+        """
+        :return: (float) In [0, 1); multiples of 2**-53.
+        """
+        return (self.next_64() >> 11) * (1. / (1 << 53))
+
+    def _randbelow(self, n):
+        # (rejection sampling, in order to avoid modulo bias)
+        limit = ((1 << 64) // n) * n
+        while True:
+            x = self.next_64()
+            if x < limit:
+                return x % n
+
+    def randint(self, a, b):
+        return a + self._randbelow(b - a + 1)
+
+    def choice(self, seq):
+        return seq[self._randbelow(len(seq))]
+
 
 # ----------------------------------------------------------------------------------------------------------------------
 class Terms(object):
@@ -45,27 +257,47 @@ class Terms(object):
     TERMS_TYPES = {'int', 'float'}
     MAX_ABS_VALUE = 10
 
-    def __init__(self, difficulty_lvl):
+    def __init__(self, difficulty_lvl, rng=None):
+        """
+        :param difficulty_lvl: (str)
+        :param rng: Object with the `random.Random` interface (e.g. `CounterRandom`).
+            Defaults to the `random` module.
+        """
         self.terms_count = DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP[difficulty_lvl]['terms_count']
         self.terms_type = DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP[difficulty_lvl]['terms_type']
+        self.decimals = TERMS_TYPE_TO_DECIMALS_MAP[self.terms_type]
+        self.rng = rng or random
 
     @staticmethod
-    def _int_term(max_val=MAX_ABS_VALUE):
-        return random.randint(0, max_val)
+    def _int_term(max_val=MAX_ABS_VALUE, rng=random):
+        return rng.randint(0, max_val)
 
     @staticmethod
-    def _float_term(max_val=MAX_ABS_VALUE):
-        return random.random() * max_val
+    def _float_term(max_val=MAX_ABS_VALUE, rng=random):
+        return rng.random() * max_val
 
     @staticmethod
-    def final_term(term_without_sign):
+    def _scaled_term(decimals, max_val=MAX_ABS_VALUE, rng=random):
+        """
+        Creates a fixed-point term without sign, scaled by 10**decimals.
+
+        Equivalent to rounding (half up) `_float_term()` to `decimals`,
+        but done with integers only: round(x) == floor(2x + 1) // 2.
+
+        :param decimals: (int)
+        :return: (int)
+        """
+        return (int(rng.random() * 2 * max_val * 10 ** decimals) + 1) // 2
+
+    @staticmethod
+    def final_term(term_without_sign, rng=random):
         """
         Creates a single term.
 
         :param term_without_sign:
         :return: (num)
         """
-        sign = random.choice(['-', '+'])
+        sign = rng.choice(['-', '+'])
 
         if sign == '-':
             final_term = -1 * term_without_sign
@@ -85,24 +317,46 @@ class Terms(object):
             raise NotImplemented('{}'.format(self.terms_type))
 
         for _ in range(self.terms_count):
-            term_without_sign = func()
-            final_term = self.final_term(term_without_sign=term_without_sign)
+            term_without_sign = func(rng=self.rng)
+            final_term = self.final_term(term_without_sign=term_without_sign, rng=self.rng)
             lst.append(final_term)
 
         return lst
 
+    def all_scaled_terms(self):
+        """
+        Creates all terms as fixed-point integers (scaled by 10**`self.decimals`).
+
+        :return: (list)
+        """
+        lst = []
+
+        for _ in range(self.terms_count):
+            if self.decimals:
+                term_without_sign = self._scaled_term(decimals=self.decimals, rng=self.rng)
+            else:
+                term_without_sign = self._int_term(rng=self.rng)
+            lst.append(self.final_term(term_without_sign=term_without_sign, rng=self.rng))
+
+        return lst
+
 
 class QuestionAndAnswer(object):
     """
     Based on difficulty and operation type,
-    creates terms (either float or ints) which are then rounded to allow
-    specific number of decimals.
+    creates terms (either float or ints) with a specific number of decimals.
+
+    Terms are created and stored as fixed-point integers;
+    they are converted to numbers or strings only when requested.
     """
 
     OPERATIONS_TYPES = ('addition', 'multiplication')
 
-    def __init__(self, difficulty_lvl, op_type):
-        self.terms_as_numbers = Terms(difficulty_lvl=difficulty_lvl).all_terms()
+    def __init__(self, difficulty_lvl, op_type, rng=None):
+        terms = Terms(difficulty_lvl=difficulty_lvl, rng=rng)
+        self.rng = terms.rng
+        self.scaled_terms = terms.all_scaled_terms()
+        self.decimals = terms.decimals
         self.op_type = op_type
 
     @staticmethod
@@ -113,19 +367,11 @@ class QuestionAndAnswer(object):
 
     def terms_to_rounded_numbers(self):
         """
-        Ensures all terms have an appropriate number of decimals.
+        Converts terms to numbers having an appropriate number of decimals.
 
         :return: (list)
         """
-        lst = []
-
-        for t in self.terms_as_numbers:
-            if not isinstance(t, int):
-                t = self.round_single_term_1_decimals(given_float=t)
-
-            lst.append(t)
-
-        return lst
+        return [fixed_point_as_number(scaled_num=t, decimals=self.decimals) for t in self.scaled_terms]
 
     def terms_as_strings(self):
         """
@@ -138,16 +384,9 @@ class QuestionAndAnswer(object):
         """
         lst = []
 
-        for t in self.terms_to_rounded_numbers():
-
-            if t > 0:
-                lst.append('+{}'.format(t))
-            elif t == 0:
-                random_sign = random.choice(['+', '-'])
-                # using abs() since sometimes a -0.0 can be given
-                lst.append('{sign}{term}'.format(sign=random_sign, term=abs(t)))
-            else:
-                lst.append(str(t))
+        for t in self.scaled_terms:
+            t_str = fixed_point_as_string(scaled_num=t, decimals=self.decimals)
+            lst.append(term_as_string(term=t, zero_sign=self.rng.choice(['+', '-']), term_str=t_str))
 
         return lst
 
@@ -157,77 +396,477 @@ class QuestionAndAnswer(object):
 
         :return: (str)
         """
+        return join_terms_strings(terms_as_strings=self.terms_as_strings(), op_type=self.op_type)
 
-        terms_as_strings = self.terms_as_strings()
-
-        if self.op_type == 'addition':
-            # (whitespace between terms for better visibility)
-            op_str = ' '.join(terms_as_strings)
+    def answer_decimals(self):
+        return answer_decimals(decimals=self.decimals, terms_count=len(self.scaled_terms), op_type=self.op_type)
 
-        elif self.op_type == 'multiplication':
-            op_str = ''
-            for t in terms_as_strings:
-                # (whitespace between terms for better visibility)
-                if op_str:
-                    op_str += ' '
-                op_str += '({})'.format(t)
-
-        else:
-            raise NotImplemented('{}'.format(self.op_type))
-
-        return op_str
-
-    def expected_answer(self):
+    def scaled_expected_answer(self):
+        """
+        Exact answer as a fixed-point integer, scaled by 10**`self.answer_decimals()`.
 
+        :return: (int)
+        """
         if self.op_type == 'addition':
             result = 0
-            for t in self.terms_to_rounded_numbers():
+            for t in self.scaled_terms:
                 result += t
 
         elif self.op_type == 'multiplication':
             result = 1
-            for t in self.terms_to_rounded_numbers():
+            for t in self.scaled_terms:
                 result *= t
 
         else:
-            raise NotImplemented('{}'.format(self.op_type))
+            raise NotImplementedError('{}'.format(self.op_type))
 
         return result
 
+    def expected_answer(self):
+        return fixed_point_as_number(scaled_num=self.scaled_expected_answer(), decimals=self.answer_decimals())
 
-if __name__ == '__main__':
 
-    # VISUAL TESTS
-    if 1:
-
-        # --------------------------------------------------
-        # all_terms()
-        print('\n'+'-'*80)
-        print('TERMS')
-
-        def print_all_terms(difficulty_lvl):
-            print('\nDifficulty {}'.format(difficulty_lvl))
-            # (terms' lists printed for each difficulty lvl)
-            terms_lsts_count = 3
-            for _ in range(terms_lsts_count):
-                print(Terms(difficulty_lvl=difficulty_lvl).all_terms())
-
-        # (tests all difficulties)
-        for d in range(1, TOTAL_DIFFICULTY_LVLS + 1):
-            print_all_terms(difficulty_lvl=d)
-
-        # --------------------------------------------------
-        # operation_str() and answer
-        print('\n'+'-'*80)
-        print('OPERATION STRING')
-        for d in range(1, TOTAL_DIFFICULTY_LVLS + 1):
-            print('\nDifficulty: {}'.format(d))
-
-            for operation in QuestionAndAnswer.OPERATIONS_TYPES:
-
-                for _ in range(3):
-                    inst = QuestionAndAnswer(difficulty_lvl=d, op_type=operation)
-                    question = inst.operation_str()
-                    answer = inst.expected_answer()
-                    msg = '{q} = {a}'.format(q=question, a=answer)
-                    print(msg)
+def answer_decimals(decimals, terms_count, op_type):
+    """
+    Decimals of the (exact) answer when all terms have `decimals` decimals.
+
+    Addition keeps the decimals of the terms, while multiplication adds them up.
+
+    :return: (int)
+    """
+    if op_type == 'addition':
+        return decimals
+    elif op_type == 'multiplication':
+        return decimals * terms_count
+    else:
+        raise NotImplementedError('{}'.format(op_type))
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class Question(object):
+    """
+    Immutable question record.
+
+    Terms, the rendered operation string and the answer are computed once at construction,
+    so the same instance can be shared (e.g. between widgets or workers) and always displays the same.
+
+    Terms and answer are fixed-point integers,
+    scaled by 10**`decimals` and 10**`answer_decimals` respectively.
+    """
+
+    __slots__ = ('difficulty_lvl', 'op_type', 'terms', 'decimals', 'question_str', 'answer', 'answer_decimals')
+
+    def __init__(self, difficulty_lvl, op_type, terms, negatives):
+        """
+        :param difficulty_lvl: (str)
+        :param op_type: (str)
+        :param terms: (iterable) Fixed-point terms.
+        :param negatives: (iterable) Whether the sign of each term is a minus (decides the displayed sign of 0).
+        """
+        if op_type not in OPERATION_TO_FUNC_MAP:
+            raise NotImplementedError('{}'.format(op_type))
+
+        terms = tuple(terms)
+        decimals = TERMS_TYPE_TO_DECIMALS_MAP[DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP[difficulty_lvl]['terms_type']]
+
+        terms_as_strings = []
+        for t, negative in zip(terms, negatives):
+            t_str = fixed_point_as_string(scaled_num=t, decimals=decimals)
+            terms_as_strings.append(term_as_string(term=t, zero_sign='-' if negative else '+', term_str=t_str))
+
+        func = OPERATION_TO_FUNC_MAP[op_type]
+        answer = terms[0]
+        for t in terms[1:]:
+            answer = func(answer, t)
+
+        _set = object.__setattr__
+        _set(self, 'difficulty_lvl', difficulty_lvl)
+        _set(self, 'op_type', op_type)
+        _set(self, 'terms', terms)
+        _set(self, 'decimals', decimals)
+        _set(self, 'question_str', join_terms_strings(terms_as_strings=terms_as_strings, op_type=op_type))
+        _set(self, 'answer', answer)
+        _set(self, 'answer_decimals', answer_decimals(decimals=decimals, terms_count=len(terms), op_type=op_type))
+
+    def __setattr__(self, key, value):
+        raise AttributeError('{} is immutable'.format(type(self).__name__))
+
+    def __delattr__(self, item):
+        raise AttributeError('{} is immutable'.format(type(self).__name__))
+
+    def _key(self):
+        return self.difficulty_lvl, self.op_type, self.question_str
+
+    def __eq__(self, other):
+        if not isinstance(other, Question):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return '{}({!r} = {})'.format(type(self).__name__, self.question_str, self.answer_as_string())
+
+    def answer_as_number(self):
+        """
+        :return: (int or Decimal)
+        """
+        return fixed_point_as_number(scaled_num=self.answer, decimals=self.answer_decimals)
+
+    def is_correct(self, parsed_answer):
+        """
+        Exact check of an answer.
+
+        :param parsed_answer: (tuple) (fixed-point int, decimals), as returned by `parse_answer()`.
+        :return: (bool)
+        """
+        scaled_num, decimals = parsed_answer
+        return fixed_point_equal(scaled_num, decimals, self.answer, self.answer_decimals)
+
+    def answer_as_string(self, explicit_plus=False, trim_zeros=False):
+        """
+        :param explicit_plus: (bool) Prefixes non negative answers with '+'.
+        :param trim_zeros: (bool) Drops trailing zeros of decimals, keeping at least one (e.g. '4.0', not '4.00').
+        :return: (str)
+        """
+        a_str = fixed_point_as_string(scaled_num=self.answer, decimals=self.answer_decimals)
+        if trim_zeros and self.answer_decimals > 1:
+            int_part, decimal_part = a_str.split('.')
+            a_str = '{}.{}'.format(int_part, decimal_part.rstrip('0') or '0')
+        if explicit_plus and self.answer >= 0:
+            return '+' + a_str
+        return a_str
+
+
+def new_question(difficulty_lvl, op_type, rng=None):
+    """
+    Creates a random `Question`.
+
+    :param difficulty_lvl: (str)
+    :param op_type: (str)
+    :param rng: Object with the `random.Random` interface. Defaults to the `random` module.
+    :return: (Question)
+    """
+    rng = rng or random
+    terms = Terms(difficulty_lvl=difficulty_lvl, rng=rng).all_scaled_terms()
+    # (sign of 0 is drawn only once, so that the question is always displayed the same)
+    negatives = [t < 0 or (t == 0 and rng.random() < .5) for t in terms]
+    return Question(difficulty_lvl=difficulty_lvl, op_type=op_type, terms=terms, negatives=negatives)
+
+
+def question_at(seed, question_number, difficulty_lvl, op_type):
+    """
+    Creates question #`question_number` of given seed directly,
+    without creating any of the previous questions.
+
+    Same arguments always result in the same question,
+    regardless of process, machine or order of creation.
+
+    :param seed: (int)
+    :param question_number: (int)
+    :param difficulty_lvl: (str)
+    :param op_type: (str)
+    :return: (Question)
+    """
+    return new_question(difficulty_lvl=difficulty_lvl, op_type=op_type,
+                        rng=CounterRandom(seed=seed, counter=question_number))
+
+
+def iter_questions(difficulty_lvl, op_type, rng=None):
+    """
+    Endless stream of random questions.
+
+    :return: (generator) `Question`s
+    """
+    while True:
+        yield new_question(difficulty_lvl=difficulty_lvl, op_type=op_type, rng=rng)
+
+
+class QuestionPrefetcher(object):
+    """
+    Bounded buffer of upcoming questions, kept full by a background (daemon) thread,
+    so that a question is already available when requested (e.g. from the UI thread).
+
+    Changing difficulty or operation type discards the buffered questions.
+    """
+
+    def __init__(self, difficulty_lvl, op_type, size=4):
+        self.size = size
+        self._settings = (difficulty_lvl, op_type)
+        # (increased whenever buffered questions become invalid)
+        self._generation = 0
+        self._buffer = collections.deque()
+        self._condition = threading.Condition()
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._fill, name='QuestionPrefetcher')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _fill(self):
+        questions = None
+        questions_generation = None
+
+        while True:
+            with self._condition:
+                while not self._closed and len(self._buffer) >= self.size:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                generation = self._generation
+                if generation != questions_generation:
+                    difficulty_lvl, op_type = self._settings
+                    questions = iter_questions(difficulty_lvl=difficulty_lvl, op_type=op_type)
+                    questions_generation = generation
+
+            # (created without holding the lock)
+            q = next(questions)
+
+            with self._condition:
+                # Settings might have changed in the meantime.
+                if generation == self._generation:
+                    self._buffer.append(q)
+
+    def set_settings(self, difficulty_lvl, op_type):
+        """
+        Discards buffered questions if difficulty or operation type changed.
+        """
+        with self._condition:
+            if (difficulty_lvl, op_type) == self._settings:
+                return
+            self._settings = (difficulty_lvl, op_type)
+            self._generation += 1
+            self._buffer.clear()
+            self._condition.notify_all()
+
+    def next_question(self):
+        """
+        Returns a buffered question, or creates one if the buffer is empty.
+
+        :return: (Question)
+        """
+        with self._condition:
+            if self._buffer:
+                q = self._buffer.popleft()
+                self._condition.notify_all()
+                return q
+            difficulty_lvl, op_type = self._settings
+
+        return new_question(difficulty_lvl=difficulty_lvl, op_type=op_type)
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def close(self, timeout=None):
+        """
+        Stops the background thread, waiting for the question it might be creating.
+        Later questions are created when requested.
+
+        :param timeout: (float) Seconds to wait for the thread (None waits until it stops).
+        """
+        with self._condition:
+            self._closed = True
+            self._buffer.clear()
+            self._condition.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Batch generation
+#
+# Used when a large number of questions is needed at once (e.g. worksheets, practice banks).
+# Instead of one object per question, terms are drawn column-by-column (one column per term position)
+# and answers are computed in a single pass over the columns.
+
+class QuestionBatch(object):
+    """
+    Column-oriented collection of questions sharing difficulty and operation type.
+
+    `terms_columns[i][j]` is the i-th term of the j-th question,
+    `negative_columns[i][j]` whether the sign drawn for that term was a minus
+    (decides the displayed sign of zero terms).
+
+    Terms and answers are fixed-point integers,
+    scaled by 10**`decimals` and 10**`answer_decimals` respectively.
+    Question strings are rendered only when requested.
+    """
+
+    def __init__(self, difficulty_lvl, op_type, terms_columns, negative_columns, answers):
+        self.difficulty_lvl = difficulty_lvl
+        self.op_type = op_type
+        self.terms_columns = terms_columns
+        self.negative_columns = negative_columns
+        self.answers = answers
+
+        terms_type = DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP[difficulty_lvl]['terms_type']
+        self.decimals = TERMS_TYPE_TO_DECIMALS_MAP[terms_type]
+        self.answer_decimals = answer_decimals(decimals=self.decimals,
+                                               terms_count=len(terms_columns),
+                                               op_type=op_type)
+
+    def __len__(self):
+        return len(self.answers)
+
+    def terms(self, index):
+        return [column[index] for column in self.terms_columns]
+
+    def question_str(self, index):
+        """
+        Renders the operation string of a single question.
+
+        :param index: (int)
+        :return: (str)
+        """
+        terms_as_strings = []
+        for terms_column, negative_column in zip(self.terms_columns, self.negative_columns):
+            t = terms_column[index]
+            zero_sign = '-' if negative_column[index] else '+'
+            t_str = fixed_point_as_string(scaled_num=t, decimals=self.decimals)
+            terms_as_strings.append(term_as_string(term=t, zero_sign=zero_sign, term_str=t_str))
+
+        return join_terms_strings(terms_as_strings=terms_as_strings, op_type=self.op_type)
+
+    def question_strs(self):
+        """
+        Lazily renders all operation strings.
+
+        :return: (generator)
+        """
+        for index in range(len(self)):
+            yield self.question_str(index)
+
+    def answer_str(self, index):
+        return fixed_point_as_string(scaled_num=self.answers[index], decimals=self.answer_decimals)
+
+    def question(self, index):
+        """
+        :param index: (int)
+        :return: (Question)
+        """
+        return Question(difficulty_lvl=self.difficulty_lvl,
+                        op_type=self.op_type,
+                        terms=self.terms(index),
+                        negatives=[column[index] for column in self.negative_columns])
+
+    def questions(self):
+        """
+        Lazily creates all `Question`s.
+
+        :return: (generator)
+        """
+        for index in range(len(self)):
+            yield self.question(index)
+
+    def __iter__(self):
+        """
+        Yields (question string, answer string) pairs.
+        """
+        for index in range(len(self)):
+            yield self.question_str(index), self.answer_str(index)
+
+
+def _scaled_terms_column(n, rng, decimals, max_val=Terms.MAX_ABS_VALUE):
+    """
+    Draws `n` terms without sign as fixed-point integers.
+
+    For `decimals` == 0 it's equivalent to `randint(0, max_val)` for each term,
+    otherwise to rounding (half up) a float term (see `Terms._scaled_term`).
+    """
+    rand = rng.random
+    if decimals:
+        double_max = 2 * max_val * 10 ** decimals
+        return [(int(rand() * double_max) + 1) // 2 for _ in range(n)]
+    else:
+        max_val += 1
+        return [int(rand() * max_val) for _ in range(n)]
+
+
+def generate_batch(n, difficulty_lvl, op_type, rng=None):
+    """
+    Creates `n` questions of given difficulty and operation type.
+
+    Each term position is drawn as a whole column (terms' absolute values and signs),
+    then answers are computed column by column using integer arithmetic only.
+
+    :param n: (int) Number of questions.
+    :param difficulty_lvl: (str)
+    :param op_type: (str)
+    :param rng: Object providing `random()`, e.g. a `random.Random` instance.
+        Defaults to the `random` module.
+    :return: (QuestionBatch)
+    """
+    rng = rng or random
+    if op_type not in OPERATION_TO_FUNC_MAP:
+        raise NotImplementedError('{}'.format(op_type))
+
+    terms_count = DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP[difficulty_lvl]['terms_count']
+    terms_type = DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP[difficulty_lvl]['terms_type']
+    decimals = TERMS_TYPE_TO_DECIMALS_MAP[terms_type]
+
+    rand = rng.random
+    terms_columns = []
+    negative_columns = []
+    for _ in range(terms_count):
+        abs_values = _scaled_terms_column(n=n, rng=rng, decimals=decimals)
+        negatives = [rand() < .5 for _ in range(n)]
+        terms_columns.append([-v if neg else v for v, neg in zip(abs_values, negatives)])
+        negative_columns.append(negatives)
+
+    func = OPERATION_TO_FUNC_MAP[op_type]
+    answers = terms_columns[0]
+    for column in terms_columns[1:]:
+        answers = list(map(func, answers, column))
+
+    return QuestionBatch(difficulty_lvl=difficulty_lvl,
+                         op_type=op_type,
+                         terms_columns=terms_columns,
+                         negative_columns=negative_columns,
+                         answers=answers)
+
+
+def visual_tests():
+
+    # --------------------------------------------------
+    # all_terms()
+    print('\n'+'-'*80)
+    print('TERMS')
+
+    def print_all_terms(difficulty_lvl):
+        print('\nDifficulty {}'.format(difficulty_lvl))
+        # (terms' lists printed for each difficulty lvl)
+        terms_lsts_count = 3
+        for _ in range(terms_lsts_count):
+            print(Terms(difficulty_lvl=difficulty_lvl).all_terms())
+
+    # (tests all difficulties)
+    for d in sorted(DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP):
+        print_all_terms(difficulty_lvl=d)
+
+    # --------------------------------------------------
+    # operation_str() and answer
+    print('\n'+'-'*80)
+    print('OPERATION STRING')
+    for d in sorted(DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP):
+        print('\nDifficulty: {}'.format(d))
+
+        for operation in QuestionAndAnswer.OPERATIONS_TYPES:
+
+            for _ in range(3):
+                inst = QuestionAndAnswer(difficulty_lvl=d, op_type=operation)
+                question = inst.operation_str()
+                answer = inst.expected_answer()
+                msg = '{q} = {a}'.format(q=question, a=answer)
+                print(msg)
+
+
+if __name__ == '__main__':
+    visual_tests()
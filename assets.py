@@ -0,0 +1,58 @@
+"""
+Paths of the app's images.
+
+`IGNORE_BUILD_assets.py` (a build step) downscales images for the target screen density
+and packs the small ones into a kivy atlas. `asset_uri()` resolves an image's source path to its generated
+version: an atlas uri, or a downscaled file. Source paths are used as they are if nothing was generated
+(e.g. when running from the repository).
+"""
+
+
+import json
+import os
+
+
+GENERATED_ASSETS_DIR = 'generated_assets'
+ATLAS_NAME = 'ui'
+
+_atlas_ids = {}
+_uris = {}
+
+
+def atlas_id(path):
+    """
+    :return: (str) Id of an image in the atlas (its file name without extension).
+    """
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def atlas_ids(generated_dir=GENERATED_ASSETS_DIR):
+    """
+    :return: (set) Ids of all images in the atlas (empty if there is no atlas).
+    """
+    if generated_dir not in _atlas_ids:
+        try:
+            with open(os.path.join(generated_dir, ATLAS_NAME + '.atlas')) as f:
+                pages = json.load(f)
+        except (OSError, ValueError):
+            pages = {}
+        _atlas_ids[generated_dir] = {image_id for page in pages.values() for image_id in page}
+    return _atlas_ids[generated_dir]
+
+
+def asset_uri(path, generated_dir=GENERATED_ASSETS_DIR):
+    """
+    :param path: (str) Source path of an image, e.g. 'own_images/copper_coin.png'.
+    :return: (str) Atlas uri, path of the downscaled image, or `path` itself.
+    """
+    key = (path, generated_dir)
+    if key not in _uris:
+        image_id = atlas_id(path)
+        generated_path = '/'.join([generated_dir, path])
+        if image_id in atlas_ids(generated_dir=generated_dir):
+            _uris[key] = 'atlas://{}/{}/{}'.format(generated_dir, ATLAS_NAME, image_id)
+        elif os.path.exists(generated_path):
+            _uris[key] = generated_path
+        else:
+            _uris[key] = path
+    return _uris[key]
@@ -0,0 +1,227 @@
+"""
+Benchmarks of the question generation and grading hot paths.
+
+Reports for each case operations per second, and the memory allocated by a single call
+(peak traced by `tracemalloc`) and retained per result when results are kept.
+
+Results are written as json so that they can be compared with a previous run:
+
+    python -m benchmarks.bench_arithmetics --out before.json
+    python -m benchmarks.bench_arithmetics --out after.json --compare before.json
+
+Comparison exits with status 1 when any case is slower than the allowed threshold.
+"""
+
+
+import argparse
+import datetime
+import json
+import platform
+import random
+import sys
+import timeit
+import tracemalloc
+
+import arithmetics
+import grading
+
+
+DIFFICULTIES = sorted(arithmetics.DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP)
+OP_TYPES = arithmetics.QuestionAndAnswer.OPERATIONS_TYPES
+BATCH_SIZE = 1000
+RESULTS_FORMAT_VERSION = 1
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Cases
+#
+# Each case function takes the case parameters and returns a no-argument callable (the measured operation).
+def case_all_terms(difficulty_lvl):
+    return arithmetics.Terms(difficulty_lvl=difficulty_lvl).all_terms
+
+
+def case_question_and_answer(difficulty_lvl, op_type):
+    return lambda: arithmetics.QuestionAndAnswer(difficulty_lvl=difficulty_lvl, op_type=op_type)
+
+
+def case_operation_str(difficulty_lvl, op_type):
+    return arithmetics.QuestionAndAnswer(difficulty_lvl=difficulty_lvl, op_type=op_type).operation_str
+
+
+def case_expected_answer(difficulty_lvl, op_type):
+    return arithmetics.QuestionAndAnswer(difficulty_lvl=difficulty_lvl, op_type=op_type).expected_answer
+
+
+def case_round_single_term_1_decimals():
+    rand = random.random
+    return lambda: arithmetics.QuestionAndAnswer.round_single_term_1_decimals(given_float=rand() * 10)
+
+
+def case_new_question(difficulty_lvl, op_type):
+    return lambda: arithmetics.new_question(difficulty_lvl=difficulty_lvl, op_type=op_type)
+
+
+def case_question_at(difficulty_lvl, op_type):
+    counter = iter(range(sys.maxsize))
+    return lambda: arithmetics.question_at(seed=0, question_number=next(counter),
+                                           difficulty_lvl=difficulty_lvl, op_type=op_type)
+
+
+def case_generate_batch(difficulty_lvl, op_type):
+    return lambda: arithmetics.generate_batch(n=BATCH_SIZE, difficulty_lvl=difficulty_lvl, op_type=op_type)
+
+
+def case_check_answer(difficulty_lvl, op_type):
+    q = arithmetics.new_question(difficulty_lvl=difficulty_lvl, op_type=op_type)
+    answer_str = q.answer_as_string(explicit_plus=True)
+    return lambda: q.is_correct(arithmetics.parse_answer(answer_str))
+
+
+def case_grade_batch(difficulty_lvl, op_type):
+    grader = grading.Grader(difficulty_lvl=difficulty_lvl, op_type=op_type)
+    submissions = []
+    for k in range(BATCH_SIZE):
+        q = arithmetics.question_at(seed=0, question_number=k, difficulty_lvl=difficulty_lvl, op_type=op_type)
+        submissions.append(((0, k), q.answer_as_string()))
+    return lambda: grader.grade(submissions)
+
+
+def _diff_and_op_params():
+    return [dict(difficulty_lvl=d, op_type=op) for d in DIFFICULTIES for op in OP_TYPES]
+
+
+# (case name, case function, list of parameters' dicts, operations per call)
+CASES = (
+    ('Terms.all_terms', case_all_terms, [dict(difficulty_lvl=d) for d in DIFFICULTIES], 1),
+    ('QuestionAndAnswer()', case_question_and_answer, _diff_and_op_params(), 1),
+    ('QuestionAndAnswer.operation_str', case_operation_str, _diff_and_op_params(), 1),
+    ('QuestionAndAnswer.expected_answer', case_expected_answer, _diff_and_op_params(), 1),
+    ('QuestionAndAnswer.round_single_term_1_decimals', case_round_single_term_1_decimals, [{}], 1),
+    ('new_question', case_new_question, _diff_and_op_params(), 1),
+    ('question_at', case_question_at, _diff_and_op_params(), 1),
+    ('generate_batch', case_generate_batch, _diff_and_op_params(), BATCH_SIZE),
+    ('parse_answer + Question.is_correct', case_check_answer, _diff_and_op_params(), 1),
+    ('Grader.grade', case_grade_batch, _diff_and_op_params(), BATCH_SIZE),
+)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def measure_speed(func, ops_per_call, min_duration, repeat):
+    """
+    :return: (float) Best operations per second out of `repeat` timings.
+    """
+    timer = timeit.Timer(func)
+    calls, duration = timer.autorange()
+    # (scaled so that each timing lasts about `min_duration`)
+    calls = max(1, int(calls * min_duration / duration)) if duration else calls
+    best_duration = min(timer.repeat(repeat=repeat, number=calls))
+    return calls * ops_per_call / best_duration
+
+
+def measure_memory(func, retained_calls=1000):
+    """
+    :return: (tuple) Peak bytes allocated during a single call,
+        bytes retained per call when the results are kept.
+    """
+    func()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        start_size, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak_size = tracemalloc.get_traced_memory()
+
+        start_size, _ = tracemalloc.get_traced_memory()
+        results = [func() for _ in range(retained_calls)]
+        end_size, _ = tracemalloc.get_traced_memory()
+        del results
+    finally:
+        tracemalloc.stop()
+
+    return peak_size - start_size, (end_size - start_size) / retained_calls
+
+
+def case_key(name, params):
+    return '{}({})'.format(name, ', '.join('{}={}'.format(k, params[k]) for k in sorted(params)))
+
+
+def run(name_filter='', min_duration=.2, repeat=3):
+    """
+    Runs all cases whose name contains `name_filter`.
+
+    :return: (dict) Results, keyed by case key.
+    """
+    results = {}
+    for name, case_func, params_lst, ops_per_call in CASES:
+        if name_filter not in name:
+            continue
+        for params in params_lst:
+            func = case_func(**params)
+            ops_per_sec = measure_speed(func=func, ops_per_call=ops_per_call, min_duration=min_duration,
+                                        repeat=repeat)
+            peak_bytes, retained_bytes = measure_memory(func=func)
+            key = case_key(name=name, params=params)
+            results[key] = dict(name=name,
+                                params=params,
+                                ops_per_call=ops_per_call,
+                                ops_per_sec=ops_per_sec,
+                                peak_bytes_per_call=peak_bytes,
+                                retained_bytes_per_call=retained_bytes)
+            print('{key:<90} {ops:>14,.0f} ops/s {peak:>10,} B peak {retained:>10,.0f} B kept'.format(
+                key=key, ops=ops_per_sec, peak=peak_bytes, retained=retained_bytes))
+    return results
+
+
+def compare(results, baseline_results, threshold):
+    """
+    Prints speed changes against a baseline.
+
+    :param threshold: (float) Allowed slowdown ratio, e.g. .2 for 20%.
+    :return: (list) Keys of cases that regressed.
+    """
+    regressions = []
+    print('\n{:<90} {:>10}'.format('Compared to baseline', 'change'))
+    for key, result in sorted(results.items()):
+        baseline = baseline_results.get(key)
+        if not baseline:
+            continue
+        change = result['ops_per_sec'] / baseline['ops_per_sec'] - 1
+        regressed = change < -threshold
+        if regressed:
+            regressions.append(key)
+        print('{:<90} {:>+9.1%}{}'.format(key, change, '  REGRESSION' if regressed else ''))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_arithmetics')
+    parser.add_argument('--filter', default='', help='Runs only cases whose name contains this text.')
+    parser.add_argument('--min-duration', type=float, default=.2, help='Seconds per timing.')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--out', help='Json file to store the results.')
+    parser.add_argument('--compare', help='Json file of previous results.')
+    parser.add_argument('--threshold', type=float, default=.2, help='Allowed slowdown ratio.')
+    args = parser.parse_args(argv)
+
+    results = run(name_filter=args.filter, min_duration=args.min_duration, repeat=args.repeat)
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(dict(format_version=RESULTS_FORMAT_VERSION,
+                           date=datetime.datetime.now().isoformat(),
+                           python=platform.python_version(),
+                           implementation=platform.python_implementation(),
+                           machine=platform.machine(),
+                           results=results),
+                      f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline_results = json.load(f)['results']
+        if compare(results=results, baseline_results=baseline_results, threshold=args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Benchmarks of the progress storage backends with many profiles (e.g. a classroom or school deployment).
+
+For each backend, creates `--profiles` profiles, records `--answers` answers (and a visiting update) for each,
+then reopens random profiles. Reports answers per second, the time to reopen a profile and the size on disk:
+
+    python -m benchmarks.bench_storage --profiles 10000 --answers 20
+
+'event_log' profiles are separate directories, opened one at a time;
+'sqlite' profiles share a single database file.
+The 'json' backend (kivy's `JsonStore`) is included when kivy is installed.
+"""
+
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import storage
+
+
+INITIAL_DATA = {
+    "multiplication": {"1": 0, "2": 0, "3": 0},
+    "addition": {"1": 0, "2": 0, "3": 0},
+    "answers": {"wrong": 0, "skipped": 0, "correct": 0},
+    "visiting": {"achiev_10_days": 0, "last_day": 0, "consecutive_days": 0, "achiev_30_days": 0,
+                 "achiev_5_days": 0},
+}
+RESULTS = ('correct', 'correct', 'correct', 'wrong', 'skipped')
+
+
+def available_backends():
+    backends = ['event_log', 'sqlite']
+    try:
+        import kivy.storage.jsonstore
+    except ImportError:
+        pass
+    else:
+        backends.insert(0, 'json')
+    return backends
+
+
+def dir_size(directory):
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(directory) for f in files)
+
+
+def record_answers(store, answers_count, rng):
+    for _ in range(answers_count):
+        result = rng.choice(RESULTS)
+        if result == 'correct':
+            store.record_answer(result=result, op_type=rng.choice(('addition', 'multiplication')),
+                                difficulty_lvl=rng.choice('123'))
+        else:
+            store.record_answer(result=result)
+    visiting = dict(store['visiting'])
+    visiting['last_day'] = '2022-03-07'
+    visiting['consecutive_days'] += 1
+    store['visiting'] = visiting
+
+
+class ProfileOpener(object):
+    """
+    Opens the store of a profile, of given backend.
+    """
+
+    def __init__(self, backend, directory):
+        self.backend = backend
+        self.directory = directory
+        self.database = None
+        if backend == 'sqlite':
+            self.database = storage.SQLiteDatabase(path=os.path.join(directory, storage.SQLiteDatabase.FILE_NAME),
+                                                   batch_size=1000)
+
+    def open(self, profile):
+        if self.database is not None:
+            return self.database.profile_store(profile=profile, initial_data=INITIAL_DATA)
+        return storage.open_store(backend=self.backend, directory=os.path.join(self.directory, profile),
+                                  initial_data=INITIAL_DATA)
+
+    def close(self):
+        if self.database is not None:
+            self.database.close()
+
+
+def run_backend(backend, profiles_count, answers_count, reopened_count, seed=0):
+    """
+    :return: (dict) Results.
+    """
+    rng = random.Random(seed)
+    profiles = ['student_{}'.format(i) for i in range(profiles_count)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        opener = ProfileOpener(backend=backend, directory=directory)
+
+        start = time.perf_counter()
+        for profile in profiles:
+            store = opener.open(profile)
+            record_answers(store=store, answers_count=answers_count, rng=rng)
+            store.close()
+        if opener.database is not None:
+            opener.database.commit()
+        write_duration = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for profile in rng.sample(profiles, min(reopened_count, profiles_count)):
+            store = opener.open(profile)
+            try:
+                assert store.data_copy()['visiting']['consecutive_days'] == 1
+            finally:
+                store.close()
+        reopen_duration = time.perf_counter() - start
+
+        opener.close()
+        size = dir_size(directory)
+
+    return dict(backend=backend,
+                answers_per_sec=profiles_count * answers_count / write_duration,
+                profiles_per_sec=profiles_count / write_duration,
+                reopen_ms=1000 * reopen_duration / min(reopened_count, profiles_count),
+                bytes_per_profile=size / profiles_count)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_storage')
+    parser.add_argument('--profiles', type=int, default=10000)
+    parser.add_argument('--answers', type=int, default=20, help='Answers per profile.')
+    parser.add_argument('--reopened', type=int, default=1000, help='Randomly chosen profiles reopened.')
+    parser.add_argument('--backends', nargs='+', default=available_backends(), choices=storage.STORE_BACKENDS)
+    args = parser.parse_args(argv)
+
+    print('{:<12} {:>14} {:>14} {:>12} {:>16}'.format('backend', 'answers/s', 'profiles/s', 'reopen ms',
+                                                      'bytes/profile'))
+    for backend in args.backends:
+        result = run_backend(backend=backend, profiles_count=args.profiles, answers_count=args.answers,
+                             reopened_count=args.reopened)
+        print('{backend:<12} {answers_per_sec:>14,.0f} {profiles_per_sec:>14,.0f} {reopen_ms:>12.3f} '
+              '{bytes_per_profile:>16,.0f}'.format(**result))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Headless load simulation of the play page.
+
+Builds the app's widgets (from the kv file) without opening a window, using kivy's mock OpenGL backend,
+and replays synthetic answering sessions through the same handlers as the buttons:
+numpad key presses, "Check" (correct or wrong answers) and "Reveal" (skipped answers).
+
+Delays of the play page (e.g. before a new question, coin animation) are set to 0, and the clock is ticked
+after every interaction, so each interaction's latency includes the callbacks it schedules.
+
+Reports latency percentiles per interaction type and storage writes per answer:
+
+    python -m benchmarks.load_simulation --answers 2000 --mix 70 20 10 --backend sqlite
+
+Exits with status 1 if `--max-p99-ms` is given and the 99th percentile of any interaction type exceeds it.
+"""
+
+
+import os
+
+# (must be set before kivy is imported)
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+os.environ.setdefault('KIVY_NO_FILELOG', '1')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+# (the clock shouldn't sleep to limit frames per second)
+os.environ.setdefault('KCFG_GRAPHICS_MAXFPS', '0')
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+
+from kivy.app import App
+from kivy.clock import Clock
+
+import arithmetics
+import main
+import storage
+
+
+RESULTS = ('correct', 'wrong', 'skipped')
+PERCENTILES = (50, 90, 99)
+
+
+class HeadlessApp(main.MinusTimesMinusApp):
+    """
+    The app, with its storage, config and kv cache in a temporary directory.
+    """
+
+    def __init__(self, data_dir, backend, **kwargs):
+        self.data_dir = data_dir
+        self.STORAGE_BACKEND = backend
+        self.STORAGE_FILE = os.path.join(data_dir, 'storage.json')
+        self.PROGRESS_DIR = os.path.join(data_dir, 'progress')
+        self.KV_CACHE_DIR = data_dir
+        super(HeadlessApp, self).__init__(**kwargs)
+
+    def get_application_config(self, *args):
+        return os.path.join(self.data_dir, 'minustimesminus.ini')
+
+
+class PlayPageDriver(object):
+    """
+    Presses the play page's buttons.
+    """
+
+    def __init__(self, app):
+        # (as done by `App.run()`, without opening a window)
+        App._running_app = app
+        app.config = app.load_config()
+        # (explicitly, since kivy's default lookup is next to the module of the app's class)
+        app.load_kv(filename=main.KV_FILE)
+        self.app = app
+        self.main_widg = app.build()
+
+        ids = self.main_widg.ids
+        self.numpad = ids.numpad
+        self.q_display = ids.q_display
+        self.reveal_button = ids.reveal_answer_button
+        self.check_button = next(w for w in ids.play_page.walk() if isinstance(w, main.CheckAnswerButton))
+        self.numpad_buttons = {btn.text: btn for btn in self.numpad.children}
+
+        # Time compression
+        main.CoinImage.DELAY = 0
+        main.CoinImage.ANIMATION_DURATION = 0
+        main.CheckAnswerButton.display_duration = 0
+
+    @staticmethod
+    def _timed(func):
+        start = time.perf_counter()
+        func()
+        Clock.tick()
+        return time.perf_counter() - start
+
+    def press_key(self, key):
+        """
+        :param key: (str) '0'-'9', '+', '-', '.' or 'CLEAR'.
+        :return: (float) Seconds.
+        """
+        return self._timed(lambda: self.numpad_buttons[key].dispatch('on_release'))
+
+    def check(self):
+        return self._timed(lambda: self.check_button.dispatch('on_release'))
+
+    def reveal(self):
+        return self._timed(lambda: self.reveal_button.dispatch('on_release'))
+
+    def question(self):
+        return self.q_display.question
+
+
+def answer_keys(question, result):
+    """
+    :return: (str) Keys typed for an answer of given result ('correct' or 'wrong').
+    """
+    if result == 'correct':
+        return question.answer_as_string(explicit_plus=True)
+    # (last digit off by one)
+    answer_str = arithmetics.fixed_point_as_string(scaled_num=question.answer + 1,
+                                                   decimals=question.answer_decimals)
+    return answer_str if answer_str.startswith('-') else '+' + answer_str
+
+
+def run_session(driver, answers_count, mix, rng):
+    """
+    :param mix: (tuple) Relative weights of correct, wrong and skipped answers.
+    :return: (dict) Interaction type to latencies (seconds).
+    """
+    latencies = {'key': [], 'check_correct': [], 'check_wrong': [], 'reveal': []}
+    for result in rng.choices(RESULTS, weights=mix, k=answers_count):
+        if result == 'skipped':
+            # (reveal, then new question)
+            latencies['reveal'].append(driver.reveal())
+            latencies['reveal'].append(driver.reveal())
+            continue
+
+        for key in answer_keys(question=driver.question(), result=result):
+            latencies['key'].append(driver.press_key(key))
+        latencies['check_' + result].append(driver.check())
+        if result == 'wrong':
+            # (user clears the wrong answer, and tries the same question again as the next answer)
+            latencies['key'].append(driver.press_key(main.Numpad.CLEAR_ANSWER_EFFECT_TXT))
+    return latencies
+
+
+def percentile(sorted_values, p):
+    """
+    :return: (float) Nearest-rank percentile.
+    """
+    k = max(0, -(-len(sorted_values) * p // 100) - 1)
+    return sorted_values[int(k)]
+
+
+def summarize(latencies):
+    summary = {}
+    for interaction, values in sorted(latencies.items()):
+        if not values:
+            continue
+        values = sorted(values)
+        summary[interaction] = dict(count=len(values),
+                                    max_ms=1000 * values[-1],
+                                    **{'p{}_ms'.format(p): 1000 * percentile(values, p) for p in PERCENTILES})
+    return summary
+
+
+def simulate(answers_count, mix, backend, seed=0):
+    """
+    :return: (dict) Results.
+    """
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as data_dir:
+        app = HeadlessApp(data_dir=data_dir, backend=backend)
+        driver = PlayPageDriver(app=app)
+        writes_before = app._store.writes_count
+        latencies = run_session(driver=driver, answers_count=answers_count, mix=mix, rng=rng)
+        app.flush_storage()
+        writes = app._store.writes_count - writes_before
+        app._store.close()
+
+    return dict(backend=backend,
+                answers=answers_count,
+                mix=list(mix),
+                storage_writes_per_answer=writes / answers_count,
+                latencies=summarize(latencies))
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.load_simulation')
+    parser.add_argument('--answers', type=int, default=1000)
+    parser.add_argument('--mix', type=float, nargs=3, default=(70, 20, 10), metavar=('CORRECT', 'WRONG', 'SKIPPED'),
+                        help='Relative weights of answer results.')
+    parser.add_argument('--backend', choices=storage.STORE_BACKENDS, default=main.MinusTimesMinusApp.STORAGE_BACKEND)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help='Json file to store the results.')
+    parser.add_argument('--max-p99-ms', type=float, help='Fails if any interaction type is slower.')
+    args = parser.parse_args(argv)
+
+    results = simulate(answers_count=args.answers, mix=args.mix, backend=args.backend, seed=args.seed)
+
+    print('{:<15} {:>8} {:>10} {:>10} {:>10} {:>10}'.format('interaction', 'count', 'p50 ms', 'p90 ms', 'p99 ms',
+                                                            'max ms'))
+    for interaction, s in sorted(results['latencies'].items()):
+        print('{:<15} {count:>8} {p50_ms:>10.3f} {p90_ms:>10.3f} {p99_ms:>10.3f} {max_ms:>10.3f}'.format(
+            interaction, **s))
+    print('storage writes per answer ({}): {:.2f}'.format(results['backend'], results['storage_writes_per_answer']))
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.max_p99_ms is not None:
+        slow = [k for k, s in results['latencies'].items() if s['p99_ms'] > args.max_p99_ms]
+        if slow:
+            print('Slower than {} ms (p99): {}'.format(args.max_p99_ms, ', '.join(sorted(slow))))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
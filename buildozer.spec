@@ -22,10 +22,12 @@ source.include_exts = py,png,jpg,kv,atlas,txt
 #source.exclude_exts =
 
 # (list) List of directory to exclude (let empty to not exclude anything)
-source.exclude_dirs = tests, bin, IGNORE_BUILD_images, buildozer
+# Source images are packaged from generated_assets (run IGNORE_BUILD_assets.py first, enforced by p4a.hook);
+# the icon and the presplash are read from their source paths at build time.
+source.exclude_dirs = tests, benchmarks, bin, IGNORE_BUILD_images, buildozer, progress, own_images, third_parties_images
 
 # (list) List of exclusions using pattern matching
-source.exclude_patterns = IGNORE_BUILD_ensure_images_cited.py, IGNORE_BUILD_ensure_images_cited.pyo, exp1.py, exp2.py, exp3.py, my_log.txt, storage.json
+source.exclude_patterns = IGNORE_BUILD_ensure_images_cited.py, IGNORE_BUILD_ensure_images_cited.pyo, IGNORE_BUILD_assets.py, IGNORE_BUILD_assets.pyo, IGNORE_BUILD_p4a_hook.py, IGNORE_BUILD_p4a_hook.pyo, exp1.py, exp2.py, exp3.py, my_log.txt, storage.json
 
 # (str) Application versioning (method 1)
 #version = 0.1
@@ -129,6 +131,10 @@ android.private_storage = True
 # not yet merged features.
 #android.branch = master
 
+# (str) Filename to a hook for p4a
+# (fails the build if the images weren't generated, see IGNORE_BUILD_assets.py)
+p4a.hook = %(source.dir)s/IGNORE_BUILD_p4a_hook.py
+
 # (str) OUYA Console category. Should be one of GAME or APP
 # If you leave this blank, OUYA support will not be enabled
 #android.ouya.category = GAME
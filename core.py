@@ -0,0 +1,210 @@
+"""
+Core of the app, without any kivy dependency (e.g. for servers grading or analysing students' progress).
+
+Contains the storage schema, the rewards' coins and the achievements' logic.
+"""
+
+
+import datetime
+
+import arithmetics
+
+
+APP_NAME = 'MinusTimesMinus'
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+THIRD_PARTIES_IMAGES_DIR = 'third_parties_images'
+GOLD_COIN_SMALL_IM = '/'.join([THIRD_PARTIES_IMAGES_DIR, 'gold_coin_zeus_small.png'])
+SILVER_COIN_IM_PATH = '/'.join([THIRD_PARTIES_IMAGES_DIR, 'athena_coin.png'])
+COPPER_COIN_IM_PATH = '/'.join(['own_images', 'copper_coin.png'])
+
+
+DIFF_TO_COIN_MAP = {
+    '1': dict(
+        coin_color='copper_coins',
+        im_path=COPPER_COIN_IM_PATH
+    ),
+    '2': dict(
+        coin_color='silver_coins',
+        im_path=SILVER_COIN_IM_PATH
+    ),
+    '3': dict(
+        coin_color='gold_coins',
+        im_path=GOLD_COIN_SMALL_IM
+    ),
+}
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+DEFAULT_STORAGE_CONTENTS = {
+    "multiplication": {"1": 0,
+                       "3": 0,
+                       "2": 0},
+    "addition": {"1": 0,
+                 "3": 0,
+                 "2": 0},
+    "answers": {"wrong": 0,
+                "skipped": 0,
+                "correct": 0},
+    "visiting": {"achiev_10_days": 0,
+                 "last_day": 0,
+                 "consecutive_days": 0,
+                 "achiev_30_days": 0,
+                 "achiev_5_days": 0}}
+
+
+def total_coins(store):
+    """
+    :param store: (dict) Storage contents.
+    :return: (int) Coins of all operation types and difficulties.
+    """
+    tot = 0
+    for op_type in arithmetics.QuestionAndAnswer.OPERATIONS_TYPES:
+        for diff_lvl in DIFF_TO_COIN_MAP:
+            tot += store[op_type][diff_lvl]
+    return tot
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class Achievement(object):
+    """
+    Rule of an achievement, noted as a flag (0 or 1) in the visiting section of storage.
+
+    It's evaluated only on events of its `EVENT_TYPES` (see `AchievementEngine`), and no more once achieved.
+    """
+    EVENT_TYPES = ()
+
+    def __init__(self, name):
+        """
+        :param name: (str) Key of the flag in the visiting section.
+        """
+        self.name = name
+
+    # Abstract
+    def is_achieved(self, engine, event):
+        """
+        :param engine: (AchievementEngine)
+        :param event: (dict) Details of the event.
+        :return: (bool)
+        """
+        raise NotImplementedError
+
+
+class ConsecutiveDaysAchievement(Achievement):
+    EVENT_TYPES = ('day_rollover',)
+
+    def __init__(self, name, days):
+        super(ConsecutiveDaysAchievement, self).__init__(name=name)
+        self.days = days
+
+    def is_achieved(self, engine, event):
+        return engine.visiting['consecutive_days'] == self.days
+
+
+ACHIEVEMENTS = (
+    ConsecutiveDaysAchievement(name='achiev_5_days', days=5),
+    ConsecutiveDaysAchievement(name='achiev_10_days', days=10),
+    ConsecutiveDaysAchievement(name='achiev_30_days', days=30),
+)
+
+
+class AchievementEngine(object):
+    """
+    Notes the user's progress and the achievements it results in.
+    Rewards are only noted; widgets bound to the noted values display them.
+
+    Event types:
+        - 'answer_correct': every correct answer (event has `op_type` and `difficulty_lvl`)
+        - 'day_rollover': first correct answer of a day (event has `days_from_previous_play`)
+
+    Each achievement is evaluated only on the event types it's subscribed to,
+    so the cost of a correct answer doesn't grow with the achievements subscribed only to day rollovers.
+
+    Public methods return the changed values of the visiting section (empty if none changed).
+    """
+
+    EVENT_TYPES = ('answer_correct', 'day_rollover')
+
+    def __init__(self, visiting_dct, achievements=ACHIEVEMENTS, today_func=datetime.date.today):
+        """
+        :param visiting_dct: (dict) Visiting section of storage (copied).
+        :param achievements: (iterable) `Achievement`s
+        :param today_func: (callable) Returns the current date.
+        """
+        self.achievements = achievements
+        self.today_func = today_func
+        self.reset(visiting_dct)
+
+    def reset(self, visiting_dct):
+        """
+        Starts over from given (e.g. reset) visiting values.
+        """
+        self.visiting = dict(visiting_dct)
+        self._last_day = self._parse_day(self.visiting['last_day'])
+        self._subscribed = {event_type: [] for event_type in self.EVENT_TYPES}
+        for achievement in self.achievements:
+            if not self.visiting.get(achievement.name):
+                for event_type in achievement.EVENT_TYPES:
+                    self._subscribed[event_type].append(achievement)
+
+    @staticmethod
+    def _parse_day(iso_str):
+        # (during reset last_day becomes 0, meaning the user hasn't played)
+        if not iso_str:
+            return None
+        return datetime.date(*[int(i) for i in iso_str.split('-')])
+
+    def _days_from_previous_play(self, today):
+        """
+        :return: (int) None if the user hasn't played.
+        """
+        if self._last_day is None:
+            return None
+        return (today - self._last_day).days
+
+    def _dispatch(self, event_type, event, changes):
+        achieved = [a for a in self._subscribed[event_type] if a.is_achieved(engine=self, event=event)]
+        for achievement in achieved:
+            changes[achievement.name] = self.visiting[achievement.name] = 1
+            for subscribed_event_type in achievement.EVENT_TYPES:
+                self._subscribed[subscribed_event_type].remove(achievement)
+
+    def _roll_over_day(self, today, changes):
+        days_diff = self._days_from_previous_play(today)
+        if days_diff == 1:
+            consecutive_days = self.visiting['consecutive_days'] + 1
+        else:
+            # (minimum value is 1, not 0)
+            consecutive_days = 1
+        self._last_day = today
+
+        changes.update(consecutive_days=consecutive_days, last_day=today.isoformat())
+        self.visiting.update(changes)
+        self._dispatch(event_type='day_rollover', event={'days_from_previous_play': days_diff}, changes=changes)
+
+    def start(self):
+        """
+        On app start, consecutive days are shown as 0 if a day was missed.
+
+        :return: (dict) Changed values.
+        """
+        days_diff = self._days_from_previous_play(self.today_func())
+        if (days_diff is None or days_diff > 1) and self.visiting['consecutive_days']:
+            self.visiting['consecutive_days'] = 0
+            return {'consecutive_days': 0}
+        return {}
+
+    def answer_correct(self, op_type, difficulty_lvl):
+        """
+        :return: (dict) Changed values.
+        """
+        changes = {}
+        today = self.today_func()
+        if today != self._last_day:
+            self._roll_over_day(today=today, changes=changes)
+        if self._subscribed['answer_correct']:
+            self._dispatch(event_type='answer_correct',
+                           event={'op_type': op_type, 'difficulty_lvl': difficulty_lvl},
+                           changes=changes)
+        return changes
@@ -0,0 +1,199 @@
+"""
+Headless grading of submitted answers (e.g. answers collected from many devices).
+
+Questions are identified by keys, which are used to recreate (or look up) the expected answers:
+    - (seed, question number) for questions created by `arithmetics.question_at()`
+    - (stream seed, question id) for questions of banks created by `question_bank.generate_bank()`
+      (stream seed of the bank's manifest, id of the bank's record; see `bank_grader()`)
+    - question id of a `question_space.QuestionSpaceIndex` (integer difficulties only)
+
+Answers are strings as typed on the numpad. Empty answers count as skipped,
+answers that are not numbers count as wrong.
+"""
+
+
+import arithmetics
+
+
+# (same as the "answers" section of the app's storage)
+ANSWER_COUNTS_KEYS = ('correct', 'wrong', 'skipped')
+
+
+class GradingResult(object):
+    """
+    `correctness` holds for each submission True (correct), False (wrong) or None (skipped),
+    `counts` the totals of each.
+    """
+
+    __slots__ = ('correctness', 'counts')
+
+    def __init__(self, correctness):
+        self.correctness = correctness
+        correct_count = correctness.count(True)
+        wrong_count = correctness.count(False)
+        self.counts = {
+            'correct': correct_count,
+            'wrong': wrong_count,
+            'skipped': len(correctness) - correct_count - wrong_count,
+        }
+
+    def __len__(self):
+        return len(self.correctness)
+
+
+class Grader(object):
+    """
+    Grades submissions of questions having the same difficulty and operation type.
+
+    Expected answers are cached, since the same question is usually answered by many students.
+    """
+
+    def __init__(self, difficulty_lvl, op_type, expected_answer_func=None, cache_size=1000000):
+        """
+        :param difficulty_lvl: (str)
+        :param op_type: (str)
+        :param expected_answer_func: (callable) Returns the fixed-point answer of a question key.
+            Defaults to recreating the question from a (seed, question number) key.
+        :param cache_size: (int) Maximum cached expected answers.
+        """
+        self.difficulty_lvl = difficulty_lvl
+        self.op_type = op_type
+        self.expected_answer_func = expected_answer_func or self._answer_from_seed
+        self.cache_size = cache_size
+        self._cache = {}
+
+        terms_dct = arithmetics.DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP[difficulty_lvl]
+        self.answer_decimals = arithmetics.answer_decimals(
+            decimals=arithmetics.TERMS_TYPE_TO_DECIMALS_MAP[terms_dct['terms_type']],
+            terms_count=terms_dct['terms_count'],
+            op_type=op_type)
+
+    def _answer_from_seed(self, question_key):
+        seed, question_number = question_key
+        return arithmetics.question_at(seed=seed, question_number=question_number,
+                                       difficulty_lvl=self.difficulty_lvl, op_type=self.op_type).answer
+
+    def expected_answer(self, question_key):
+        """
+        :return: (int) Fixed-point answer, scaled by 10**`self.answer_decimals`.
+        """
+        try:
+            return self._cache[question_key]
+        except KeyError:
+            pass
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        answer = self._cache[question_key] = self.expected_answer_func(question_key)
+        return answer
+
+    def grade(self, submissions):
+        """
+        :param submissions: (iterable) (question key, answer string) pairs.
+        :return: (GradingResult)
+        """
+        if not isinstance(submissions, (list, tuple)):
+            submissions = list(submissions)
+
+        expected_answers = list(map(self.expected_answer, [key for key, _ in submissions]))
+        parsed_answers = list(map(arithmetics.parse_answer, [answer_str for _, answer_str in submissions]))
+
+        answer_decimals = self.answer_decimals
+        fixed_point_equal = arithmetics.fixed_point_equal
+        correctness = []
+        append = correctness.append
+        for (_, answer_str), parsed, expected in zip(submissions, parsed_answers, expected_answers):
+            if parsed is None:
+                append(None if not answer_str else False)
+            elif parsed[1] == answer_decimals:
+                append(parsed[0] == expected)
+            else:
+                append(fixed_point_equal(parsed[0], parsed[1], expected, answer_decimals))
+
+        return GradingResult(correctness=correctness)
+
+    def grade_stream(self, submissions, chunk_size=10000):
+        """
+        Grades an (endless) stream of submissions in chunks.
+
+        :param submissions: (iterable) (question key, answer string) pairs.
+        :param chunk_size: (int)
+        :return: (generator) `GradingResult` of each chunk.
+        """
+        chunk = []
+        for submission in submissions:
+            chunk.append(submission)
+            if len(chunk) >= chunk_size:
+                yield self.grade(chunk)
+                chunk = []
+        if chunk:
+            yield self.grade(chunk)
+
+
+def question_space_grader(difficulty_lvl, op_type, cache_dir=None, **kwargs):
+    """
+    Grader of questions identified by their question-space id (integer difficulties only).
+
+    :param cache_dir: (str) Directory of the question space's cached index (see `question_space.get_index`).
+    :return: (Grader)
+    """
+    import question_space
+
+    index = question_space.get_index(difficulty_lvl=difficulty_lvl, op_type=op_type, cache_dir=cache_dir)
+    return Grader(difficulty_lvl=difficulty_lvl, op_type=op_type, expected_answer_func=index.answer, **kwargs)
+
+
+class _BankAnswers(object):
+    """
+    Expected answers of the questions of banks, recreated a block at a time (see `question_bank.bank_block()`).
+    """
+
+    def __init__(self, difficulty_lvl, op_type, max_blocks=64):
+        """
+        :param max_blocks: (int) Maximum cached blocks.
+        """
+        import question_bank
+
+        self.difficulty_lvl = difficulty_lvl
+        self.op_type = op_type
+        self.max_blocks = max_blocks
+        self._bank_block = question_bank.bank_block
+        self._block_size = question_bank.BANK_BLOCK_SIZE
+        self._blocks_answers = {}
+
+    def __call__(self, question_key):
+        stream_seed, question_id = question_key
+        block_number, i = divmod(question_id, self._block_size)
+        try:
+            answers = self._blocks_answers[(stream_seed, block_number)]
+        except KeyError:
+            if len(self._blocks_answers) >= self.max_blocks:
+                self._blocks_answers.clear()
+            answers = self._blocks_answers[(stream_seed, block_number)] = self._bank_block(
+                stream_seed=stream_seed, block_number=block_number,
+                difficulty_lvl=self.difficulty_lvl, op_type=self.op_type).answers
+        return answers[i]
+
+
+def bank_grader(difficulty_lvl, op_type, **kwargs):
+    """
+    Grader of questions of banks, identified by (stream seed, question id) keys.
+
+    :return: (Grader)
+    """
+    return Grader(difficulty_lvl=difficulty_lvl, op_type=op_type,
+                  expected_answer_func=_BankAnswers(difficulty_lvl=difficulty_lvl, op_type=op_type), **kwargs)
+
+
+def sum_counts(results):
+    """
+    Total counts of several results (e.g. of `Grader.grade_stream()`).
+
+    :param results: (iterable) `GradingResult`s
+    :return: (dict)
+    """
+    totals = dict.fromkeys(ANSWER_COUNTS_KEYS, 0)
+    for result in results:
+        for k in ANSWER_COUNTS_KEYS:
+            totals[k] += result.counts[k]
+    return totals
@@ -0,0 +1,123 @@
+"""
+Kivy-free parts of the asynchronous image loading (see `main.CachedAsyncImage`).
+
+Images are decoded off the UI thread and subsampled to about the size they are displayed at,
+so that e.g. a 1024x1024 citation image shown as a thumbnail doesn't keep a full-size texture in memory.
+Textures are kept in a bounded LRU cache keyed by (path, displayed size bucket).
+"""
+
+
+import collections
+import threading
+
+
+# Displayed sizes are rounded up to a multiple of this (pixels),
+# so that small layout changes reuse the same cached texture.
+SIZE_BUCKET_STEP = 64
+
+# Bytes of each pixel's format; subsampled pixels always have an alpha channel.
+FMT_TO_BYTES_PER_PIXEL = {'rgba': 4, 'bgra': 4, 'rgb': 3, 'bgr': 3}
+_FMT_WITH_ALPHA = {'rgb': 'rgba', 'bgr': 'bgra'}
+
+
+class LRUCache(object):
+    """
+    Least-recently-used cache, bounded by the total weight of its values (e.g. texture bytes).
+    """
+
+    def __init__(self, max_weight, weight_func=None):
+        """
+        :param max_weight: (int)
+        :param weight_func: (callable) Weight of a value; each value weighs 1 if None.
+        """
+        self.max_weight = max_weight
+        self.weight_func = weight_func or (lambda value: 1)
+        self.weight = 0
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value, _ = self._items[key]
+            except KeyError:
+                return default
+            self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        weight = self.weight_func(value)
+        with self._lock:
+            if key in self._items:
+                self.weight -= self._items.pop(key)[1]
+            self._items[key] = (value, weight)
+            self.weight += weight
+            # (the newest value is kept even if it alone exceeds the maximum weight)
+            while self.weight > self.max_weight and len(self._items) > 1:
+                _, (_, evicted_weight) = self._items.popitem(last=False)
+                self.weight -= evicted_weight
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.weight = 0
+
+
+def size_bucket(size, step=SIZE_BUCKET_STEP):
+    """
+    :param size: (tuple) Displayed width, height.
+    :return: (tuple) Size rounded up to multiples of `step`.
+    """
+    return tuple(-(-int(round(v)) // step) * step for v in size)
+
+
+def subsample_factor(image_size, display_size):
+    """
+    :return: (int) Largest factor by which the image can be subsampled without becoming smaller than displayed.
+    """
+    return max(1, min(image_size[0] // max(1, display_size[0]), image_size[1] // max(1, display_size[1])))
+
+
+def subsample(pixels, image_size, fmt, display_size, row_length=0):
+    """
+    Keeps every n-th pixel of every n-th row (nearest neighbour), n being `subsample_factor()`.
+
+    Pixels without alpha channel are converted to having one.
+    Formats not in `FMT_TO_BYTES_PER_PIXEL` are returned unchanged.
+
+    :param pixels: (bytes) Rows of pixels.
+    :param image_size: (tuple) Width, height.
+    :param fmt: (str) E.g. 'rgba'.
+    :param display_size: (tuple) Width, height.
+    :param row_length: (int) Pixels of each row including padding (0 if rows aren't padded).
+    :return: (tuple) Pixels, size, format.
+    """
+    bytes_per_pixel = FMT_TO_BYTES_PER_PIXEL.get(fmt)
+    if bytes_per_pixel is None:
+        return pixels, image_size, fmt
+
+    width, height = image_size
+    factor = subsample_factor(image_size=image_size, display_size=display_size)
+    if factor == 1 and bytes_per_pixel == 4 and not row_length:
+        return pixels, image_size, fmt
+
+    stride = (row_length or width) * bytes_per_pixel
+    new_width = -(-width // factor)
+    new_height = -(-height // factor)
+    pixel_step = factor * bytes_per_pixel
+
+    rows = []
+    for y in range(0, height, factor):
+        row = pixels[y * stride:y * stride + width * bytes_per_pixel]
+        if bytes_per_pixel == 4:
+            rows.append(b''.join(row[x:x + 4] for x in range(0, len(row), pixel_step)))
+        else:
+            rows.append(b''.join(row[x:x + 3] + b'\xff' for x in range(0, len(row), pixel_step)))
+
+    return b''.join(rows), (new_width, new_height), _FMT_WITH_ALPHA.get(fmt, fmt)
@@ -0,0 +1,196 @@
+"""
+Opt-in instrumentation of frame times and interaction latencies (Kivy-free; hooked into the app by `main`).
+
+Enabled only if the environment variable `MTM_INSTRUMENTATION` is set (before the app is imported),
+to the path of the file snapshots are dumped to, or to '1' for `DEFAULT_DUMP_FILE`.
+When disabled, `recorder` is None and the decorators return functions unchanged, so there is no overhead.
+
+Durations are counted in fixed-size histograms (same buckets for all), so memory doesn't grow with the uptime.
+Snapshots (json) hold the counts of each histogram since the app started, and estimated percentiles.
+"""
+
+
+import bisect
+import functools
+import json
+import os
+import time
+
+
+ENV_VAR = 'MTM_INSTRUMENTATION'
+DEFAULT_DUMP_FILE = 'instrumentation.json'
+# Upper bounds of the buckets (milliseconds), doubling from .25 ms to about 8 s; a last bucket counts slower ones.
+BUCKET_BOUNDS_MS = tuple(.25 * 2 ** i for i in range(16))
+
+
+class Histogram(object):
+    __slots__ = ('bounds_ms', 'counts', 'count', 'total_ms', 'max_ms')
+
+    def __init__(self, bounds_ms=BUCKET_BOUNDS_MS):
+        """
+        :param bounds_ms: (tuple) Increasing upper bounds of the buckets.
+        """
+        self.bounds_ms = bounds_ms
+        self.counts = [0] * (len(bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.
+        self.max_ms = 0.
+
+    def add(self, seconds):
+        ms = 1000 * seconds
+        self.counts[bisect.bisect_left(self.bounds_ms, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, p):
+        """
+        :param p: (float) 0-100.
+        :return: (float) Upper bound (ms) of the bucket of the p-th percentile (the maximum, if in the last bucket).
+        """
+        if not self.count:
+            return 0.
+        rank = max(1, -(-self.count * p // 100))
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.bounds_ms[i], self.max_ms) if i < len(self.bounds_ms) else self.max_ms
+
+    def as_dict(self):
+        return {
+            'counts': list(self.counts),
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else 0.,
+            'max_ms': self.max_ms,
+            'p50_ms': self.percentile(50),
+            'p90_ms': self.percentile(90),
+            'p99_ms': self.percentile(99),
+        }
+
+
+class Recorder(object):
+    """
+    Histograms by name, e.g. 'frame', 'handler:check', 'tap_to_feedback:check'.
+    """
+
+    def __init__(self, dump_path=DEFAULT_DUMP_FILE, clock=time.perf_counter):
+        """
+        :param dump_path: (str) File snapshots are dumped to.
+        :param clock: (callable) Seconds.
+        """
+        self.dump_path = dump_path
+        self.clock = clock
+        self.histograms = {}
+        self._start_time = clock()
+        # Name of tapped buttons to the time of the tap, until the next displayed frame.
+        self._pending_taps = {}
+        # (name, key) to start time.
+        self._open_spans = {}
+
+    def record(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(seconds)
+
+    def tap(self, name):
+        """
+        Notes a tap, whose latency is recorded when the next frame is displayed (see `on_frame_displayed`).
+        """
+        # (consecutive taps within a frame are measured from the first one)
+        self._pending_taps.setdefault(name, self.clock())
+
+    def on_frame(self, dt):
+        """
+        :param dt: (float) Seconds since the previous frame.
+        """
+        self.record('frame', dt)
+
+    def on_frame_displayed(self):
+        if not self._pending_taps:
+            return
+        now = self.clock()
+        for name, tap_time in self._pending_taps.items():
+            self.record('tap_to_feedback:' + name, now - tap_time)
+        self._pending_taps.clear()
+
+    def start_span(self, name, key=None):
+        self._open_spans[(name, key)] = self.clock()
+
+    def end_span(self, name, key=None):
+        start = self._open_spans.pop((name, key), None)
+        if start is not None:
+            self.record(name, self.clock() - start)
+
+    def snapshot(self):
+        """
+        :return: (dict)
+        """
+        return {
+            'time': time.time(),
+            'uptime_s': self.clock() - self._start_time,
+            'bucket_bounds_ms': list(BUCKET_BOUNDS_MS),
+            'histograms': {name: histogram.as_dict() for name, histogram in sorted(self.histograms.items())},
+        }
+
+    def dump(self, path=None):
+        """
+        Overwrites the dump file with a snapshot.
+        """
+        path = path or self.dump_path
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=1, sort_keys=True)
+        # (a collected file is never partly written)
+        os.replace(temp_path, path)
+
+
+def _recorder_from_env():
+    value = os.environ.get(ENV_VAR)
+    if not value:
+        return None
+    return Recorder(dump_path=DEFAULT_DUMP_FILE if value == '1' else value)
+
+
+recorder = _recorder_from_env()
+
+
+def timed(name):
+    """
+    Decorator recording the durations of a function (as `name`).
+    """
+    def decorator(func):
+        rec = recorder
+        if rec is None:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = rec.clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                rec.record(name, rec.clock() - start)
+        return wrapper
+    return decorator
+
+
+def interaction(name):
+    """
+    Decorator of a button's handler, recording its durations (as 'handler:<name>')
+    and the latencies from calling it to the next displayed frame (as 'tap_to_feedback:<name>').
+    """
+    def decorator(func):
+        rec = recorder
+        if rec is None:
+            return func
+        func = timed('handler:' + name)(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            rec.tap(name)
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
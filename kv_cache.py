@@ -0,0 +1,128 @@
+"""
+Cache of the compiled rules of kv files, across launches.
+
+Parsing a kv file compiles all its Python expressions, on every launch. The parsed (and compiled) rules
+are pickled instead, to a file that later launches load, skipping the parsing.
+Code objects, which can't be pickled, are stored with `marshal`.
+
+The cache is invalidated by a hash of the kv file's contents, its path (kept in the compiled code)
+and the versions of Python (marshal format) and kivy.
+
+Only Kivy's `load_kv_file()` imports kivy (lazily), so that the rest can be tested without it.
+"""
+
+
+import hashlib
+import marshal
+import os
+import pickle
+import sys
+import types
+
+
+# (changed whenever the cached contents change)
+CACHE_FORMAT_VERSION = 1
+CACHE_SUFFIX = '.cache'
+
+
+class _CodePickler(pickle.Pickler):
+
+    def reducer_override(self, obj):
+        if isinstance(obj, types.CodeType):
+            return marshal.loads, (marshal.dumps(obj),)
+        return NotImplemented
+
+
+def cache_key(contents, *args):
+    """
+    :param contents: (bytes) Contents of the kv file.
+    :param args: (str) Anything else the cache depends on, e.g. the path of the file.
+    :return: (str) Hex digest.
+    """
+    h = hashlib.sha256()
+    for arg in (str(CACHE_FORMAT_VERSION), sys.version) + args:
+        h.update(arg.encode('utf8'))
+        h.update(b'\0')
+    h.update(contents)
+    return h.hexdigest()
+
+
+def write_cache(path, key, obj):
+    """
+    :param obj: Anything picklable, except that it may contain code objects.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(key.encode('ascii') + b'\n')
+        _CodePickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    # (a partly written cache is never read)
+    os.replace(temp_path, path)
+
+
+def read_cache(path, key):
+    """
+    :return: Cached object, or None if there is none for `key` (or it can't be read).
+    """
+    try:
+        with open(path, 'rb') as f:
+            if f.readline().rstrip(b'\n') != key.encode('ascii'):
+                return None
+            return pickle.load(f)
+    except Exception:
+        # (e.g. no cache yet, or a cache that can't be unpickled any more)
+        return None
+
+
+def _register_rules(parser, filename):
+    """
+    Adds the parsed rules to the kivy Builder, as `Builder.load_string()` does.
+    """
+    from kivy.lang import Builder
+    from kivy.factory import Factory
+    from functools import partial
+
+    Builder.rules.extend(parser.rules)
+    Builder._clear_matchcache()
+    for name, cls, template in parser.templates:
+        Builder.templates[name] = (cls, template, filename)
+        Factory.register(name, cls=partial(Builder.template, name), is_template=True)
+    for name, baseclasses in parser.dynamic_classes.items():
+        Factory.register(name, baseclasses=baseclasses, filename=filename)
+    if filename not in Builder.files:
+        Builder.files.append(filename)
+
+
+def load_kv_file(filename, cache_dir):
+    """
+    Loads the rules of a kv file (as `Builder.load_file()`), from the cache if it's up to date.
+
+    Files with a root widget are loaded without the cache.
+
+    :param filename: (str) Path of the kv file.
+    :param cache_dir: (str) Directory of the cache file.
+    :return: Root widget, if the file has one.
+    """
+    from kivy import __version__ as kivy_version
+    from kivy.lang import Builder, Parser
+    from kivy.logger import Logger
+
+    with open(filename, 'rb') as f:
+        contents = f.read()
+    key = cache_key(contents, filename, kivy_version)
+    cache_path = os.path.join(cache_dir, os.path.basename(filename) + CACHE_SUFFIX)
+
+    parser = read_cache(path=cache_path, key=key)
+    if parser is not None:
+        # (e.g. '#:import', done while parsing)
+        parser.execute_directives()
+    else:
+        parser = Parser(content=contents.decode('utf-8-sig'), filename=filename)
+        if parser.root is not None:
+            return Builder.load_file(filename)
+        try:
+            write_cache(path=cache_path, key=key, obj=parser)
+        except Exception as e:
+            Logger.warning('KvCache: {} not cached ({})'.format(filename, e))
+
+    _register_rules(parser=parser, filename=filename)
@@ -1,5 +1,9 @@
 # -*- coding: utf-8 -*-
 
+# (first, so that it can time the imports below; see `MTM_STARTUP_PROFILE`)
+import startup_profile
+startup_profile.start_phase('import_main')
+
 # Used for screenshots that match size of current screenshots in GooglePlay
 if 0:
     from kivy.config import Config
@@ -10,8 +14,7 @@ from kivy.app import App
 from kivy.uix.button import Button
 from kivy.animation import Animation
 from kivy.uix.label import Label as Label
-from kivy.properties import ObjectProperty, DictProperty, NumericProperty, BooleanProperty, ListProperty, StringProperty
-from kivy.storage.jsonstore import JsonStore
+from kivy.properties import ObjectProperty, NumericProperty, BooleanProperty, ListProperty, StringProperty
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.dropdown import DropDown
 from kivy.uix.widget import Widget
@@ -25,44 +28,38 @@ from kivy.clock import Clock
 from kivy.uix.carousel import Carousel
 from kivy import platform
 from kivy.base import EventLoop
+from kivy.factory import Factory
+from kivy.event import EventDispatcher
+from kivy.logger import Logger
+from kivy.graphics.texture import Texture
+from kivy.core.image import ImageLoader
 
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 
-import ast
-import datetime
-import copy
+import os
+import time
 
 import arithmetics
 import languages
 import citations
+import storage
+import image_cache
+import assets
+import state
+import core
+import instrumentation
+import kv_cache
+# (also kept importable from here, as before they were moved to `core`)
+from core import APP_NAME, THIRD_PARTIES_IMAGES_DIR, DIFF_TO_COIN_MAP, DEFAULT_STORAGE_CONTENTS
 
 
 __version__ = '1.5.7'
 
-APP_NAME = 'MinusTimesMinus'
+# (as found by default by `App.load_kv()`)
+KV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'minustimesminus.kv')
 
 
-# ----------------------------------------------------------------------------------------------------------------------
-THIRD_PARTIES_IMAGES_DIR = 'third_parties_images'
-GOLD_COIN_SMALL_IM = '/'.join([THIRD_PARTIES_IMAGES_DIR, 'gold_coin_zeus_small.png'])
-SILVER_COIN_IM_PATH = '/'.join([THIRD_PARTIES_IMAGES_DIR, 'athena_coin.png'])
-COPPER_COIN_IM_PATH = '/'.join(['own_images', 'copper_coin.png'])
-
-
-DIFF_TO_COIN_MAP = {
-    '1': dict(
-        coin_color='copper_coins',
-        im_path=COPPER_COIN_IM_PATH
-    ),
-    '2': dict(
-        coin_color='silver_coins',
-        im_path=SILVER_COIN_IM_PATH
-    ),
-    '3': dict(
-        coin_color='gold_coins',
-        im_path=GOLD_COIN_SMALL_IM
-    ),
-}
 # ----------------------------------------------------------------------------------------------------------------------
 COLORS_TO_HEX_MAP = {
     'red': 'FF3232',
@@ -245,14 +242,165 @@ class ScrollLabel(ScrollView):
 
 
 # ----------------------------------------------------------------------------------------------------------------------
-class CoinImage(Image):
+# Maximum bytes of cached textures (see `CachedAsyncImage`).
+TEXTURES_CACHE_MAX_BYTES = 16 * 1024 * 1024
+TEXTURES_CACHE = image_cache.LRUCache(max_weight=TEXTURES_CACHE_MAX_BYTES,
+                                      weight_func=lambda texture: texture.width * texture.height * 4)
+_images_decoder = ThreadPoolExecutor(max_workers=1)
+# (texture key to the callbacks waiting for it, so that each texture is decoded only once)
+_pending_texture_callbacks = {}
+
+
+def _decode_image(texture_key):
+    """
+    Runs in the decoder's thread.
+
+    :param texture_key: (tuple) Path, displayed size.
+    :return: (tuple) Pixels, size, format, whether rows are bottom-to-top.
+    """
+    path, display_size = texture_key
+    # (same as kivy's `Loader`; no texture is created until data is accessed from the UI thread)
+    image_data = ImageLoader.load(path, keep_data=True, nocache=True)._data[0]
+    pixels, size, fmt = image_cache.subsample(pixels=image_data.data,
+                                              image_size=(image_data.width, image_data.height),
+                                              fmt=image_data.fmt,
+                                              display_size=display_size,
+                                              row_length=getattr(image_data, 'rowlength', 0))
+    return pixels, size, fmt, image_data.flip_vertical
+
+
+def _blit_pixels(texture, pixels, fmt):
+    texture.blit_buffer(pixels, colorfmt=fmt, bufferfmt='ubyte')
+
+
+def _on_image_decoded(texture_key, future, *args):
+    callbacks = _pending_texture_callbacks.pop(texture_key)
+    try:
+        pixels, size, fmt, flip_vertical = future.result()
+    except Exception as e:
+        Logger.warning('{}: Image {} not loaded ({})'.format(APP_NAME, texture_key[0], e))
+        return
+
+    texture = Texture.create(size=size, colorfmt=fmt)
+    _blit_pixels(texture=texture, pixels=pixels, fmt=fmt)
+    if flip_vertical:
+        texture.flip_vertical()
+    # (textures are emptied when the OpenGL context is lost, e.g. on android when the app is resumed)
+    texture.add_reload_observer(partial(_blit_pixels, pixels=pixels, fmt=fmt))
+    TEXTURES_CACHE.put(texture_key, texture)
+    startup_profile.end_phase('load_image:{} {}'.format(*texture_key))
+
+    for callback in callbacks:
+        callback(texture_key, texture)
+
+
+def request_texture(texture_key, callback):
+    """
+    Calls `callback(texture_key, texture)` from the UI thread once the texture is available.
+
+    :param texture_key: (tuple) Path, displayed size (see `image_cache.size_bucket`).
+    """
+    texture = TEXTURES_CACHE.get(texture_key)
+    if texture is not None:
+        callback(texture_key, texture)
+        return
+
+    if texture_key in _pending_texture_callbacks:
+        _pending_texture_callbacks[texture_key].append(callback)
+        return
+
+    _pending_texture_callbacks[texture_key] = [callback]
+    startup_profile.start_phase('load_image:{} {}'.format(*texture_key))
+    future = _images_decoder.submit(_decode_image, texture_key)
+    future.add_done_callback(lambda f: Clock.schedule_once(partial(_on_image_decoded, texture_key, f)))
+
+
+class CachedAsyncImage(Image):
+    """
+    Image decoded off the UI thread, only once it's displayed (in the window and laid out).
+    `image_path` can also be an atlas uri (see `assets.asset_uri`).
+
+    Its texture is subsampled to about its displayed size,
+    and shared through `TEXTURES_CACHE` with other images of same path and size.
+    """
+    image_path = StringProperty()
+
+    def __init__(self, **kwargs):
+        self._texture_key = None
+        self._trigger_load = Clock.create_trigger(self._load)
+        super(CachedAsyncImage, self).__init__(**kwargs)
+        self.bind(image_path=self._trigger_load, size=self._trigger_load, pos=self._trigger_load)
+
+    def _load(self, *args):
+        if not self.image_path or self.get_root_window() is None or min(self.size) <= 1:
+            return
+        if self.image_path.startswith('atlas://'):
+            # (atlas images are regions of a single, shared texture)
+            self.source = self.image_path
+            return
+        texture_key = (self.image_path, image_cache.size_bucket(self.size))
+        if texture_key == self._texture_key:
+            return
+        self._texture_key = texture_key
+        request_texture(texture_key=texture_key, callback=self._on_texture)
+
+    def _on_texture(self, texture_key, texture):
+        # (ignores textures of previous sizes or paths)
+        if texture_key == self._texture_key:
+            self.texture = texture
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class CoinImage(CachedAsyncImage):
     DELAY = 1.
     ANIMATION_DURATION = .3
+    INITIAL_POS_HINT = {'center_x': .5, 'center_y': .7}
+    INITIAL_SIZE_HINT_X = .2
 
     def __init__(self, **kwargs):
         super(CoinImage, self).__init__(**kwargs)
-        self.pos_hint = {'center_x': .5, 'center_y': .7}
-        self.size_hint_x = .2
+        self.reset()
+
+    def reset(self):
+        """
+        Restores the position and size changed by the animation.
+        """
+        Animation.cancel_all(self)
+        # (copied, since the animation changes the dict's values)
+        self.pos_hint = dict(self.INITIAL_POS_HINT)
+        self.size_hint_x = self.INITIAL_SIZE_HINT_X
+
+    def _load(self, *args):
+        # (the texture of the initial size is kept while the animation shrinks the image)
+        if self.texture is None or self._texture_key is None or self._texture_key[0] != self.image_path:
+            super(CoinImage, self)._load(*args)
+
+
+class CoinImagesPool(object):
+    """
+    Reusable coin images of each difficulty, so that animating a coin doesn't create a widget
+    (nor resolve its image) on every correct answer.
+
+    Images are created on first use (none while the play page is built), and their textures are loaded
+    off the UI thread once displayed (see `CachedAsyncImage`).
+    """
+
+    def __init__(self):
+        self._free_images = {diff_lvl: [] for diff_lvl in DIFF_TO_COIN_MAP}
+
+    @staticmethod
+    def _new_image(diff_lvl):
+        coin_im = CoinImage(image_path=assets.asset_uri(DIFF_TO_COIN_MAP[diff_lvl]['im_path']))
+        coin_im.diff_lvl = diff_lvl
+        return coin_im
+
+    def acquire(self, diff_lvl):
+        free_images = self._free_images[diff_lvl]
+        return free_images.pop() if free_images else self._new_image(diff_lvl)
+
+    def release(self, coin_im):
+        coin_im.reset()
+        self._free_images[coin_im.diff_lvl].append(coin_im)
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -281,17 +429,18 @@ class CheckAnswerButton(NumpadBaseButton):
     display_duration = CoinImage.ANIMATION_DURATION + CoinImage.DELAY
 
     user_answer = StringProperty()
-    correct_answer_val = NumericProperty()
+    question = ObjectProperty(None, allownone=True)
     user_answer_widget = ObjectProperty(Label())
 
     def __init__(self,  **kwargs):
         super(CheckAnswerButton, self).__init__(special_effect=Numpad.CHECK_ANSWER_EFFECT_TXT, **kwargs)
 
     def check_answer(self, given_a):
-        if abs(given_a - self.correct_answer_val) < 1e-8:
-            return True
-        else:
-            return False
+        """
+        :param given_a: (tuple) Parsed answer (see `arithmetics.parse_answer`).
+        :return: (bool)
+        """
+        return self.question.is_correct(parsed_answer=given_a)
 
     def set_answer_feed_label_text(self, answer_correctness, a_feed_label):
         if answer_correctness:
@@ -308,20 +457,16 @@ class CheckAnswerButton(NumpadBaseButton):
 
     def apply_rewards(self):
         # Rewards for accuracy
-        d = copy.deepcopy(self.app.store[self.op_type])
-        d.update({self.difficulty_lvl: self.app.store[self.op_type][self.difficulty_lvl] + 1})
-        self.app.store[self.op_type] = d
-        self.app.store_answers['correct'] += 1
+        self.app.record_answer(result='correct', op_type=self.op_type, difficulty_lvl=self.difficulty_lvl)
 
         # Rewards for consistency
-        CheckRewardAndNote(store_visiting_dct=self.app.store_visiting).consecutive_days()
+        self.app.update_visiting(self.app.achievements.answer_correct(op_type=self.op_type,
+                                                                      difficulty_lvl=self.difficulty_lvl))
 
+    @instrumentation.interaction('check')
     def check_a_and_apply_effects(self, a_feed_label):
-        if not self.user_answer:
-            return
-        try:
-            given_a = ast.literal_eval(self.user_answer.strip('+'))
-        except (ValueError, SyntaxError):
+        given_a = arithmetics.parse_answer(self.user_answer)
+        if given_a is None:
             return
 
         App.get_running_app().temp_disable_all_buttons(duration=self.display_duration)
@@ -333,7 +478,7 @@ class CheckAnswerButton(NumpadBaseButton):
             self.apply_rewards()
         else:
             self.set_answer_feed_label_text(answer_correctness=answer_correctness, a_feed_label=a_feed_label)
-            self.app.store_answers['wrong'] += 1
+            self.app.record_answer(result='wrong')
 
 
 class Numpad(StackLayout):
@@ -357,6 +502,7 @@ class Numpad(StackLayout):
     def reset_user_answer(self, *args):
         self.user_answer = ''
 
+    @instrumentation.interaction('numpad')
     def apply_button_effects(self, btn):
         btn_txt = btn.text
 
@@ -442,14 +588,15 @@ class RevealAnswerButton(Button):
         else:
             self.switch_functionality_to_reveal()
 
+    @instrumentation.interaction('reveal')
     def apply_button_effects(self, *args):
 
         if self.functionality_mode is self.REVEAL_MODE:
-            answer_in_red = paint_text(str(self.q_display.a_as_str()), 'red')
+            answer_in_red = paint_text(self.q_display.a_as_str(), 'red')
             self.a_feed_label.text = 'Correct answer is: {}'.format(answer_in_red)
             App.get_running_app().temp_disable_all_buttons(duration=None)
             self.disabled = False
-            self.app.store_answers['skipped'] += 1
+            self.app.record_answer(result='skipped')
 
         else:
             App.get_running_app().enable_all_buttons()
@@ -465,18 +612,28 @@ class PlayPage(FloatLayout):
 
     def __init__(self,  **kwargs):
         super(PlayPage, self).__init__(**kwargs)
+        self.coin_images_pool = CoinImagesPool()
+        # (created on first use, since `rewards_shortcut` is set after initialization;
+        # an animation can run on several widgets at once)
+        self._coin_animation = None
 
     def _start_coin_animation(self, _, coin_widg):
-        animation = Animation(size_hint_x=.05, duration=CoinImage.ANIMATION_DURATION, t='in_out_quad')
-        animation &= Animation(pos_hint=self.rewards_shortcut.pos_hint, duration=CoinImage.ANIMATION_DURATION, t='in_out_quad')
-        animation.start(coin_widg)
+        if self._coin_animation is None:
+            animation = Animation(size_hint_x=.05, duration=CoinImage.ANIMATION_DURATION, t='in_out_quad')
+            animation &= Animation(pos_hint=self.rewards_shortcut.pos_hint, duration=CoinImage.ANIMATION_DURATION, t='in_out_quad')
+            recorder = instrumentation.recorder
+            if recorder is not None:
+                animation.bind(on_start=lambda _, widg: recorder.start_span('coin_animation', key=id(widg)),
+                               on_complete=lambda _, widg: recorder.end_span('coin_animation', key=id(widg)))
+            self._coin_animation = animation
+        self._coin_animation.start(coin_widg)
 
     def _remove_widg(self, _, widg):
         self.remove_widget(widg)
+        self.coin_images_pool.release(widg)
 
     def create_and_schedule_animation_gold_coin(self, diff_lvl):
-        im_path = DIFF_TO_COIN_MAP[str(diff_lvl)]['im_path']
-        coin_im = CoinImage(source=im_path)
+        coin_im = self.coin_images_pool.acquire(str(diff_lvl))
         self.add_widget(coin_im)
         Clock.schedule_once(
             partial(self._start_coin_animation, coin_widg=coin_im),
@@ -490,71 +647,100 @@ class PlayPage(FloatLayout):
 class QuestionDisplay(Label):
     difficulty_lvl = StringProperty('1')
     op_type = StringProperty(arithmetics.QuestionAndAnswer.OPERATIONS_TYPES[0])
+    # (shared with other widgets, e.g. CheckAnswerButton)
+    question = ObjectProperty(None, allownone=True)
     question_str = StringProperty()
-    correct_answer_val = NumericProperty()
 
     def __init__(self, **kwargs):
         super(QuestionDisplay, self).__init__(text='', **kwargs)
+        self.prefetcher = None
+        self.start_prefetching()
         self.set_new_q_and_a()
 
-    def new_q_and_a(self):
-        inst = arithmetics.QuestionAndAnswer(difficulty_lvl=self.difficulty_lvl, op_type=self.op_type)
-        q = inst.operation_str()
-        a = inst.expected_answer()
-        return q, a
+    def start_prefetching(self):
+        # (next questions are created in advance, off the UI thread)
+        if self.prefetcher is None or self.prefetcher.closed:
+            self.prefetcher = arithmetics.QuestionPrefetcher(difficulty_lvl=self.difficulty_lvl, op_type=self.op_type)
 
+    def stop_prefetching(self):
+        """
+        Stops the prefetching thread (questions are then created when needed, until prefetching starts again).
+        """
+        if self.prefetcher is not None:
+            self.prefetcher.close()
+
+    @instrumentation.timed('set_new_q_and_a')
     def set_new_q_and_a(self, *args):
-        self.question_str, val = self.new_q_and_a()
-        # NumericProperty doesn't accept Decimal,
-        # and int answers should not be displayed as float in order to avoid confusing the user.
-        if arithmetics.DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP[self.difficulty_lvl]['terms_type'] == 'int':
-            pass
-        else:
-            val = (float(val))
-        self.correct_answer_val = val
+        self.prefetcher.set_settings(difficulty_lvl=self.difficulty_lvl, op_type=self.op_type)
+        q = self.prefetcher.next_question()
+        self.question = q
+        self.question_str = q.question_str
 
     def a_as_str(self):
-        if self.correct_answer_val < 0:
-            return str(self.correct_answer_val)
-        else:
-            return '+{}'.format(self.correct_answer_val)
+        # (formatted from the fixed-point answer, e.g. '+0.3' rather than a float's '+0.30000000000000004',
+        # and '+4.0' rather than '+4.00' for products of decimals)
+        return self.question.answer_as_string(explicit_plus=True, trim_zeros=True)
 
 # ----------------------------------------------------------------------------------------------------------------------
-# List containing all wreath-rewards.
-# Wreath-images that are used to display total wreaths earned,
-# should not be stored here.
-wreaths_lst = []
+class WreathsRegistry(EventDispatcher):
+    """
+    Wreath-rewards, registered as they are created (in any order relative to the widgets showing them).
+    Wreath-images that are used to display total wreaths earned are not registered.
 
+    One per app (see `MinusTimesMinusApp.wreaths_registry`), so that wreaths of an app aren't kept after it.
+    """
+    # Whether the goal of each registered wreath is complete (in order of registration).
+    goals_complete = ListProperty()
 
-class WreathImage(Image):
+    def __init__(self, **kwargs):
+        super(WreathsRegistry, self).__init__(**kwargs)
+        self._indexes = {}
+
+    def register(self, wreath):
+        self._indexes[wreath] = len(self.goals_complete)
+        # (a single handler for all wreaths)
+        wreath.bind(goal_complete=self._on_goal_complete)
+        self.goals_complete.append(wreath.goal_complete)
+
+    def _on_goal_complete(self, wreath, value):
+        self.goals_complete[self._indexes[wreath]] = value
+
+
+class WreathImage(CachedAsyncImage):
     goal_complete = BooleanProperty(False)
 
-    def __init__(self, store_in_wreath_list=True, **kwargs):
+    def __init__(self, registered=True, **kwargs):
         super(WreathImage, self).__init__(**kwargs)
-        if store_in_wreath_list:
-            wreaths_lst.append(self)
+        if registered:
+            App.get_running_app().wreaths_registry.register(self)
 
 
 class AllWreaths(BoxLayout):
+    """
+    Mirrors all registered wreaths, as soon as they are registered or their goal changes
+    (while it's in the widget tree).
+    """
 
     def __init__(self, **kwargs):
+        self.wreaths_registry = App.get_running_app().wreaths_registry
         super(AllWreaths, self).__init__(**kwargs)
-        # (ensure enough time for creation of all wreaths before checking them)
-        Clock.schedule_once(self.set_wreaths_lst_as_children, 1.5)
 
-    def set_wreaths_lst_as_children(self, *args):
-        # (old wreath controls the new wreath)
-        for wreath in wreaths_lst:
-            new_wreath = WreathImage(store_in_wreath_list=False)
-            new_wreath.goal_complete = wreath.goal_complete
-            wreath.linked_wreath = new_wreath
-            wreath.bind(goal_complete=lambda old_l_self, val: setattr(old_l_self.linked_wreath, 'goal_complete', val))
-
-            self.ids.wreaths_images_box.add_widget(new_wreath)
+    def on_parent(self, widget, parent):
+        # (unbound once removed, so that the registry doesn't keep it)
+        if parent is None:
+            self.wreaths_registry.unbind(goals_complete=self.mirror_wreaths)
+        else:
+            self.wreaths_registry.bind(goals_complete=self.mirror_wreaths)
+            self.mirror_wreaths()
 
-    def on_wreaths_lst(self, *args):
-        for l in self.wreaths_lst:
-            self.ids.wreaths_images_box.add_widget(l)
+    def mirror_wreaths(self, *args):
+        box = self.ids.wreaths_images_box
+        goals_complete = self.wreaths_registry.goals_complete
+        for _ in range(len(box.children), len(goals_complete)):
+            box.add_widget(WreathImage(registered=False))
+        # (children are in reverse order of addition)
+        for mirror, goal_complete in zip(reversed(box.children), goals_complete):
+            mirror.goal_complete = goal_complete
 
 
 class MyProgressBar(Widget):
@@ -567,83 +753,16 @@ class CitationsBox(GridLayout):
         super(CitationsBox, self).__init__(cols=2, **kwargs)
         self.create_citations()
 
+    @startup_profile.phased('create_citations')
     def create_citations(self):
         for im_file_name, citation_obj in citations.FIRST_IMAGE_TO_CITATION_MAP.items():
-            im_widg = Image(source='/'.join([THIRD_PARTIES_IMAGES_DIR, im_file_name]),
-                            size_hint=(.3,.3))
+            im_path = assets.asset_uri('/'.join([THIRD_PARTIES_IMAGES_DIR, im_file_name]))
+            im_widg = CachedAsyncImage(image_path=im_path,
+                                       size_hint=(.3,.3))
             self.add_widget(im_widg)
             self.add_widget(ConfinedTextLabel(text=citation_obj.full_text()))
 
 
-# ----------------------------------------------------------------------------------------------------------------------
-class CheckRewardAndNote(object):
-    """Contains methods that CHECK if an action should REWARD the user,
-    and NOTE his progress. Rewards are only noted;
-    `on_store` triggers various rewards in their respective code-location.
-
-    Only public methods of this class should be called
-    since they incorporate full functionality (including e.g. checks).
-    """
-    _DAYS_TO_ACHIEV_NAME_MAP = {
-        5: 'achiev_5_days',
-        10: 'achiev_10_days',
-        30: 'achiev_30_days',
-    }
-
-    def __init__(self, store_visiting_dct):
-        self.store_visit_dct = store_visiting_dct
-        self.days_achiev_dct = {
-            days: self.store_visit_dct[name] for days, name in self._DAYS_TO_ACHIEV_NAME_MAP.items()}
-        self.days_diff = self._days_from_previous_play()
-
-    def set_consecutive_days(self, *args):
-        if self.days_diff > 1:
-            self.store_visit_dct['consecutive_days'] = 0
-
-    def _check_and_apply_consecutive_days_achievs(self):
-        for days, achiev_name in self._DAYS_TO_ACHIEV_NAME_MAP.items():
-
-            # Already achieved
-            achiev_val = self.days_achiev_dct[days]
-            if achiev_val:
-                continue
-
-            # Check if requirements are fulfilled
-            if self.store_visit_dct['consecutive_days'] == days:
-                self.store_visit_dct[achiev_name] = 1
-                # E.g. if (exactly) 20 days are complete,
-                # then no point in checking for 10 or 30, etc.
-                return
-
-    def _days_from_previous_play(self):
-        curr_d = datetime.date.today()
-        prev_d_as_iso_str = self.store_visit_dct['last_day']
-        if prev_d_as_iso_str:
-            date_lst = prev_d_as_iso_str.split('-')
-            date_lst = [int(i) for i in date_lst]
-            prev_d = datetime.date(*date_lst)
-            return (curr_d - prev_d).days
-        else:
-            # During reset last_day played becomes 0,
-            # therefor the played "hasn't played" recently.
-            return 999
-
-    def consecutive_days(self):
-        if all(self.days_achiev_dct.values()):
-            return
-
-        if self.days_diff == 0:
-            return
-        elif self.days_diff == 1:
-            self.store_visit_dct['consecutive_days'] += 1
-            self._check_and_apply_consecutive_days_achievs()
-        else:
-            # (minimum value is 1, not 0)
-            self.store_visit_dct['consecutive_days'] = 1
-
-        self.store_visit_dct['last_day'] = datetime.date.today().isoformat()
-
-
 # ----------------------------------------------------------------------------------------------------------------------
 class ResetRewardsButton(Button):
     def __init__(self, **kwargs):
@@ -699,119 +818,227 @@ class MemoRule(BoxLayout):
 
 
 # ----------------------------------------------------------------------------------------------------------------------
+class LazySlide(BoxLayout):
+    """
+    Placeholder of a carousel slide.
+    Its page (a kv class, e.g. 'RewardsPage') is created when the slide is first about to be displayed,
+    so that launching the app doesn't pay for pages that might never be visited.
+
+    If the environment variable `MTM_EAGER_PAGES` is set, pages are created at launch instead,
+    e.g. to compare the 'first_frame' mark of startup profiles (see `MTM_STARTUP_PROFILE`) with and without it.
+    """
+    EAGER = bool(os.environ.get('MTM_EAGER_PAGES'))
+
+    page_cls_name = StringProperty()
+    page = ObjectProperty(None, allownone=True)
+
+    def on_kv_post(self, base_widget):
+        if self.EAGER:
+            self.build_page()
+
+    def build_page(self, *args):
+        if self.page is not None:
+            return
+        with startup_profile.phase('build_page:' + self.page_cls_name):
+            self.page = Factory.get(self.page_cls_name)()
+            self.add_widget(self.page)
+
+
 class MainWidget(Carousel):
     lang = StringProperty()
 
     def __init__(self, **kwargs):
         super(MainWidget, self).__init__(**kwargs)
-        CheckRewardAndNote(store_visiting_dct=self.app.store_visiting).set_consecutive_days()
+        self.app.update_visiting(self.app.achievements.start())
+        self.bind(index=self._schedule_build_of_adjacent_slides)
+
+    @staticmethod
+    def _build_if_lazy(slide):
+        if isinstance(slide, LazySlide):
+            slide.build_page()
 
+    def load_slide(self, slide):
+        self._build_if_lazy(slide)
+        super(MainWidget, self).load_slide(slide)
 
-# ----------------------------------------------------------------------------------------------------------------------
-DEFAULT_STORAGE_CONTENTS = {
-    "multiplication": {"1": 0,
-                       "3": 0,
-                       "2": 0},
-    "addition": {"1": 0,
-                 "3": 0,
-                 "2": 0},
-    "answers": {"wrong": 0,
-                "skipped": 0,
-                "correct": 0},
-    "visiting": {"achiev_10_days": 0,
-                 "last_day": 0,
-                 "consecutive_days": 0,
-                 "achiev_30_days": 0,
-                 "achiev_5_days": 0}}
+    def _build_adjacent_slides(self, *args):
+        # (adjacent slides are partly displayed while swiping)
+        for slide in (self.current_slide, self.previous_slide, self.next_slide):
+            self._build_if_lazy(slide)
 
+    def _schedule_build_of_adjacent_slides(self, *args):
+        # (after the frame that displays the current slide)
+        Clock.schedule_once(self._build_adjacent_slides)
 
+
+# ----------------------------------------------------------------------------------------------------------------------
 class MinusTimesMinusApp(App):
     CONFIG_DEFAULTS = (
             ('language', {
                 'selected_lang': languages.Message.DEFAULT_LANGUAGE,
             }),
         )
-
-    # "store" is a DictProperty-copy of the actual store,
-    # since as an ObjectProperty it wasn't tracking changes.
-    store = DictProperty()
-    # DictProperties are shallow copies,
-    # so a separate property is needed in order to fire callbacks
-    # (since nested value-changes are ignored)
-    store_visiting = DictProperty()
-    store_answers = DictProperty()
+    # (one of `storage.STORE_BACKENDS`)
+    STORAGE_BACKEND = 'event_log'
+    # (older storage file, read only as starting point of the progress)
+    STORAGE_FILE = 'storage.json'
+    PROGRESS_DIR = 'progress'
+    # Seconds between dumps of instrumentation snapshots (only if enabled, see `instrumentation`).
+    INSTRUMENTATION_DUMP_INTERVAL = 60
+    # Seconds after the first frame when the startup profile is written (only if enabled, see `startup_profile`).
+    STARTUP_PROFILE_SETTLE_TIME = 3
+    # Directory of the cache of the compiled kv rules (the user data dir if None).
+    KV_CACHE_DIR = None
+
+    # Snapshots of `self.state` (read-only), all of it and of each of its sections.
+    # (each is set only when it changes, so kv rules are updated only when the values they use change)
+    store = ObjectProperty()
+    store_addition = ObjectProperty()
+    store_multiplication = ObjectProperty()
+    store_visiting = ObjectProperty()
+    store_answers = ObjectProperty()
     total_coins = NumericProperty()
     buttons_disabled = BooleanProperty(False)
     lang = StringProperty()
 
     def __init__(self, **kwargs):
         super(MinusTimesMinusApp, self).__init__(**kwargs)
+        self._init_time = time.perf_counter()
 
-        # Storage file is checked/stored in different dir on androids
+        # Storage is checked/stored in different dir on androids
         # to avoid overwriting it during updates.
-        storage_file = 'storage.json'
+        storage_file = self.STORAGE_FILE
+        progress_dir = self.PROGRESS_DIR
         if platform == 'android':
             storage_file = '/'.join([str(self.user_data_dir), storage_file])
+            progress_dir = '/'.join([str(self.user_data_dir), progress_dir])
         elif platform in ('ios', 'win'):
             raise NotImplementedError('Platform not implemented. Storage will be overridden on updates.')
         self.storage_file = storage_file
-        self._store = JsonStore(storage_file)
-        if not self._store:
-            for k, v in DEFAULT_STORAGE_CONTENTS.items():
-                self._store[k] = copy.deepcopy(v)
-
-        self.store = copy.deepcopy(self._store._data)
-        # DictProperties are shallow copies,
-        # so a separate property is needed in order to fire callbacks
-        # (since nested value-changes are ignored)
-        self.store_visiting = copy.deepcopy(self._store._data['visiting'])
-        self.store_answers = copy.deepcopy(self._store._data['answers'])
+        # (contents of the older storage file, if any, are used as starting point)
+        with startup_profile.phase('open_store'):
+            self._store = storage.open_store(
+                backend=self.STORAGE_BACKEND,
+                directory=progress_dir,
+                initial_data=storage.read_json_contents(path=storage_file, default=DEFAULT_STORAGE_CONTENTS))
+
+        self.state = state.State(self._store.data_copy())
+        self.store = self.state.snapshot()
+        for section, values in self.store.items():
+            setattr(self, 'store_' + section, values)
+            self.state.bind((section,), self._on_state_section)
+        self.state.bind((), self._on_state)
+        self.achievements = core.AchievementEngine(visiting_dct=self.store_visiting)
+        self.wreaths_registry = WreathsRegistry()
+
+        self._config_writer = None
+
+    def flush_storage(self, *args):
+        """
+        Writes all pending storage and config changes to file.
+        """
+        self._store.flush()
+        if self._config_writer is not None:
+            self._config_writer.flush()
+
+    def dump_instrumentation(self, *args):
+        if instrumentation.recorder is not None:
+            instrumentation.recorder.dump()
 
     def on_pause(self, *args):
+        # (app might be killed while paused)
+        self.flush_storage()
+        self.dump_instrumentation()
+        if platform == 'android':
+            self.main_widg.ids.q_display.stop_prefetching()
         return True
 
+    def on_resume(self, *args):
+        self.main_widg.ids.q_display.start_prefetching()
+
+    def on_stop(self):
+        self.flush_storage()
+        self.dump_instrumentation()
+        self.main_widg.ids.q_display.stop_prefetching()
+
     def on_start(self):
         EventLoop.window.bind(on_keyboard=self.keyboard_callback)
+        EventLoop.window.bind(on_flip=self._log_time_to_first_frame)
+        if instrumentation.recorder is not None:
+            self._start_instrumentation(recorder=instrumentation.recorder)
+
+    def _start_instrumentation(self, recorder):
+        if platform == 'android' and not recorder.dump_path.startswith('/'):
+            # (collected from the app's data dir)
+            recorder.dump_path = '/'.join([str(self.user_data_dir), recorder.dump_path])
+        # (called once per frame)
+        Clock.schedule_interval(recorder.on_frame, 0)
+        EventLoop.window.bind(on_flip=lambda *args: recorder.on_frame_displayed())
+        Clock.schedule_interval(self.dump_instrumentation, self.INSTRUMENTATION_DUMP_INTERVAL)
+        Logger.info('{}: Instrumentation enabled, dumped to {}'.format(APP_NAME, recorder.dump_path))
+
+    def _log_time_to_first_frame(self, *args):
+        """
+        Logs time-to-first-interactive (first displayed frame of the app).
+        """
+        EventLoop.window.unbind(on_flip=self._log_time_to_first_frame)
+        Logger.info('{}: First frame {:.3f} s after app creation'.format(APP_NAME,
+                                                                      time.perf_counter() - self._init_time))
+        if startup_profile.profiler is not None:
+            startup_profile.mark('first_frame')
+            # (after the deferred parts of the startup, e.g. the adjacent pages and their images)
+            Clock.schedule_once(self._finish_startup_profile, self.STARTUP_PROFILE_SETTLE_TIME)
+
+    def _finish_startup_profile(self, *args):
+        profiler = startup_profile.profiler
+        if platform == 'android' and not profiler.timeline_path.startswith('/'):
+            profiler.timeline_path = '/'.join([str(self.user_data_dir), profiler.timeline_path])
+        timeline = profiler.finish(version=__version__, platform=platform, eager_pages=LazySlide.EAGER)
+        Logger.info('{}: Startup profile ({} imports in {:.0f} ms) written to {}'.format(
+            APP_NAME, len(timeline['imports']), timeline['imports_total_ms'], profiler.timeline_path))
 
     def keyboard_callback(self, window, key, *args):
         if (platform == 'android') and (key == 27):
             self.main_widg.load_previous()
             return True
 
+    @instrumentation.timed('record_answer')
+    def record_answer(self, result, op_type=None, difficulty_lvl=None):
+        """
+        Increases the counters of an answer.
+
+        :param result: (str) 'correct', 'wrong' or 'skipped'.
+        """
+        # (noted in storage first, so that `_on_state_section` then finds storage already up to date)
+        self._store.record_answer(result=result, op_type=op_type, difficulty_lvl=difficulty_lvl)
+        self.state.update_sections(storage.answer_changes(data=self.state.snapshot(), result=result,
+                                                          op_type=op_type, difficulty_lvl=difficulty_lvl))
+
+    def update_visiting(self, changes):
+        """
+        :param changes: (dict) Changed values of the visiting section (see `core.AchievementEngine`).
+        """
+        if changes:
+            self.state.update('visiting', changes)
+
     def set_tot_coins(self):
-        tot = 0
-        for op_type in arithmetics.QuestionAndAnswer.OPERATIONS_TYPES:
-            for diff_lvl in DIFF_TO_COIN_MAP:
-                tot += self.store[op_type][diff_lvl]
-        self.total_coins = tot
-
-    def update__store(self):
-        for k1 in self.store:
-            # (`update` doesn't work on Storage objects,
-            # so a temp dict is used instead)
-            temp_d = {}
-            for k2, v in self.store[k1].items():
-                temp_d.update({k2: v})
-            self._store[k1] = temp_d
-
-    def on_store_visiting(self, *args):
-        self.store['visiting'] = self.store_visiting
-
-    def on_store_answers(self, *args):
-        self.store['answers'] = self.store_answers
-
-    def on_store(self, *args):
-        self.set_tot_coins()
-        self.update__store()
+        self.total_coins = core.total_coins(self.store)
+
+    @instrumentation.timed('update_store')
+    def _on_state_section(self, path, values):
+        section = path[0]
+        setattr(self, 'store_' + section, values)
+        # (storage writes only actual changes)
+        self._store[section] = values
+        if section in arithmetics.QuestionAndAnswer.OPERATIONS_TYPES:
+            self.set_tot_coins()
+
+    def _on_state(self, path, snapshot):
+        self.store = snapshot
 
     def reset_store(self, *args):
-        dct = copy.deepcopy(self._store._data)
-        for k1, d in dct.items():
-            for k2 in d:
-                dct[k1][k2] = 0
-        self.store = dct
-        self.store_visiting = dct['visiting']
-        self.store_answers = dct['answers']
+        self.state.update_sections({section: dict.fromkeys(values, 0) for section, values in self.store.items()})
+        self.achievements.reset(self.store_visiting)
 
     def enable_all_buttons(self, *args):
         self.buttons_disabled = False
@@ -828,7 +1055,7 @@ class MinusTimesMinusApp(App):
 
     def on_lang(self, *args):
         self.config.set('language', 'selected_lang', self.lang)
-        self.config.write()
+        self._config_writer.mark_dirty()
 
     def tr(self, dct):
         """
@@ -838,11 +1065,25 @@ class MinusTimesMinusApp(App):
         """
         return dct[self.app.lang]
 
+    def load_kv(self, filename=None):
+        """
+        Loads the kv file, from the cache of its compiled rules if up to date (see `kv_cache`).
+        """
+        with startup_profile.phase('load_kv'):
+            filename = filename or KV_FILE
+            root = kv_cache.load_kv_file(filename=filename, cache_dir=self.KV_CACHE_DIR or self.user_data_dir)
+        if root:
+            self.root = root
+        return True
+
     def build_config(self, config):
         for pair in self.CONFIG_DEFAULTS:
             config.setdefaults(*pair)
 
+    @startup_profile.phased('build')
     def build(self):
+        # (config exists only after app starts running)
+        self._config_writer = storage.CoalescedWriter(write_func=self.config.write)
 
         self.main_widg = MainWidget()
         self.main_widg.lang = self.config.get('language', 'selected_lang')
@@ -850,11 +1091,16 @@ class MinusTimesMinusApp(App):
         return self.main_widg
 
 
+startup_profile.end_phase('import_main')
+
+
 if __name__ == '__main__':
 
     try:
         import IGNORE_BUILD_ensure_images_cited
     except ImportError:
         pass
+    else:
+        IGNORE_BUILD_ensure_images_cited.ensure_images_cited()
 
     MinusTimesMinusApp().run()
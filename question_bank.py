@@ -0,0 +1,191 @@
+"""
+Bulk generation of question banks (command line), e.g. for printed exercises or for grading at scale
+(see `grading.bank_grader()`).
+
+Questions are written in shards, each shard created by a separate process.
+Questions are created in fixed blocks with `arithmetics.generate_batch()`, each block drawn from its own seed
+(see `bank_block()`), therefore the contents of a bank depend only on the seed
+(not on the number of workers or the shard size).
+
+Kept apart from `arithmetics`, so that the app doesn't import what only the command line needs
+(e.g. multiprocessing).
+"""
+
+
+import argparse
+import csv
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import arithmetics
+
+
+BANK_FORMATS = ('jsonl', 'csv')
+BANK_FIELDS = ('id', 'difficulty_lvl', 'op_type', 'question', 'answer')
+MANIFEST_FILE_NAME = 'manifest.json'
+# Questions of each block (changing it changes the contents of banks).
+BANK_BLOCK_SIZE = 4096
+
+
+def bank_stream_seed(seed, difficulty_lvl, op_type):
+    """
+    Seed of the questions of given difficulty and operation type in a bank,
+    so that banks of different difficulties/operations are independent.
+
+    :return: (int)
+    """
+    counter = (int(difficulty_lvl) << 8) | arithmetics.QuestionAndAnswer.OPERATIONS_TYPES.index(op_type)
+    return arithmetics.CounterRandom(seed=seed, counter=counter).next_64()
+
+
+def bank_block(stream_seed, block_number, difficulty_lvl, op_type):
+    """
+    Creates questions #`block_number * BANK_BLOCK_SIZE` to #`(block_number + 1) * BANK_BLOCK_SIZE` of a bank,
+    without creating any of the previous ones.
+
+    :param stream_seed: (int) See `bank_stream_seed()`.
+    :return: (arithmetics.QuestionBatch)
+    """
+    block_seed = arithmetics.CounterRandom(seed=stream_seed, counter=block_number).next_64()
+    return arithmetics.generate_batch(n=BANK_BLOCK_SIZE, difficulty_lvl=difficulty_lvl, op_type=op_type,
+                                      rng=random.Random(block_seed))
+
+
+def _write_shard(out_dir, file_name, fmt, stream_seed, difficulty_lvl, op_type, start, count):
+    """
+    Creates questions #`start` to #`start + count` of a stream and writes them to a file.
+
+    (Runs in a worker process.)
+
+    :return: (dict) Shard's manifest entry.
+    """
+    start_time = time.time()
+    path = os.path.join(out_dir, file_name)
+    end = start + count
+
+    with open(path, 'w', newline='') as f:
+        if fmt == 'csv':
+            writer = csv.writer(f)
+            writer.writerow(BANK_FIELDS)
+        for block_number in range(start // BANK_BLOCK_SIZE, -(-end // BANK_BLOCK_SIZE)):
+            batch = bank_block(stream_seed=stream_seed, block_number=block_number,
+                               difficulty_lvl=difficulty_lvl, op_type=op_type)
+            block_start = block_number * BANK_BLOCK_SIZE
+            # (only the questions of the shard; strings are rendered only for them)
+            rows = [(n, difficulty_lvl, op_type, batch.question_str(n - block_start), batch.answer_str(n - block_start))
+                    for n in range(max(start, block_start), min(end, block_start + BANK_BLOCK_SIZE))]
+            if fmt == 'csv':
+                writer.writerows(rows)
+            else:
+                f.writelines(json.dumps(dict(zip(BANK_FIELDS, row))) + '\n' for row in rows)
+
+    return dict(file=file_name, difficulty_lvl=difficulty_lvl, op_type=op_type, stream_seed=stream_seed,
+                start=start, count=count, seconds=time.time() - start_time)
+
+
+def generate_bank(out_dir, count, seed, difficulty_lvls=None, op_types=None, fmt='jsonl',
+                  shard_size=100000, workers=None):
+    """
+    Writes `count` questions for each difficulty and operation type, sharded across worker processes,
+    along with a manifest describing the bank.
+
+    :param out_dir: (str)
+    :param count: (int) Questions per difficulty and operation type.
+    :param seed: (int)
+    :param difficulty_lvls: (iterable) Defaults to all difficulties.
+    :param op_types: (iterable) Defaults to all operation types.
+    :param fmt: (str) One of `BANK_FORMATS`.
+    :param shard_size: (int) Maximum questions per file.
+    :param workers: (int) Number of processes; defaults to the number of CPUs.
+    :return: (dict) Manifest.
+    """
+    if fmt not in BANK_FORMATS:
+        raise ValueError('Format {} not in {}'.format(fmt, BANK_FORMATS))
+    if count < 1 or shard_size < 1:
+        raise ValueError('Count and shard size should be positive.')
+
+    difficulty_lvls = sorted(difficulty_lvls or arithmetics.DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP)
+    op_types = list(op_types or arithmetics.QuestionAndAnswer.OPERATIONS_TYPES)
+    os.makedirs(out_dir, exist_ok=True)
+
+    shards_kwargs = []
+    for difficulty_lvl in difficulty_lvls:
+        for op_type in op_types:
+            stream_seed = bank_stream_seed(seed=seed, difficulty_lvl=difficulty_lvl, op_type=op_type)
+            for shard_number, start in enumerate(range(0, count, shard_size)):
+                file_name = '{op}_{diff}_{shard:05d}.{fmt}'.format(op=op_type, diff=difficulty_lvl,
+                                                                  shard=shard_number, fmt=fmt)
+                shards_kwargs.append(dict(out_dir=out_dir, file_name=file_name, fmt=fmt, stream_seed=stream_seed,
+                                          difficulty_lvl=difficulty_lvl, op_type=op_type,
+                                          start=start, count=min(shard_size, count - start)))
+
+    start_time = time.time()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_write_shard, **kwargs) for kwargs in shards_kwargs]
+        shards = [f.result() for f in futures]
+    seconds = time.time() - start_time
+
+    total = sum(shard['count'] for shard in shards)
+    manifest = dict(seed=seed,
+                    format=fmt,
+                    fields=BANK_FIELDS,
+                    count_per_bank=count,
+                    total_count=total,
+                    seconds=seconds,
+                    questions_per_second=total / seconds if seconds else None,
+                    shards=shards)
+
+    with open(os.path.join(out_dir, MANIFEST_FILE_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+def _positive_int(value):
+    """
+    (argparse type)
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError('{} is not a positive integer'.format(value))
+    return number
+
+
+def main(argv=None):
+    """
+    Command line entry point, e.g.:
+        python question_bank.py out_dir --count 1000000 --seed 5 --workers 4 --format csv
+    """
+    parser = argparse.ArgumentParser(prog='question_bank.py', description='Generate sharded question banks.')
+    parser.add_argument('out_dir')
+    parser.add_argument('--count', type=_positive_int, required=True,
+                        help='Questions per difficulty and operation type.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--difficulty', action='append', dest='difficulty_lvls',
+                        choices=sorted(arithmetics.DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP),
+                        help='Can be repeated. Defaults to all difficulties.')
+    parser.add_argument('--op-type', action='append', dest='op_types',
+                        choices=arithmetics.QuestionAndAnswer.OPERATIONS_TYPES,
+                        help='Can be repeated. Defaults to all operation types.')
+    parser.add_argument('--format', dest='fmt', choices=BANK_FORMATS, default='jsonl')
+    parser.add_argument('--shard-size', type=_positive_int, default=100000)
+    parser.add_argument('--workers', type=_positive_int, default=None)
+
+    args = parser.parse_args(argv)
+
+    manifest = generate_bank(out_dir=args.out_dir, count=args.count, seed=args.seed,
+                         difficulty_lvls=args.difficulty_lvls, op_types=args.op_types, fmt=args.fmt,
+                         shard_size=args.shard_size, workers=args.workers)
+    print('{total} questions in {shards} files, {seconds:.2f}s ({rate:.0f} questions/s)'.format(
+        total=manifest['total_count'], shards=len(manifest['shards']), seconds=manifest['seconds'],
+        rate=manifest['questions_per_second'] or 0))
+
+
+if __name__ == '__main__':
+    main()
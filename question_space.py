@@ -0,0 +1,287 @@
+"""
+Exhaustive index of all possible questions of integer difficulties.
+
+Integer terms have 2 * (MAX_ABS_VALUE + 1) equally likely outcomes each
+(absolute value times drawn sign; the sign of 0 only affects how it's displayed),
+so a difficulty with `n` terms has (2 * (MAX_ABS_VALUE + 1)) ** n distinct questions.
+
+Each question is identified by an id; the id's digits (in that base) are the terms' outcomes,
+first term being the most significant digit. Sampling an id uniformly is therefore
+equivalent to creating a random question.
+
+The space is enumerated once into packed arrays (terms, answers, rendered strings with their offsets)
+and optionally cached on disk, in a directory owned by the app or user (nothing is cached by default).
+Cached files hold a json header and the arrays' raw bytes, so reading them can't run any code.
+"""
+
+
+import array
+import bisect
+import json
+import os
+import random
+import sys
+
+import arithmetics
+
+
+# Increase when the format of the cached file changes.
+_CACHE_VERSION = 2
+# Arrays of the cached file (in this order) and their type codes.
+_CACHED_ARRAYS = (('terms', 'i'), ('answers', 'i'), ('str_offsets', 'I'), ('ids_by_answer', 'I'),
+                  ('sorted_answers', 'i'))
+
+
+class QuestionSpaceIndex(object):
+    """
+    All questions of an integer difficulty and an operation type.
+
+    Arrays are built (or loaded from disk) on first access.
+    """
+
+    def __init__(self, difficulty_lvl, op_type, cache_dir=None):
+        """
+        :param difficulty_lvl: (str) Difficulty with integer terms.
+        :param op_type: (str)
+        :param cache_dir: (str) Directory of the cached file. If None, the index is kept only in memory.
+        """
+        diff_dct = arithmetics.DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP[difficulty_lvl]
+        if diff_dct['terms_type'] != 'int':
+            raise ValueError('Difficulty {} does not have integer terms.'.format(difficulty_lvl))
+        if op_type not in arithmetics.OPERATION_TO_FUNC_MAP:
+            raise NotImplementedError('{}'.format(op_type))
+
+        self.difficulty_lvl = difficulty_lvl
+        self.op_type = op_type
+        self.cache_dir = cache_dir
+        self.terms_count = diff_dct['terms_count']
+        self.max_abs_value = arithmetics.Terms.MAX_ABS_VALUE
+        self.outcomes_per_term = 2 * (self.max_abs_value + 1)
+        self._size = self.outcomes_per_term ** self.terms_count
+
+        self._terms = None
+        self._answers = None
+        self._strs = None
+        self._str_offsets = None
+        self._ids_by_answer = None
+        self._sorted_answers = None
+
+    def __len__(self):
+        return self._size
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Building
+    def cache_file_path(self):
+        file_name = 'v{version}_max{max_val}_diff{diff}_{op}.bin'.format(version=_CACHE_VERSION,
+                                                                           max_val=self.max_abs_value,
+                                                                           diff=self.difficulty_lvl,
+                                                                           op=self.op_type)
+        return os.path.join(self.cache_dir, file_name)
+
+    def outcomes(self, question_id):
+        """
+        Splits an id to its terms' outcomes.
+
+        :param question_id: (int)
+        :return: (list) (absolute value, is negative) for each term.
+        """
+        lst = []
+        for _ in range(self.terms_count):
+            question_id, digit = divmod(question_id, self.outcomes_per_term)
+            lst.append((digit >> 1, bool(digit & 1)))
+        # (first term is the most significant digit)
+        lst.reverse()
+        return lst
+
+    def _enumerate(self):
+        terms = array.array('i')
+        answers = array.array('i')
+        str_offsets = array.array('I', [0])
+        strs = []
+        offset = 0
+
+        for question_id in range(self._size):
+            outcomes = self.outcomes(question_id)
+            q = arithmetics.Question(difficulty_lvl=self.difficulty_lvl,
+                                     op_type=self.op_type,
+                                     terms=[-v if neg else v for v, neg in outcomes],
+                                     negatives=[neg for _, neg in outcomes])
+            terms.extend(q.terms)
+            answers.append(q.answer)
+            strs.append(q.question_str)
+            offset += len(q.question_str)
+            str_offsets.append(offset)
+
+        ids_by_answer = array.array('I', sorted(range(self._size), key=answers.__getitem__))
+        sorted_answers = array.array('i', [answers[i] for i in ids_by_answer])
+
+        return dict(terms=terms,
+                    answers=answers,
+                    strs=''.join(strs),
+                    str_offsets=str_offsets,
+                    ids_by_answer=ids_by_answer,
+                    sorted_answers=sorted_answers)
+
+    def _cache_header(self, data):
+        return {
+            'version': _CACHE_VERSION,
+            'size': self._size,
+            'byteorder': sys.byteorder,
+            'arrays': [[name, typecode, array.array(typecode).itemsize, len(data[name])]
+                       for name, typecode in _CACHED_ARRAYS],
+            'strs_bytes': len(data['strs'].encode('utf8')),
+        }
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_file_path(), 'rb') as f:
+                header = json.loads(f.readline().decode('utf8'))
+                if (header.get('version') != _CACHE_VERSION or header.get('size') != self._size
+                        or header.get('byteorder') != sys.byteorder):
+                    return None
+                data = {}
+                for (name, typecode), (header_name, header_typecode, itemsize, length) in zip(_CACHED_ARRAYS,
+                                                                                             header['arrays']):
+                    data[name] = array.array(typecode)
+                    if (header_name, header_typecode, itemsize) != (name, typecode, data[name].itemsize):
+                        return None
+                    data[name].fromfile(f, length)
+                strs_bytes = f.read(header['strs_bytes'])
+                if len(strs_bytes) != header['strs_bytes'] or f.read(1):
+                    return None
+                data['strs'] = strs_bytes.decode('utf8')
+        except (OSError, EOFError, ValueError, KeyError, TypeError):
+            return None
+
+        if len(data.get('answers', ())) != self._size:
+            return None
+        return data
+
+    def _write_cache(self, data):
+        path = self.cache_file_path()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # (written to a temp file first so that a partly written cache is never read)
+            temp_path = '{}.{}.tmp'.format(path, os.getpid())
+            with open(temp_path, 'wb') as f:
+                f.write(json.dumps(self._cache_header(data)).encode('utf8') + b'\n')
+                for name, _ in _CACHED_ARRAYS:
+                    data[name].tofile(f)
+                f.write(data['strs'].encode('utf8'))
+            os.replace(temp_path, path)
+        except OSError:
+            # (caching is only an optimization)
+            pass
+
+    def _ensure_built(self):
+        if self._answers is not None:
+            return
+
+        data = None
+        if self.cache_dir is not None:
+            data = self._read_cache()
+        if data is None:
+            data = self._enumerate()
+            if self.cache_dir is not None:
+                self._write_cache(data)
+
+        self._terms = data['terms']
+        self._strs = data['strs']
+        self._str_offsets = data['str_offsets']
+        self._ids_by_answer = data['ids_by_answer']
+        self._sorted_answers = data['sorted_answers']
+        self._answers = data['answers']
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Lookups
+    def terms(self, question_id):
+        self._ensure_built()
+        start = question_id * self.terms_count
+        return list(self._terms[start:start + self.terms_count])
+
+    def answer(self, question_id):
+        self._ensure_built()
+        return self._answers[question_id]
+
+    def question_str(self, question_id):
+        self._ensure_built()
+        return self._strs[self._str_offsets[question_id]:self._str_offsets[question_id + 1]]
+
+    def question(self, question_id):
+        """
+        :param question_id: (int)
+        :return: (arithmetics.Question)
+        """
+        outcomes = self.outcomes(question_id)
+        return arithmetics.Question(difficulty_lvl=self.difficulty_lvl,
+                                    op_type=self.op_type,
+                                    terms=self.terms(question_id),
+                                    negatives=[neg for _, neg in outcomes])
+
+    def ids_with_answer(self, answer):
+        """
+        Ids of all questions having given answer.
+
+        :param answer: (int)
+        :return: (array)
+        """
+        self._ensure_built()
+        start = bisect.bisect_left(self._sorted_answers, answer)
+        end = bisect.bisect_right(self._sorted_answers, answer)
+        return self._ids_by_answer[start:end]
+
+    def questions_with_answer(self, answer):
+        return [self.question(i) for i in self.ids_with_answer(answer)]
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Sampling
+    def sample_id(self, rng=None):
+        rng = rng or random
+        return int(rng.random() * self._size)
+
+    def sample(self, rng=None):
+        """
+        Random question; equivalent to `arithmetics.new_question()`.
+
+        :return: (arithmetics.Question)
+        """
+        return self.question(self.sample_id(rng=rng))
+
+    def sample_ids_without_replacement(self, k, rng=None):
+        """
+        Partial Fisher-Yates shuffle of the ids, tracking only the swapped ones.
+        Uses only `rng.randint()`, so that `arithmetics.CounterRandom` can be used as well.
+
+        :param k: (int) Number of distinct ids; can't exceed the size of the space.
+        :return: (list)
+        """
+        if not 0 <= k <= self._size:
+            raise ValueError('Sample of {} ids, out of {}'.format(k, self._size))
+        rng = rng or random
+        swapped = {}
+        ids = []
+        for i in range(k):
+            j = rng.randint(i, self._size - 1)
+            ids.append(swapped.get(j, j))
+            swapped[j] = swapped.get(i, i)
+        return ids
+
+    def sample_without_replacement(self, k, rng=None):
+        return [self.question(i) for i in self.sample_ids_without_replacement(k=k, rng=rng)]
+
+
+_INDEXES = {}
+
+
+def get_index(difficulty_lvl, op_type, cache_dir=None):
+    """
+    Returns the (per process) shared index of given difficulty and operation type.
+
+    :param cache_dir: (str) Directory of the cached file, owned by the app or user. If None, kept only in memory.
+
+    :return: (QuestionSpaceIndex)
+    """
+    key = (difficulty_lvl, op_type, cache_dir)
+    if key not in _INDEXES:
+        _INDEXES[key] = QuestionSpaceIndex(difficulty_lvl=difficulty_lvl, op_type=op_type, cache_dir=cache_dir)
+    return _INDEXES[key]
@@ -0,0 +1,226 @@
+"""
+Startup profiler (Kivy-free), timing the phases of a cold start and the import of each module.
+
+Enabled only if the environment variable `MTM_STARTUP_PROFILE` is set,
+to the path of the timeline's json file, or to '1' for `DEFAULT_TIMELINE_FILE`.
+It has to be imported before the modules to profile (it's the first import of `main`).
+When disabled, `profiler` is None and the functions below do nothing.
+
+The timeline holds times in milliseconds since this module was imported:
+- phases: named intervals, e.g. 'load_kv' (they may overlap, e.g. images loading in the background),
+- marks: named instants, e.g. 'first_frame',
+- imports: each module's import time, cumulative (including the modules it imports) and self (excluding them).
+"""
+
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+
+ENV_VAR = 'MTM_STARTUP_PROFILE'
+DEFAULT_TIMELINE_FILE = 'startup_profile.json'
+
+
+class _ImportTimer(object):
+    """
+    Meta path finder that times the execution of modules found by the other finders.
+    """
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        loader = spec.loader
+        # (builtin and frozen modules have class loaders, and import fast)
+        if loader is None or isinstance(loader, type) or getattr(loader, '_timed_by_startup_profile', False):
+            return spec
+        try:
+            loader.exec_module = self._timed_exec_module(loader.exec_module)
+            loader._timed_by_startup_profile = True
+        except AttributeError:
+            pass
+        return spec
+
+    def _timed_exec_module(self, exec_module):
+        # (a loader may load several modules, e.g. a zip importer)
+        def timed_exec_module(module):
+            stack = self._stack()
+            # Name, start time, time spent importing other modules.
+            entry = [module.__name__, time.perf_counter(), 0.]
+            stack.append(entry)
+            try:
+                exec_module(module)
+            finally:
+                stack.pop()
+                cumulative = time.perf_counter() - entry[1]
+                if stack:
+                    stack[-1][2] += cumulative
+                self.profiler.add_import(name=entry[0], start=entry[1], cumulative=cumulative,
+                                         self_time=cumulative - entry[2])
+        return timed_exec_module
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+
+class StartupProfiler(object):
+
+    def __init__(self, timeline_path=DEFAULT_TIMELINE_FILE, clock=time.perf_counter):
+        self.timeline_path = timeline_path
+        self.clock = clock
+        self.start_time = clock()
+        self.start_wall_time = time.time()
+        self.phases = []
+        self.marks = []
+        self.imports = []
+        self.finished = False
+        self._open_phases = {}
+        self._import_timer = None
+
+    def _ms(self, t):
+        return 1000 * (t - self.start_time)
+
+    def time_imports(self):
+        """
+        Times the imports of modules not imported yet.
+        """
+        if self._import_timer is None:
+            self._import_timer = _ImportTimer(profiler=self)
+            sys.meta_path.insert(0, self._import_timer)
+
+    def stop_timing_imports(self):
+        if self._import_timer is not None:
+            sys.meta_path.remove(self._import_timer)
+            self._import_timer = None
+
+    def add_import(self, name, start, cumulative, self_time):
+        """
+        :param start: (float) Clock time.
+        :param cumulative: (float) Seconds.
+        :param self_time: (float) Seconds.
+        """
+        if not self.finished:
+            self.imports.append({'module': name, 'start_ms': self._ms(start),
+                                 'cumulative_ms': 1000 * cumulative, 'self_ms': 1000 * self_time})
+
+    def start_phase(self, name):
+        self._open_phases[name] = self.clock()
+
+    def end_phase(self, name):
+        start = self._open_phases.pop(name, None)
+        if start is None or self.finished:
+            return
+        end = self.clock()
+        self.phases.append({'name': name, 'start_ms': self._ms(start), 'end_ms': self._ms(end),
+                            'duration_ms': 1000 * (end - start)})
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        self.start_phase(name)
+        try:
+            yield
+        finally:
+            self.end_phase(name)
+
+    def mark(self, name):
+        if not self.finished:
+            self.marks.append({'name': name, 'time_ms': self._ms(self.clock())})
+
+    def timeline(self, **info):
+        """
+        :param info: Added to the timeline, e.g. the app's version.
+        :return: (dict)
+        """
+        timeline = dict(info)
+        timeline.update({
+            'start_time': self.start_wall_time,
+            'phases': sorted(self.phases, key=lambda p: p['start_ms']),
+            'marks': list(self.marks),
+            'imports': sorted(self.imports, key=lambda i: i['self_ms'], reverse=True),
+            'imports_total_ms': sum(i['self_ms'] for i in self.imports),
+        })
+        return timeline
+
+    def finish(self, **info):
+        """
+        Stops profiling, and writes the timeline.
+
+        :param info: Added to the timeline.
+        :return: (dict) Timeline.
+        """
+        self.stop_timing_imports()
+        timeline = self.timeline(**info)
+        self.finished = True
+        with open(self.timeline_path, 'w') as f:
+            json.dump(timeline, f, indent=1, sort_keys=True)
+        return timeline
+
+
+def _profiler_from_env():
+    value = os.environ.get(ENV_VAR)
+    if not value:
+        return None
+    profiler = StartupProfiler(timeline_path=DEFAULT_TIMELINE_FILE if value == '1' else value)
+    profiler.time_imports()
+    return profiler
+
+
+profiler = _profiler_from_env()
+
+_NO_PHASE = contextlib.nullcontext()
+
+
+def start_phase(name):
+    if profiler is not None:
+        profiler.start_phase(name)
+
+
+def end_phase(name):
+    if profiler is not None:
+        profiler.end_phase(name)
+
+
+def phase(name):
+    """
+    :return: Context manager timing its block as a phase.
+    """
+    return _NO_PHASE if profiler is None else profiler.phase(name)
+
+
+def mark(name):
+    if profiler is not None:
+        profiler.mark(name)
+
+
+def phased(name):
+    """
+    Decorator timing each call of a function as a phase (functions are returned unchanged if disabled).
+    """
+    def decorator(func):
+        if profiler is None:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiler.phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
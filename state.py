@@ -0,0 +1,96 @@
+"""
+Container of the app's state (the user's progress), with change notifications per key path.
+
+Contents are a dict of sections' dicts, as in storage (see `core.DEFAULT_STORAGE_CONTENTS`).
+"""
+
+
+import types
+
+
+class State(object):
+    """
+    Snapshots are read-only mappings that never change. A change creates a new section and a new root,
+    sharing all other (unchanged) sections with the previous snapshot,
+    so taking a snapshot costs nothing and changes cost only a shallow copy.
+
+    Callbacks are bound to a path: () for any change, (section,) for a section, (section, key) for a value.
+    They are called as `callback(path, new_value)` after the change, and only if values actually changed;
+    more specific paths are notified first.
+    """
+
+    def __init__(self, data):
+        """
+        :param data: (dict) Sections' dicts (copied).
+        """
+        self._root = types.MappingProxyType({
+            section: types.MappingProxyType(dict(values)) for section, values in data.items()})
+        self._callbacks = {}
+
+    def snapshot(self):
+        """
+        :return: (MappingProxyType) Current contents.
+        """
+        return self._root
+
+    def get(self, path):
+        value = self._root
+        for k in path:
+            value = value[k]
+        return value
+
+    def bind(self, path, callback):
+        self._callbacks.setdefault(tuple(path), []).append(callback)
+
+    def unbind(self, path, callback):
+        self._callbacks[tuple(path)].remove(callback)
+
+    def _notify(self, path, value):
+        # (copied, since callbacks might (un)bind)
+        for callback in list(self._callbacks.get(path, ())):
+            callback(path, value)
+
+    def _changed_values(self, section, values):
+        old_values = self._root.get(section, {})
+        return {k: v for k, v in values.items() if k not in old_values or old_values[k] != v}
+
+    def update_sections(self, sections_values):
+        """
+        Changes several sections at once (a single new snapshot).
+
+        :param sections_values: (dict) Section to its changed (or all) values.
+        """
+        changes = {}
+        for section, values in sections_values.items():
+            changed = self._changed_values(section=section, values=values)
+            if changed:
+                changes[section] = changed
+        if not changes:
+            return
+
+        root = dict(self._root)
+        for section, changed in changes.items():
+            section_values = dict(root.get(section, {}))
+            section_values.update(changed)
+            root[section] = types.MappingProxyType(section_values)
+        self._root = types.MappingProxyType(root)
+
+        for section, changed in changes.items():
+            for k, v in changed.items():
+                self._notify((section, k), v)
+            self._notify((section,), self._root[section])
+        self._notify((), self._root)
+
+    def update(self, section, values):
+        """
+        :param section: (str)
+        :param values: (dict) Changed (or all) values of the section.
+        """
+        self.update_sections({section: values})
+
+    def set(self, path, value):
+        """
+        :param path: (tuple) Section, key.
+        """
+        section, k = path
+        self.update_sections({section: {k: value}})
@@ -0,0 +1,589 @@
+"""
+Storage of the user's progress.
+
+Contents are a dict of dicts (sections), e.g. {"answers": {"correct": 1, ..}, "addition": {"1": 5, ..}, ..}.
+
+All stores implement the `ProgressStore` interface; `open_store()` creates one by backend name.
+
+Stores implemented:
+    - `CoalescingStore`: wraps a kivy `JsonStore`.
+        Every assignment to a `JsonStore` key rewrites the whole file,
+        so a single correct answer would result in several full rewrites.
+        Instead, changes are kept in memory, their keys are marked as dirty,
+        and they are written at most once per time window, from a background thread.
+    - `EventLogStore`: appends each change as an event to a log file,
+        which is periodically compacted into a snapshot.
+    - `SQLiteStore`: a profile of an `SQLiteDatabase`, which can hold many (e.g. thousands of students') profiles.
+
+Pending changes should be flushed explicitly when the app is paused or stopped.
+"""
+
+
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+# Seconds during which changes are gathered before being written.
+DEFAULT_WRITE_DELAY = 2.
+
+STORE_BACKENDS = ('json', 'event_log', 'sqlite')
+
+
+class ProgressStore(object):
+    """
+    Interface of the stores.
+
+    Contents are kept in memory (`self._data`, guarded by `self._lock`), so reads never touch the disk.
+    Subclasses implement how changes are persisted.
+    """
+
+    _data = None
+    _lock = None
+    # Writes made to disk (e.g. appended events or executed statements); used for benchmarking.
+    writes_count = 0
+
+    # Abstract
+    def __setitem__(self, key, values):
+        """
+        Replaces the values of a section.
+
+        :param key: (str) Section name.
+        :param values: (dict)
+        """
+        raise NotImplementedError
+
+    # Abstract
+    def record_answer(self, result, op_type=None, difficulty_lvl=None):
+        """
+        Increases the counters of an answer.
+
+        :param result: (str) 'correct', 'wrong' or 'skipped'.
+        :param op_type: (str) Required for correct answers.
+        :param difficulty_lvl: (str) Required for correct answers.
+        """
+        raise NotImplementedError
+
+    # Abstract
+    def flush(self):
+        """
+        Writes pending changes immediately (if any).
+        """
+        raise NotImplementedError
+
+    def close(self):
+        self.flush()
+
+    def __getitem__(self, key):
+        with self._lock:
+            return self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def keys(self):
+        return list(self._data)
+
+    def data_copy(self):
+        """
+        :return: (dict) Deep copy of all (including not yet written) contents.
+        """
+        with self._lock:
+            return copy.deepcopy(self._data)
+
+
+class CoalescedWriter(object):
+    """
+    Calls `write_func` once for any number of `mark_dirty()` calls made within `delay` seconds.
+
+    The delayed call is made from a timer (background) thread; `flush()` makes it immediately
+    from the calling thread.
+    """
+
+    def __init__(self, write_func, delay=DEFAULT_WRITE_DELAY):
+        self.write_func = write_func
+        self.delay = delay
+        self.dirty = False
+        # (total calls of `write_func`)
+        self.writes_count = 0
+        self._timer = None
+        self._lock = threading.RLock()
+
+    def mark_dirty(self):
+        with self._lock:
+            self.dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _write_if_dirty(self):
+        if not self.dirty:
+            return
+        self.dirty = False
+        self.writes_count += 1
+        self.write_func()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+            self._write_if_dirty()
+
+    def flush(self):
+        """
+        Writes pending changes immediately (if any).
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._write_if_dirty()
+
+
+class CoalescingStore(ProgressStore):
+    """
+    Write-behind wrapper of a kivy store (e.g. `JsonStore`).
+
+    Reads are served from memory. Assigned keys are marked as dirty and written together,
+    using the store's `store_put()` for each key and a single `store_sync()` (that is, a single file write).
+    """
+
+    def __init__(self, store, delay=DEFAULT_WRITE_DELAY):
+        """
+        :param store: Kivy store.
+        :param delay: (float) Seconds during which changes are gathered before being written.
+        """
+        self.store = store
+        self._data = {k: copy.deepcopy(store.get(k)) for k in store.keys()}
+        self._dirty_keys = set()
+        self._lock = threading.RLock()
+        self.writer = CoalescedWriter(write_func=self._write, delay=delay)
+
+    def __setitem__(self, key, values):
+        with self._lock:
+            self._set(key, values)
+        # (outside of the lock, since the writer's timer takes the writer's lock and then this one)
+        self.writer.mark_dirty()
+
+    def _set(self, key, values):
+        self._data[key] = dict(values)
+        self._dirty_keys.add(key)
+
+    @property
+    def writes_count(self):
+        return self.writer.writes_count
+
+    def _write(self):
+        with self._lock:
+            for key in self._dirty_keys:
+                self.store.store_put(key, self._data[key])
+            self._dirty_keys.clear()
+            self.store.store_sync()
+
+    def record_answer(self, result, op_type=None, difficulty_lvl=None):
+        with self._lock:
+            for key, values in answer_changes(data=self._data, result=result, op_type=op_type,
+                                              difficulty_lvl=difficulty_lvl).items():
+                self._set(key, values)
+        self.writer.mark_dirty()
+
+    def flush(self):
+        self.writer.flush()
+
+
+def fsync_directory(path):
+    """
+    Forces the entries of a directory (e.g. a renamed file) to disk.
+    """
+    # (directories can't be opened on windows)
+    if os.name == 'nt':
+        return
+    fd = os.open(path or '.', os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def read_json_contents(path, default):
+    """
+    Contents of a json storage file (e.g. written by kivy's `JsonStore`).
+
+    :param default: (dict) Returned (copied) if file doesn't exist or is invalid.
+    :return: (dict)
+    """
+    try:
+        with open(path) as f:
+            contents = json.load(f)
+    except (OSError, ValueError):
+        contents = None
+    return contents or copy.deepcopy(default)
+
+
+def answer_changes(data, result, op_type=None, difficulty_lvl=None):
+    """
+    New values of the sections affected by an answer.
+
+    :param data: (dict) Current contents (counters missing from it, e.g. of a new difficulty, start at 0).
+    :return: (dict) Section name to (copied) section values.
+    """
+    answers = dict(data.get('answers', {}))
+    answers[result] = answers.get(result, 0) + 1
+    changes = {'answers': answers}
+
+    if result == 'correct':
+        op_counters = dict(data.get(op_type, {}))
+        op_counters[difficulty_lvl] = op_counters.get(difficulty_lvl, 0) + 1
+        changes[op_type] = op_counters
+
+    return changes
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class EventLogStore(ProgressStore):
+    """
+    Append-only log of changes, with periodic compaction into a snapshot.
+
+    Each line of the log is a json event having a sequence number, e.g.:
+        {"event": "answer", "result": "correct", "op_type": "addition", "difficulty_lvl": "1", "seq": 8, "time": ..}
+        {"event": "answer", "result": "wrong", "seq": 9, "time": ..}
+        {"event": "set", "key": "visiting", "values": {..}, "seq": 10, "time": ..}
+
+    Contents are materialized in memory from the snapshot and the events that follow it.
+    Appending is O(1); a partly written last line (e.g. due to a crash) is ignored.
+    Since the snapshot notes the last sequence number it includes,
+    a crash during compaction can't result in events being applied twice.
+    """
+
+    LOG_FILE_NAME = 'events.jsonl'
+    SNAPSHOT_FILE_NAME = 'snapshot.json'
+
+    def __init__(self, directory, initial_data, compact_every=500, fsync=False):
+        """
+        :param directory: (str)
+        :param initial_data: (dict) Contents used if no snapshot exists (e.g. defaults or older storage).
+        :param compact_every: (int) Events after which the log is compacted.
+        :param fsync: (bool) Forces each event to disk (slower, but survives power loss).
+        """
+        self.directory = directory
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.log_path = os.path.join(directory, self.LOG_FILE_NAME)
+        self.snapshot_path = os.path.join(directory, self.SNAPSHOT_FILE_NAME)
+        self._lock = threading.RLock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._data, self._seq = self._read_snapshot(initial_data=initial_data)
+        self._log_events_count = self._replay_log()
+        self._log_file = open(self.log_path, 'a')
+
+        if self._log_events_count >= self.compact_every:
+            self.compact()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Loading
+    def _read_snapshot(self, initial_data):
+        try:
+            with open(self.snapshot_path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return copy.deepcopy(initial_data), 0
+        return snapshot['data'], snapshot['seq']
+
+    def _replay_log(self):
+        """
+        Applies the events of the log that aren't included in the snapshot.
+
+        :return: (int) Events in the log.
+        """
+        events_count = 0
+        valid_size = 0
+        try:
+            with open(self.log_path, 'rb') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line.decode('utf-8'))
+                    except ValueError:
+                        # Partly written (last) event.
+                        break
+                    if not line.endswith(b'\n'):
+                        break
+                    valid_size += len(line)
+                    events_count += 1
+                    if event['seq'] > self._seq:
+                        self._apply(event)
+                        self._seq = event['seq']
+        except OSError:
+            return 0
+
+        # (removes partly written event, so that following events are appended on a new line)
+        if valid_size != os.path.getsize(self.log_path):
+            with open(self.log_path, 'rb+') as f:
+                f.truncate(valid_size)
+
+        return events_count
+
+    def _apply(self, event):
+        if event['event'] == 'answer':
+            self._data.update(answer_changes(data=self._data, result=event['result'],
+                                             op_type=event.get('op_type'),
+                                             difficulty_lvl=event.get('difficulty_lvl')))
+        elif event['event'] == 'set':
+            self._data[event['key']] = event['values']
+        else:
+            raise ValueError('Unknown event {}'.format(event['event']))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Writing
+    def _append(self, event):
+        with self._lock:
+            self._seq += 1
+            event['seq'] = self._seq
+            event['time'] = time.time()
+            self._apply(event)
+            self._log_file.write(json.dumps(event, sort_keys=True) + '\n')
+            self._log_file.flush()
+            if self.fsync:
+                os.fsync(self._log_file.fileno())
+            self.writes_count += 1
+
+            self._log_events_count += 1
+            if self._log_events_count >= self.compact_every:
+                self.compact()
+
+    def record_answer(self, result, op_type=None, difficulty_lvl=None):
+        event = {'event': 'answer', 'result': result}
+        if result == 'correct':
+            event.update(op_type=op_type, difficulty_lvl=difficulty_lvl)
+        self._append(event)
+
+    def __setitem__(self, key, values):
+        values = dict(values)
+        with self._lock:
+            # (only actual changes are logged)
+            if self._data.get(key) == values:
+                return
+            self._append({'event': 'set', 'key': key, 'values': values})
+
+    def compact(self):
+        """
+        Writes the current contents as a snapshot and empties the log.
+        """
+        with self._lock:
+            temp_path = self.snapshot_path + '.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump({'seq': self._seq, 'data': self._data}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.snapshot_path)
+            # (the rename must be on disk before the log is emptied)
+            fsync_directory(os.path.dirname(self.snapshot_path))
+
+            self._log_file.close()
+            self._log_file = open(self.log_path, 'w')
+            self._log_events_count = 0
+
+    def flush(self):
+        """
+        Forces logged events to disk.
+        """
+        with self._lock:
+            self._log_file.flush()
+            os.fsync(self._log_file.fileno())
+
+    def close(self):
+        with self._lock:
+            self._log_file.close()
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class SQLiteDatabase(object):
+    """
+    Database of many profiles' progress (e.g. a classroom's students), in a single file.
+
+    Each value is a row of the `counters` table, keyed (and therefore indexed) by (profile, section, name),
+    so a single counter is updated without rewriting the rest of the profile, or other profiles.
+
+    The database is in WAL mode (readers aren't blocked by the writer),
+    and changes are committed in batches of `batch_size` statements, or on `commit()`.
+    """
+
+    FILE_NAME = 'progress.sqlite3'
+
+    def __init__(self, path, batch_size=100):
+        """
+        :param path: (str) Database file, or ':memory:'.
+        :param batch_size: (int) Statements after which changes are committed.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._pending_count = 0
+        self._lock = threading.RLock()
+        self.closed = False
+
+        # (transactions are handled explicitly)
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        # (in WAL mode, committed changes survive an app crash, though not necessarily a power loss)
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        # (`value` has no type, so both counters and e.g. dates keep their types)
+        self.connection.execute('CREATE TABLE IF NOT EXISTS counters ('
+                                'profile TEXT NOT NULL, '
+                                'section TEXT NOT NULL, '
+                                'name TEXT NOT NULL, '
+                                'value, '
+                                'PRIMARY KEY (profile, section, name)) WITHOUT ROWID')
+
+    def execute(self, sql, params_seq):
+        """
+        Executes a statement for each parameters' tuple, within the current batch (transaction).
+
+        :param sql: (str)
+        :param params_seq: (list) Tuples of parameters.
+        """
+        with self._lock:
+            if not self.connection.in_transaction:
+                self.connection.execute('BEGIN')
+            self.connection.executemany(sql, params_seq)
+            self._pending_count += len(params_seq)
+            if self._pending_count >= self.batch_size:
+                self.commit()
+
+    def commit(self):
+        with self._lock:
+            if self.connection.in_transaction:
+                self.connection.execute('COMMIT')
+            self._pending_count = 0
+
+    def close(self):
+        with self._lock:
+            if self.closed:
+                return
+            self.commit()
+            self.connection.close()
+            self.closed = True
+
+    def profiles(self):
+        """
+        :return: (list) Names of all profiles.
+        """
+        with self._lock:
+            return [row[0] for row in self.connection.execute('SELECT DISTINCT profile FROM counters')]
+
+    def read_profile(self, profile):
+        """
+        :return: (dict) Contents of a profile (empty if it doesn't exist).
+        """
+        data = {}
+        with self._lock:
+            rows = self.connection.execute('SELECT section, name, value FROM counters WHERE profile = ?',
+                                           (profile,))
+            for section, name, value in rows:
+                data.setdefault(section, {})[name] = value
+        return data
+
+    def profile_store(self, profile, initial_data):
+        """
+        :return: (SQLiteStore)
+        """
+        return SQLiteStore(database=self, profile=profile, initial_data=initial_data)
+
+
+class SQLiteStore(ProgressStore):
+    """
+    A profile of an `SQLiteDatabase`.
+
+    Only changed values are written; answers increase their counters in place.
+    """
+
+    _SET_SQL = 'INSERT OR REPLACE INTO counters (profile, section, name, value) VALUES (?, ?, ?, ?)'
+    # (counters missing from the table, e.g. of a new difficulty, are created)
+    _INCREASE_SQL = ('INSERT INTO counters (profile, section, name, value) VALUES (?, ?, ?, 1) '
+                     'ON CONFLICT (profile, section, name) DO UPDATE SET value = value + 1')
+
+    def __init__(self, database, profile, initial_data, owns_database=False):
+        """
+        :param database: (SQLiteDatabase)
+        :param profile: (str)
+        :param initial_data: (dict) Contents used if the profile doesn't exist (e.g. defaults or older storage).
+        :param owns_database: (bool) Closes the database when closed (otherwise it's shared with other profiles).
+        """
+        self.database = database
+        self.profile = profile
+        self.owns_database = owns_database
+        self._lock = threading.RLock()
+
+        self._data = database.read_profile(profile)
+        if not self._data:
+            for key, values in initial_data.items():
+                self[key] = values
+
+    def __setitem__(self, key, values):
+        with self._lock:
+            old_values = self._data.get(key, {})
+            values = dict(values)
+            self._data[key] = values
+            changed = [(self.profile, key, name, value) for name, value in values.items()
+                       if name not in old_values or old_values[name] != value]
+            if changed:
+                self.database.execute(self._SET_SQL, changed)
+                self.writes_count += len(changed)
+
+    def record_answer(self, result, op_type=None, difficulty_lvl=None):
+        with self._lock:
+            increased = [(self.profile, 'answers', result)]
+            if result == 'correct':
+                increased.append((self.profile, op_type, difficulty_lvl))
+            self._data.update(answer_changes(data=self._data, result=result, op_type=op_type,
+                                             difficulty_lvl=difficulty_lvl))
+            self.database.execute(self._INCREASE_SQL, increased)
+            self.writes_count += len(increased)
+
+    def flush(self):
+        self.database.commit()
+
+    def close(self):
+        if self.owns_database:
+            self.database.close()
+        else:
+            self.flush()
+
+
+def open_store(backend, directory, initial_data, **kwargs):
+    """
+    Creates a store of the user's progress.
+
+    :param backend: (str) One of `STORE_BACKENDS`.
+    :param directory: (str) Directory of the store's file(s).
+    :param initial_data: (dict) Contents used if the store doesn't exist yet.
+    :param kwargs: Passed to the store (or, for 'sqlite', the database; `profile` selects the profile).
+    :return: (ProgressStore)
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    if backend == 'json':
+        from kivy.storage.jsonstore import JsonStore
+
+        kivy_store = JsonStore(os.path.join(directory, 'storage.json'))
+        if not kivy_store.keys():
+            for key, values in initial_data.items():
+                kivy_store.store_put(key, copy.deepcopy(values))
+            kivy_store.store_sync()
+        return CoalescingStore(store=kivy_store, **kwargs)
+
+    elif backend == 'event_log':
+        return EventLogStore(directory=directory, initial_data=initial_data, **kwargs)
+
+    elif backend == 'sqlite':
+        profile = kwargs.pop('profile', 'default')
+        database = SQLiteDatabase(path=os.path.join(directory, SQLiteDatabase.FILE_NAME), **kwargs)
+        return SQLiteStore(database=database, profile=profile, initial_data=initial_data, owns_database=True)
+
+    else:
+        raise ValueError('Unknown storage backend {}'.format(backend))
@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+
+class TestParseAnswer(TestCase):
+
+    def setUp(self):
+        from arithmetics import parse_answer
+        self.parse_answer = parse_answer
+
+        self.answer_str_to_expected = {
+            '7': (7, 0),
+            '+7': (7, 0),
+            '-7': (-7, 0),
+            '-0': (0, 0),
+            '-2.30': (-230, 2),
+            '+2.3': (23, 1),
+            '3,5': (35, 1),
+            '4.': (4, 0),
+            '0.05': (5, 2),
+            '1000': (1000, 0),
+        }
+        self.invalid_answers = ('', '+', '-', '.', '-.', '2.3.4', '2,3.4', '+-2', '2-', '1e5', ' 2', 'abc')
+
+    def test_valid(self):
+        for answer_str, expected in self.answer_str_to_expected.items():
+            self.assertEqual(self.parse_answer(answer_str), expected, msg=answer_str)
+
+    def test_invalid(self):
+        for answer_str in self.invalid_answers:
+            self.assertIsNone(self.parse_answer(answer_str), msg=answer_str)
+
+
+class TestIsCorrect(TestCase):
+
+    def setUp(self):
+        from arithmetics import Question, parse_answer
+        self.parse_answer = parse_answer
+        # (-2.3)(+1.0) = -2.30
+        self.q = Question(difficulty_lvl='3', op_type='multiplication', terms=[-23, 10], negatives=[True, False])
+
+    def test_correct(self):
+        for answer_str in ('-2.3', '-2.30', '-2.300', '-2,3'):
+            self.assertTrue(self.q.is_correct(self.parse_answer(answer_str)), msg=answer_str)
+
+    def test_wrong(self):
+        for answer_str in ('2.3', '-2.31', '-2', '-23', '-0.23'):
+            self.assertFalse(self.q.is_correct(self.parse_answer(answer_str)), msg=answer_str)
+
+    def test_all_answers_correct(self):
+        from arithmetics import new_question, DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP, QuestionAndAnswer
+
+        for d in DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP:
+            for op_type in QuestionAndAnswer.OPERATIONS_TYPES:
+                for _ in range(200):
+                    q = new_question(difficulty_lvl=d, op_type=op_type)
+                    self.assertTrue(q.is_correct(self.parse_answer(q.answer_as_string(explicit_plus=True))))
@@ -0,0 +1,58 @@
+from unittest import TestCase
+
+
+class TestGenerateBatch(TestCase):
+
+    def setUp(self):
+
+        import random
+        import arithmetics
+
+        self.arithmetics = arithmetics
+        self.DIFF_DCT = arithmetics.DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP
+        self.rng = random.Random(1)
+
+    def test_length(self):
+        for d in self.DIFF_DCT:
+            for op_type in self.arithmetics.QuestionAndAnswer.OPERATIONS_TYPES:
+                batch = self.arithmetics.generate_batch(n=100, difficulty_lvl=d, op_type=op_type, rng=self.rng)
+                self.assertEqual(len(batch), 100)
+                self.assertEqual(len(list(batch.question_strs())), 100)
+
+    def test_answers_match_terms(self):
+        for d in self.DIFF_DCT:
+            batch = self.arithmetics.generate_batch(n=1000, difficulty_lvl=d, op_type='addition', rng=self.rng)
+            for i in range(len(batch)):
+                self.assertEqual(batch.answers[i], sum(batch.terms(i)))
+
+            batch = self.arithmetics.generate_batch(n=1000, difficulty_lvl=d, op_type='multiplication', rng=self.rng)
+            for i in range(len(batch)):
+                product = 1
+                for t in batch.terms(i):
+                    product *= t
+                self.assertEqual(batch.answers[i], product)
+
+    def test_terms_within_limits(self):
+        for d in self.DIFF_DCT:
+            batch = self.arithmetics.generate_batch(n=1000, difficulty_lvl=d, op_type='addition', rng=self.rng)
+            max_val = self.arithmetics.Terms.MAX_ABS_VALUE * 10 ** batch.decimals
+            for column in batch.terms_columns:
+                self.assertTrue(all(-max_val <= t <= max_val for t in column))
+
+    def test_sings_count_in_multiplication(self):
+        for d in self.DIFF_DCT:
+            batch = self.arithmetics.generate_batch(n=1000, difficulty_lvl=d, op_type='multiplication', rng=self.rng)
+            for question in batch.question_strs():
+                signs_in_q = question.count('+') + question.count('-')
+                self.assertEqual(signs_in_q, self.DIFF_DCT[d]['terms_count'])
+
+    def test_answer_str_matches_question_and_answer(self):
+        from decimal import Decimal
+        batch = self.arithmetics.generate_batch(n=200, difficulty_lvl='3', op_type='multiplication', rng=self.rng)
+        for index in range(len(batch)):
+            terms = [Decimal(t).scaleb(-batch.decimals) for t in batch.terms(index)]
+            self.assertEqual(Decimal(batch.answer_str(index)), terms[0] * terms[1])
+
+    def test_question_str_is_stable(self):
+        batch = self.arithmetics.generate_batch(n=200, difficulty_lvl='1', op_type='addition', rng=self.rng)
+        self.assertEqual(list(batch.question_strs()), list(batch.question_strs()))
@@ -0,0 +1,57 @@
+from unittest import TestCase
+
+
+class TestCounterRandom(TestCase):
+
+    def setUp(self):
+        import arithmetics
+        self.arithmetics = arithmetics
+        self.CounterRandom = arithmetics.CounterRandom
+
+    def test_splitmix_reference_values(self):
+        # Reference SplitMix64 outputs for state 1234567.
+        self.assertEqual(self.arithmetics._mix_64((1234567 + self.arithmetics._SPLITMIX_GAMMA)), 6457827717110365317)
+
+    def test_same_key_same_stream(self):
+        rng_1 = self.CounterRandom(seed=5, counter=3)
+        rng_2 = self.CounterRandom(seed=5, counter=3)
+        self.assertEqual([rng_1.next_64() for _ in range(10)], [rng_2.next_64() for _ in range(10)])
+
+    def test_different_keys_different_streams(self):
+        firsts = {self.CounterRandom(seed=s, counter=c).next_64() for s in range(20) for c in range(20)}
+        self.assertEqual(len(firsts), 400)
+
+    def test_random_range(self):
+        rng = self.CounterRandom(seed=1)
+        for _ in range(1000):
+            self.assertTrue(0 <= rng.random() < 1)
+
+    def test_randint_range(self):
+        rng = self.CounterRandom(seed=1)
+        found = {rng.randint(0, 10) for _ in range(1000)}
+        self.assertEqual(found, set(range(11)))
+
+
+class TestQuestionAt(TestCase):
+
+    def setUp(self):
+        import arithmetics
+        self.question_at = arithmetics.question_at
+
+    def test_known_questions(self):
+        # Guards against changes that would alter already handed-out worksheets.
+        expected = {
+            ('1', 0): '+10 +2',
+            ('2', 1): '+9 +8 -7',
+            ('3', 1000000): '-2.0 +3.3',
+        }
+        for (d, k), q_str in expected.items():
+            self.assertEqual(self.question_at(seed=42, question_number=k, difficulty_lvl=d, op_type='addition').question_str,
+                             q_str)
+
+    def test_independent_of_order(self):
+        forward = [self.question_at(seed=7, question_number=k, difficulty_lvl='3', op_type='multiplication')
+                   for k in range(100)]
+        backward = [self.question_at(seed=7, question_number=k, difficulty_lvl='3', op_type='multiplication')
+                    for k in reversed(range(100))]
+        self.assertEqual(forward, backward[::-1])
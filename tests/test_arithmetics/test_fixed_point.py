@@ -0,0 +1,69 @@
+from unittest import TestCase
+
+
+class TestFixedPointAsString(TestCase):
+
+    def setUp(self):
+        from arithmetics import fixed_point_as_string
+        self.fixed_point_as_string = fixed_point_as_string
+
+        self.scaled_and_decimals_to_expected_str = {
+            (7, 0): '7',
+            (-7, 0): '-7',
+            (0, 0): '0',
+            (0, 1): '0.0',
+            (-23, 1): '-2.3',
+            (100, 1): '10.0',
+            (5, 2): '0.05',
+            (-5, 2): '-0.05',
+            (-230, 2): '-2.30',
+        }
+
+    def test_fixed_point_as_string(self):
+        for (scaled_num, decimals), expected in self.scaled_and_decimals_to_expected_str.items():
+            self.assertEqual(self.fixed_point_as_string(scaled_num=scaled_num, decimals=decimals), expected)
+
+
+class TestScaledTerm(TestCase):
+
+    def setUp(self):
+        import arithmetics
+        self.Term = arithmetics.Terms
+        self.QuestionAndAnswer = arithmetics.QuestionAndAnswer
+
+    def test_matches_rounded_float_term(self):
+        import random
+        from decimal import Decimal
+        from unittest import mock
+
+        for given_random in (0., .00499, .005, .2255, .99949, .9995, .99999):
+            with mock.patch('random.random', return_value=given_random):
+                scaled_term = self.Term._scaled_term(decimals=1)
+                rounded_float = self.QuestionAndAnswer.round_single_term_1_decimals(
+                    given_float=random.random() * self.Term.MAX_ABS_VALUE)
+            self.assertEqual(Decimal(scaled_term).scaleb(-1), rounded_float)
+
+    def test_scaled_terms_within_limits(self):
+        inst = self.Term(difficulty_lvl='3')
+        max_scaled_val = self.Term.MAX_ABS_VALUE * 10 ** inst.decimals
+        for _ in range(1000):
+            for t in inst.all_scaled_terms():
+                self.assertIsInstance(t, int)
+                self.assertTrue(-max_scaled_val <= t <= max_scaled_val)
+
+
+class TestExpectedAnswer(TestCase):
+
+    def test_decimal_answers_are_exact(self):
+        from decimal import Decimal
+        from arithmetics import QuestionAndAnswer
+
+        for op_type in QuestionAndAnswer.OPERATIONS_TYPES:
+            for _ in range(1000):
+                inst = QuestionAndAnswer(difficulty_lvl='3', op_type=op_type)
+                terms = [Decimal(t.strip('()')) for t in inst.operation_str().split()]
+                if op_type == 'addition':
+                    expected = sum(terms)
+                else:
+                    expected = terms[0] * terms[1]
+                self.assertEqual(inst.expected_answer(), expected)
@@ -0,0 +1,57 @@
+from unittest import TestCase
+
+
+class TestIterQuestions(TestCase):
+
+    def test_settings(self):
+        import itertools
+        from arithmetics import iter_questions
+
+        for q in itertools.islice(iter_questions(difficulty_lvl='3', op_type='multiplication'), 100):
+            self.assertEqual(q.difficulty_lvl, '3')
+            self.assertEqual(q.op_type, 'multiplication')
+
+
+class TestQuestionPrefetcher(TestCase):
+
+    def setUp(self):
+        from arithmetics import QuestionPrefetcher
+
+        self.prefetcher = QuestionPrefetcher(difficulty_lvl='1', op_type='addition', size=3)
+        self.addCleanup(self.prefetcher.close)
+
+    def _wait_until_full(self):
+        import time
+
+        for _ in range(1000):
+            if len(self.prefetcher._buffer) >= self.prefetcher.size:
+                return
+            time.sleep(.001)
+        self.fail('Buffer was not filled.')
+
+    def test_buffer_filled_and_bounded(self):
+        import time
+
+        self._wait_until_full()
+        time.sleep(.01)
+        self.assertEqual(len(self.prefetcher._buffer), self.prefetcher.size)
+
+    def test_next_question(self):
+        for _ in range(20):
+            q = self.prefetcher.next_question()
+            self.assertEqual((q.difficulty_lvl, q.op_type), ('1', 'addition'))
+
+    def test_settings_change_invalidates_buffer(self):
+        self._wait_until_full()
+        self.prefetcher.set_settings(difficulty_lvl='3', op_type='multiplication')
+        for _ in range(20):
+            q = self.prefetcher.next_question()
+            self.assertEqual((q.difficulty_lvl, q.op_type), ('3', 'multiplication'))
+
+    def test_close_stops_thread(self):
+        self._wait_until_full()
+        self.prefetcher.close(timeout=1)
+        self.assertTrue(self.prefetcher.closed)
+        self.assertFalse(self.prefetcher._thread.is_alive())
+        # (created when requested)
+        self.assertEqual(self.prefetcher.next_question().difficulty_lvl, '1')
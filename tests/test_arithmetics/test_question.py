@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+
+class TestQuestion(TestCase):
+
+    def setUp(self):
+        import arithmetics
+        self.arithmetics = arithmetics
+        self.Question = arithmetics.Question
+        self.DIFF_DCT = arithmetics.DIFFICULTY_TO_TERMS_COUNT_AND_TYPE_MAP
+
+    def test_immutable(self):
+        q = self.arithmetics.new_question(difficulty_lvl='1', op_type='addition')
+        with self.assertRaises(AttributeError):
+            q.answer = 5
+        with self.assertRaises(AttributeError):
+            del q.question_str
+        with self.assertRaises(AttributeError):
+            q.new_attr = 5
+
+    def test_no_instance_dict(self):
+        q = self.arithmetics.new_question(difficulty_lvl='3', op_type='multiplication')
+        self.assertFalse(hasattr(q, '__dict__'))
+
+    def test_zero_sign_is_stable(self):
+        q = self.Question(difficulty_lvl='1', op_type='addition', terms=[0, 0], negatives=[True, False])
+        self.assertEqual(q.question_str, '-0 +0')
+        self.assertEqual(q.question_str, q.question_str)
+
+    def test_decimal_question(self):
+        q = self.Question(difficulty_lvl='3', op_type='multiplication', terms=[-23, 10], negatives=[True, False])
+        self.assertEqual(q.question_str, '(-2.3) (+1.0)')
+        self.assertEqual(q.answer, -230)
+        self.assertEqual(q.answer_decimals, 2)
+        self.assertEqual(q.answer_as_string(), '-2.30')
+
+    def test_answer_as_string_trim_zeros(self):
+        q = self.Question(difficulty_lvl='3', op_type='multiplication', terms=[20, 20], negatives=[False, False])
+        self.assertEqual(q.answer_as_string(explicit_plus=True, trim_zeros=True), '+4.0')
+        q = self.Question(difficulty_lvl='3', op_type='multiplication', terms=[-23, 10], negatives=[True, False])
+        self.assertEqual(q.answer_as_string(trim_zeros=True), '-2.3')
+        q = self.Question(difficulty_lvl='3', op_type='multiplication', terms=[-23, 11], negatives=[True, False])
+        self.assertEqual(q.answer_as_string(trim_zeros=True), '-2.53')
+
+    def test_answer_as_string_explicit_plus(self):
+        q = self.Question(difficulty_lvl='1', op_type='addition', terms=[2, 3], negatives=[False, False])
+        self.assertEqual(q.answer_as_string(explicit_plus=True), '+5')
+
+    def test_sings_count_in_multiplication(self):
+        for d in self.DIFF_DCT:
+            for _ in range(1000):
+                question = self.arithmetics.new_question(difficulty_lvl=d, op_type='multiplication').question_str
+                signs_in_q = question.count('+') + question.count('-')
+
+                self.assertEqual(signs_in_q, self.DIFF_DCT[d]['terms_count'])
+
+    def test_batch_questions_match_columns(self):
+        import random
+        batch = self.arithmetics.generate_batch(n=300, difficulty_lvl='2', op_type='multiplication',
+                                                rng=random.Random(0))
+        for index, q in enumerate(batch.questions()):
+            self.assertEqual(q.question_str, batch.question_str(index))
+            self.assertEqual(q.answer, batch.answers[index])
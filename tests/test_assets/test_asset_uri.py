@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+
+class TestAssetUri(TestCase):
+
+    def setUp(self):
+        import tempfile
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.generated_dir = self.temp_dir.name
+
+    def _write_atlas(self, ids):
+        import json
+        import os
+        import assets
+
+        with open(os.path.join(self.generated_dir, assets.ATLAS_NAME + '.atlas'), 'w') as f:
+            json.dump({'ui-0.png': {image_id: [0, 0, 10, 10] for image_id in ids}}, f)
+
+    def test_nothing_generated(self):
+        from assets import asset_uri
+
+        self.assertEqual(asset_uri('own_images/arrow.png', generated_dir=self.generated_dir),
+                         'own_images/arrow.png')
+
+    def test_atlas_image(self):
+        from assets import asset_uri
+
+        self._write_atlas(ids=['arrow', 'tick_yes'])
+        self.assertEqual(asset_uri('own_images/arrow.png', generated_dir=self.generated_dir),
+                         'atlas://{}/ui/arrow'.format(self.generated_dir))
+
+    def test_downscaled_image(self):
+        import os
+        from assets import asset_uri
+
+        self._write_atlas(ids=['arrow'])
+        os.makedirs(os.path.join(self.generated_dir, 'third_parties_images'))
+        with open(os.path.join(self.generated_dir, 'third_parties_images', 'navagio_adapt.png'), 'wb'):
+            pass
+
+        self.assertEqual(asset_uri('third_parties_images/navagio_adapt.png', generated_dir=self.generated_dir),
+                         '{}/third_parties_images/navagio_adapt.png'.format(self.generated_dir))
+        self.assertEqual(asset_uri('third_parties_images/tick_no.png', generated_dir=self.generated_dir),
+                         'third_parties_images/tick_no.png')
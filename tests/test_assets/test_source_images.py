@@ -0,0 +1,69 @@
+from unittest import TestCase
+
+
+class TestSourceImages(TestCase):
+    """
+    The directories of the source images are left out of the apk,
+    so every image the app uses has to be generated by the build step.
+    """
+
+    def setUp(self):
+        import os
+
+        repo_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(repo_dir)
+
+    def test_used_images_generated(self):
+        import re
+        import citations
+        import core
+        from IGNORE_BUILD_assets import source_images
+
+        with open('minustimesminus.kv') as f:
+            kv_contents = f.read()
+        used_images = set(re.findall(r"asset_uri\('([^']+)'\)", kv_contents))
+        used_images.update(coin['im_path'] for coin in core.DIFF_TO_COIN_MAP.values())
+        used_images.update('/'.join([core.THIRD_PARTIES_IMAGES_DIR, file_name])
+                           for file_name in citations.FIRST_IMAGE_TO_CITATION_MAP)
+
+        self.assertTrue(used_images)
+        self.assertLessEqual(used_images, set(source_images()))
+
+    def test_kv_images_through_asset_uri(self):
+        import re
+
+        with open('minustimesminus.kv') as f:
+            kv_contents = f.read()
+        image_paths = re.findall(r"'[^']+\.(?:png|jpg)'", kv_contents)
+        uri_paths = re.findall(r"asset_uri\(('[^']+')\)", kv_contents)
+        self.assertEqual(sorted(image_paths), sorted(uri_paths))
+
+    def test_all_images_cited(self):
+        from IGNORE_BUILD_ensure_images_cited import ensure_images_cited
+
+        ensure_images_cited()
+
+    def test_build_fails_if_not_generated(self):
+        import json
+        import os
+        import tempfile
+        import assets
+        from IGNORE_BUILD_assets import check_generated, source_images
+        import IGNORE_BUILD_p4a_hook
+
+        with tempfile.TemporaryDirectory() as generated_dir:
+            with self.assertRaises(ValueError):
+                check_generated(generated_dir=generated_dir)
+
+        # (in another directory, since resolved uris are cached)
+        with tempfile.TemporaryDirectory() as generated_dir:
+            with open(os.path.join(generated_dir, assets.ATLAS_NAME + '.atlas'), 'w') as f:
+                json.dump({'ui-0.png': {assets.atlas_id(path): [0, 0, 1, 1] for path in source_images()}}, f)
+            self.assertEqual(len(check_generated(generated_dir=generated_dir)), len(source_images()))
+
+        # (nothing generated in the repository)
+        if not os.path.isdir(assets.GENERATED_ASSETS_DIR):
+            os.chdir(tempfile.gettempdir())
+            with self.assertRaises(ValueError):
+                IGNORE_BUILD_p4a_hook.before_apk_build(toolchain=None)
@@ -0,0 +1,27 @@
+import importlib.util
+from unittest import TestCase, skipIf
+
+
+@skipIf(importlib.util.find_spec('kivy') is None, 'kivy is not installed')
+class TestLoadSimulation(TestCase):
+
+    def test_few_answers(self):
+        import json
+        import os
+        import subprocess
+        import sys
+        import tempfile
+
+        repo_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            out_path = os.path.join(temp_dir, 'results.json')
+            # (in another process, since the harness configures kivy before importing it)
+            subprocess.check_call([sys.executable, '-m', 'benchmarks.load_simulation', '--answers', '6',
+                                   '--mix', '1', '1', '1', '--backend', 'event_log', '--out', out_path],
+                                  cwd=repo_dir, stdout=subprocess.DEVNULL)
+            with open(out_path) as f:
+                results = json.load(f)
+
+        self.assertEqual(results['answers'], 6)
+        self.assertGreater(results['storage_writes_per_answer'], 0)
+        self.assertIn('key', results['latencies'])
@@ -0,0 +1,106 @@
+from unittest import TestCase
+
+
+class TestImport(TestCase):
+
+    def _run_in_new_interpreter(self, code):
+        import os
+        import subprocess
+        import sys
+
+        repo_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        return subprocess.check_output([sys.executable, '-c', code], cwd=repo_dir, universal_newlines=True)
+
+    def test_no_kivy_imported(self):
+        output = self._run_in_new_interpreter(
+            'import sys, core, about_module; print(sorted(m for m in sys.modules if m.split(".")[0] == "kivy"))')
+        self.assertEqual(output.strip(), '[]')
+
+    def test_import_time(self):
+        # (best of a few runs, since a new interpreter's timing varies)
+        durations = [float(self._run_in_new_interpreter(
+            'import time; t = time.perf_counter(); import core; print(time.perf_counter() - t)'))
+            for _ in range(3)]
+        self.assertLess(min(durations), .1)
+
+
+class TestTotalCoins(TestCase):
+
+    def test_total_coins(self):
+        import copy
+        import core
+
+        store = copy.deepcopy(core.DEFAULT_STORAGE_CONTENTS)
+        self.assertEqual(core.total_coins(store), 0)
+        store['addition']['1'] = 3
+        store['multiplication']['3'] = 2
+        store['answers']['correct'] = 5
+        self.assertEqual(core.total_coins(store), 5)
+
+
+class TestAchievementEngine(TestCase):
+
+    def setUp(self):
+        import datetime
+
+        self.today = datetime.date(2022, 3, 7)
+
+    def _engine(self, days_ago, consecutive_days, achievements=None, **achievs):
+        import datetime
+        from core import AchievementEngine, ACHIEVEMENTS
+
+        last_day = (self.today - datetime.timedelta(days=days_ago)).isoformat() if days_ago is not None else 0
+        visiting = {'achiev_5_days': 0, 'achiev_10_days': 0, 'achiev_30_days': 0,
+                    'last_day': last_day, 'consecutive_days': consecutive_days}
+        visiting.update(achievs)
+        return AchievementEngine(visiting_dct=visiting, achievements=achievements or ACHIEVEMENTS,
+                                 today_func=lambda: self.today)
+
+    def test_next_day_increases_consecutive_days(self):
+        engine = self._engine(days_ago=1, consecutive_days=2)
+        self.assertEqual(engine.answer_correct(op_type='addition', difficulty_lvl='1'),
+                         {'consecutive_days': 3, 'last_day': '2022-03-07'})
+
+    def test_same_day_no_changes(self):
+        engine = self._engine(days_ago=1, consecutive_days=2)
+        engine.answer_correct(op_type='addition', difficulty_lvl='1')
+        self.assertEqual(engine.answer_correct(op_type='addition', difficulty_lvl='1'), {})
+        self.assertEqual(engine.visiting['consecutive_days'], 3)
+
+    def test_achievement(self):
+        engine = self._engine(days_ago=1, consecutive_days=4)
+        changes = engine.answer_correct(op_type='addition', difficulty_lvl='1')
+        self.assertEqual(changes['achiev_5_days'], 1)
+        self.assertNotIn('achiev_10_days', changes)
+
+    def test_achieved_not_evaluated_again(self):
+        engine = self._engine(days_ago=1, consecutive_days=4, achiev_5_days=1)
+        self.assertNotIn('achiev_5_days', engine.answer_correct(op_type='addition', difficulty_lvl='1'))
+
+    def test_missed_day_restarts(self):
+        engine = self._engine(days_ago=3, consecutive_days=4)
+        self.assertEqual(engine.answer_correct(op_type='addition', difficulty_lvl='1')['consecutive_days'], 1)
+
+    def test_start(self):
+        self.assertEqual(self._engine(days_ago=3, consecutive_days=4).start(), {'consecutive_days': 0})
+        self.assertEqual(self._engine(days_ago=1, consecutive_days=4).start(), {})
+        # (last day is 0 after the progress is reset)
+        self.assertEqual(self._engine(days_ago=None, consecutive_days=4).start(), {'consecutive_days': 0})
+
+    def test_rules_evaluated_only_on_their_event_types(self):
+        from core import Achievement
+
+        evaluated = []
+
+        class DifficultyAnswered(Achievement):
+            EVENT_TYPES = ('answer_correct',)
+
+            def is_achieved(self, engine, event):
+                evaluated.append(event)
+                return event['difficulty_lvl'] == '3'
+
+        engine = self._engine(days_ago=0, consecutive_days=1, achievements=[DifficultyAnswered('achiev_diff_3')])
+        self.assertEqual(engine.answer_correct(op_type='addition', difficulty_lvl='1'), {})
+        self.assertEqual(engine.answer_correct(op_type='addition', difficulty_lvl='3'), {'achiev_diff_3': 1})
+        engine.answer_correct(op_type='addition', difficulty_lvl='3')
+        self.assertEqual(len(evaluated), 2)
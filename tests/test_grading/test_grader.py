@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+
+class TestGrader(TestCase):
+
+    def setUp(self):
+        import arithmetics
+        import grading
+
+        self.arithmetics = arithmetics
+        self.grading = grading
+        self.grader = grading.Grader(difficulty_lvl='3', op_type='multiplication')
+        self.seed = 9
+
+    def _question(self, question_number):
+        return self.arithmetics.question_at(seed=self.seed, question_number=question_number,
+                                            difficulty_lvl='3', op_type='multiplication')
+
+    def test_grade(self):
+        submissions = [
+            ((self.seed, 0), self._question(0).answer_as_string()),
+            ((self.seed, 1), self._question(1).answer_as_string(explicit_plus=True)),
+            ((self.seed, 2), ''),
+            ((self.seed, 3), 'not a number'),
+            ((self.seed, 4), str(self._question(4).answer + 1)),
+        ]
+        result = self.grader.grade(submissions)
+        self.assertEqual(result.correctness, [True, True, None, False, False])
+        self.assertEqual(result.counts, {'correct': 2, 'wrong': 2, 'skipped': 1})
+
+    def test_less_decimals_accepted(self):
+        for question_number in range(200):
+            # (e.g. '-2.30' -> '-2.3', '4.00' -> '4')
+            answer_str = self._question(question_number).answer_as_string().rstrip('0').rstrip('.')
+            result = self.grader.grade([((self.seed, question_number), answer_str)])
+            self.assertEqual(result.correctness, [True])
+
+    def test_counts_keys_match_storage(self):
+        from core import DEFAULT_STORAGE_CONTENTS
+
+        self.assertEqual(set(DEFAULT_STORAGE_CONTENTS['answers']), set(self.grading.ANSWER_COUNTS_KEYS))
+
+    def test_grade_stream(self):
+        submissions = (((self.seed, k % 10), '0') for k in range(25))
+        results = list(self.grader.grade_stream(submissions, chunk_size=10))
+        self.assertEqual([len(r) for r in results], [10, 10, 5])
+        self.assertEqual(sum(self.grading.sum_counts(results).values()), 25)
+
+    def test_bank_grader_across_blocks(self):
+        from question_bank import BANK_BLOCK_SIZE, bank_block
+
+        grader = self.grading.bank_grader(difficulty_lvl='3', op_type='multiplication')
+        submissions = []
+        for block_number in (0, 2):
+            batch = bank_block(stream_seed=7, block_number=block_number, difficulty_lvl='3', op_type='multiplication')
+            submissions.extend(((7, block_number * BANK_BLOCK_SIZE + i), batch.answer_str(i)) for i in (0, 5))
+        self.assertEqual(grader.grade(submissions).correctness, [True] * 4)
+
+    def test_question_space_grader(self):
+        from question_space import QuestionSpaceIndex
+
+        grader = self.grading.question_space_grader(difficulty_lvl='1', op_type='addition')
+        index = QuestionSpaceIndex(difficulty_lvl='1', op_type='addition')
+        submissions = [(i, str(index.answer(i))) for i in range(len(index))]
+        self.assertEqual(grader.grade(submissions).counts['correct'], len(index))
@@ -0,0 +1,93 @@
+from unittest import TestCase
+
+
+class TestLRUCache(TestCase):
+
+    def test_least_recently_used_evicted(self):
+        from image_cache import LRUCache
+
+        cache = LRUCache(max_weight=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertIsNone(cache.get('b'))
+
+    def test_weight(self):
+        from image_cache import LRUCache
+
+        cache = LRUCache(max_weight=10, weight_func=len)
+        cache.put('a', 'x' * 6)
+        cache.put('b', 'x' * 3)
+        self.assertEqual(cache.weight, 9)
+        cache.put('c', 'x' * 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.weight, 6)
+
+    def test_replaced_value(self):
+        from image_cache import LRUCache
+
+        cache = LRUCache(max_weight=10, weight_func=len)
+        cache.put('a', 'x' * 6)
+        cache.put('a', 'x' * 2)
+        self.assertEqual(cache.weight, 2)
+        self.assertEqual(len(cache), 1)
+
+    def test_value_heavier_than_max_kept(self):
+        from image_cache import LRUCache
+
+        cache = LRUCache(max_weight=1, weight_func=len)
+        cache.put('a', 'xx')
+        self.assertEqual(cache.get('a'), 'xx')
+
+
+class TestSubsample(TestCase):
+
+    @staticmethod
+    def _pixels(width, height, bytes_per_pixel, row_length=0):
+        # (each pixel's bytes are its x, y coordinates)
+        rows = []
+        for y in range(height):
+            row = b''.join(bytes([x, y] + [255] * (bytes_per_pixel - 2)) for x in range(width))
+            rows.append(row + b'\x00' * (row_length - width) * bytes_per_pixel if row_length else row)
+        return b''.join(rows)
+
+    def test_size_bucket(self):
+        from image_cache import size_bucket
+
+        self.assertEqual(size_bucket((1, 64.4)), (64, 64))
+        self.assertEqual(size_bucket((65, 200)), (128, 256))
+
+    def test_rgba(self):
+        from image_cache import subsample
+
+        pixels, size, fmt = subsample(pixels=self._pixels(9, 6, 4), image_size=(9, 6), fmt='rgba',
+                                      display_size=(3, 2))
+        self.assertEqual((size, fmt), ((3, 2), 'rgba'))
+        self.assertEqual(pixels, b''.join(bytes([x, y, 255, 255]) for y in (0, 3) for x in (0, 3, 6)))
+
+    def test_rgb_gets_alpha(self):
+        from image_cache import subsample
+
+        pixels, size, fmt = subsample(pixels=self._pixels(4, 4, 3), image_size=(4, 4), fmt='rgb',
+                                      display_size=(2, 2))
+        self.assertEqual((size, fmt), ((2, 2), 'rgba'))
+        self.assertEqual(pixels, b''.join(bytes([x, y, 255, 255]) for y in (0, 2) for x in (0, 2)))
+
+    def test_padded_rows(self):
+        from image_cache import subsample
+
+        pixels, size, fmt = subsample(pixels=self._pixels(4, 4, 4, row_length=5), image_size=(4, 4),
+                                      fmt='rgba', display_size=(4, 4), row_length=5)
+        self.assertEqual(size, (4, 4))
+        self.assertEqual(pixels, self._pixels(4, 4, 4))
+
+    def test_displayed_larger_than_image_unchanged(self):
+        from image_cache import subsample
+
+        pixels = self._pixels(4, 4, 4)
+        self.assertEqual(subsample(pixels=pixels, image_size=(4, 4), fmt='rgba', display_size=(40, 40)),
+                         (pixels, (4, 4), 'rgba'))
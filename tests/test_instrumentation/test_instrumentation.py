@@ -0,0 +1,122 @@
+from unittest import TestCase
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self):
+        return self.now
+
+
+class TestHistogram(TestCase):
+
+    def test_counts_and_percentiles(self):
+        from instrumentation import Histogram
+
+        histogram = Histogram(bounds_ms=(1, 10, 100))
+        for seconds in [.0005] * 90 + [.005] * 9 + [.5]:
+            histogram.add(seconds)
+
+        self.assertEqual(histogram.counts, [90, 9, 0, 1])
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.percentile(50), 1)
+        self.assertEqual(histogram.percentile(99), 10)
+        # (last bucket has no upper bound)
+        self.assertEqual(histogram.percentile(100), 500)
+        self.assertEqual(histogram.max_ms, 500)
+
+    def test_fixed_size(self):
+        from instrumentation import Histogram, BUCKET_BOUNDS_MS
+
+        histogram = Histogram()
+        for i in range(1000):
+            histogram.add(i / 100.)
+        self.assertEqual(len(histogram.counts), len(BUCKET_BOUNDS_MS) + 1)
+        self.assertEqual(sum(histogram.counts), 1000)
+
+    def test_empty(self):
+        from instrumentation import Histogram
+
+        self.assertEqual(Histogram().percentile(50), 0)
+        self.assertEqual(Histogram().as_dict()['mean_ms'], 0)
+
+
+class TestRecorder(TestCase):
+
+    def setUp(self):
+        from instrumentation import Recorder
+
+        self.clock = FakeClock()
+        self.recorder = Recorder(clock=self.clock)
+
+    def test_tap_to_feedback(self):
+        self.recorder.tap('check')
+        self.clock.now += .01
+        self.recorder.tap('check')
+        self.clock.now += .02
+        self.recorder.on_frame_displayed()
+        self.recorder.on_frame_displayed()
+
+        histogram = self.recorder.histograms['tap_to_feedback:check']
+        self.assertEqual(histogram.count, 1)
+        self.assertAlmostEqual(histogram.max_ms, 30)
+
+    def test_spans(self):
+        self.recorder.start_span('coin_animation', key=1)
+        self.clock.now += .3
+        self.recorder.end_span('coin_animation', key=1)
+        # (not started)
+        self.recorder.end_span('coin_animation', key=2)
+
+        self.assertEqual(self.recorder.histograms['coin_animation'].count, 1)
+        self.assertAlmostEqual(self.recorder.histograms['coin_animation'].max_ms, 300)
+
+    def test_dump(self):
+        import json
+        import os
+        import tempfile
+
+        self.recorder.on_frame(1 / 60.)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'instrumentation.json')
+            self.recorder.dump(path)
+            with open(path) as f:
+                snapshot = json.load(f)
+            self.assertEqual(os.listdir(temp_dir), ['instrumentation.json'])
+
+        self.assertEqual(snapshot['histograms']['frame']['count'], 1)
+
+
+class TestDecorators(TestCase):
+
+    def test_disabled_functions_unchanged(self):
+        import instrumentation
+
+        def func():
+            pass
+
+        self.assertIsNone(instrumentation.recorder)
+        self.assertIs(instrumentation.timed('x')(func), func)
+        self.assertIs(instrumentation.interaction('x')(func), func)
+
+    def test_enabled(self):
+        from unittest import mock
+        import instrumentation
+
+        clock = FakeClock()
+        recorder = instrumentation.Recorder(clock=clock)
+
+        def func(x):
+            clock.now += .002
+            return x
+
+        with mock.patch.object(instrumentation, 'recorder', recorder):
+            wrapped = instrumentation.interaction('check')(func)
+        self.assertEqual(wrapped(1), 1)
+        clock.now += .01
+        recorder.on_frame_displayed()
+
+        self.assertAlmostEqual(recorder.histograms['handler:check'].max_ms, 2)
+        self.assertAlmostEqual(recorder.histograms['tap_to_feedback:check'].max_ms, 12)
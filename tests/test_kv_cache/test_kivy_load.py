@@ -0,0 +1,96 @@
+import importlib.util
+from unittest import TestCase, skipIf
+
+
+KV_CONTENTS = '''
+#:set kv_cache_test_coins 3
+
+<KvCacheTestWidget@Widget>:
+    coins_text: '{} coins'.format(kv_cache_test_coins + 1)
+
+<KvCacheTestBox@BoxLayout+KvCacheTestWidget>:
+    orientation: 'vertical' if self.coins_text else 'horizontal'
+
+[KvCacheTestTemplate@Widget]:
+    opacity: ctx.opacity * 2
+'''
+
+
+@skipIf(importlib.util.find_spec('kivy') is None, 'kivy is not installed')
+class TestKivyLoad(TestCase):
+    """
+    Rules loaded from the cache are the same as those of a fresh `Builder.load_file()`.
+    """
+
+    def setUp(self):
+        import os
+        import tempfile
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache_dir = os.path.join(self.temp_dir.name, 'kv_cache')
+        self.kv_path = os.path.join(self.temp_dir.name, 'kv_cache_test.kv')
+        with open(self.kv_path, 'w') as f:
+            f.write(KV_CONTENTS)
+
+    @staticmethod
+    def _registered(filename):
+        """
+        :return: (dict) What's registered from a kv file: its rules, dynamic classes and templates.
+        """
+        from kivy.factory import Factory
+        from kivy.lang import Builder
+
+        rules = [(selector.key, rule.name, sorted((name, prop.value) for name, prop in rule.properties.items()))
+                 for selector, rule in Builder.rules if rule.ctx.filename == filename]
+        dynamic_classes = {name: item['baseclasses'] for name, item in Factory.classes.items()
+                           if item.get('filename') == filename}
+        templates = sorted(name for name, (_, _, template_filename) in Builder.templates.items()
+                           if template_filename == filename)
+        return dict(rules=rules, dynamic_classes=dynamic_classes, templates=templates)
+
+    def _load_fresh_and_cached(self, filename):
+        """
+        :return: (tuple) What's registered by `Builder.load_file()`, then by a load from the cache.
+        """
+        from kivy.lang import Builder
+        from kv_cache import load_kv_file, CACHE_SUFFIX
+        import os
+
+        Builder.load_file(filename)
+        fresh = self._registered(filename)
+        Builder.unload_file(filename)
+
+        # (the first load writes the cache)
+        load_kv_file(filename=filename, cache_dir=self.cache_dir)
+        Builder.unload_file(filename)
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, os.path.basename(filename) + CACHE_SUFFIX)))
+
+        load_kv_file(filename=filename, cache_dir=self.cache_dir)
+        self.addCleanup(Builder.unload_file, filename)
+        return fresh, self._registered(filename)
+
+    def test_same_as_load_file(self):
+        fresh, cached = self._load_fresh_and_cached(self.kv_path)
+        self.assertEqual(len(fresh['rules']), 2)
+        self.assertEqual(fresh['dynamic_classes'], {'KvCacheTestWidget': 'Widget',
+                                                    'KvCacheTestBox': 'BoxLayout+KvCacheTestWidget'})
+        self.assertEqual(fresh['templates'], ['KvCacheTestTemplate'])
+        self.assertEqual(cached, fresh)
+
+    def test_cached_rules_applied(self):
+        from kivy.factory import Factory
+        from kivy.lang import Builder
+
+        self._load_fresh_and_cached(self.kv_path)
+        box = Factory.KvCacheTestBox()
+        self.assertEqual(box.coins_text, '4 coins')
+        self.assertEqual(box.orientation, 'vertical')
+        self.assertEqual(Builder.template('KvCacheTestTemplate', opacity=.25).opacity, .5)
+
+    def test_app_kv_file_same_as_load_file(self):
+        import main
+
+        fresh, cached = self._load_fresh_and_cached(main.KV_FILE)
+        self.assertTrue(fresh['rules'])
+        self.assertEqual(cached, fresh)
@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+
+class Rule(object):
+    __slots__ = ('name', 'co_value')
+
+    def __init__(self, name, co_value):
+        self.name = name
+        self.co_value = co_value
+
+
+class TestCache(TestCase):
+
+    def setUp(self):
+        import os
+        import tempfile
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = os.path.join(self.temp_dir.name, 'kv_cache', 'minustimesminus.kv.cache')
+
+    def test_code_objects_cached(self):
+        from kv_cache import write_cache, read_cache
+
+        rules = [Rule(name='text', co_value=compile("'{} coins'.format(coins)", 'minustimesminus.kv', 'eval'))]
+        write_cache(path=self.path, key='a', obj=rules)
+
+        cached_rules = read_cache(path=self.path, key='a')
+        self.assertEqual(cached_rules[0].name, 'text')
+        self.assertEqual(eval(cached_rules[0].co_value, {'coins': 3}), '3 coins')
+
+    def test_other_key_not_read(self):
+        from kv_cache import write_cache, read_cache
+
+        write_cache(path=self.path, key='a', obj=[1])
+        self.assertIsNone(read_cache(path=self.path, key='b'))
+
+    def test_missing_or_corrupt_cache_not_read(self):
+        from kv_cache import write_cache, read_cache
+
+        self.assertIsNone(read_cache(path=self.path, key='a'))
+        write_cache(path=self.path, key='a', obj=list(range(100)))
+        with open(self.path, 'r+b') as f:
+            f.truncate(20)
+        self.assertIsNone(read_cache(path=self.path, key='a'))
+
+    def test_key_depends_on_contents_and_args(self):
+        from kv_cache import cache_key
+
+        key = cache_key(b'<Label>:', 'a.kv', '2.3.0')
+        self.assertEqual(key, cache_key(b'<Label>:', 'a.kv', '2.3.0'))
+        self.assertNotEqual(key, cache_key(b'<Label>: ', 'a.kv', '2.3.0'))
+        self.assertNotEqual(key, cache_key(b'<Label>:', 'b.kv', '2.3.0'))
+        self.assertNotEqual(key, cache_key(b'<Label>:', 'a.kv', '2.3.1'))
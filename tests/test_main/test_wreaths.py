@@ -0,0 +1,39 @@
+import importlib.util
+from unittest import TestCase, skipIf
+
+
+@skipIf(importlib.util.find_spec('kivy') is None, 'kivy is not installed')
+class TestAllWreaths(TestCase):
+
+    def setUp(self):
+        from kivy.app import App
+        from kivy.lang import Builder
+        import main
+
+        self.main = main
+        self.app = App()
+        self.app.wreaths_registry = main.WreathsRegistry()
+        previous_app = App._running_app
+        App._running_app = self.app
+        self.addCleanup(setattr, App, '_running_app', previous_app)
+        Builder.load_file(main.KV_FILE)
+        self.addCleanup(Builder.unload_file, main.KV_FILE)
+
+    def _mirrored(self, all_wreaths):
+        return [w.goal_complete for w in reversed(all_wreaths.ids.wreaths_images_box.children)]
+
+    def test_mirrors_wreaths_while_in_tree(self):
+        from kivy.uix.boxlayout import BoxLayout
+
+        wreath = self.main.WreathImage()
+        all_wreaths = self.main.AllWreaths()
+        parent = BoxLayout()
+        parent.add_widget(all_wreaths)
+        self.main.WreathImage(goal_complete=True)
+        wreath.goal_complete = True
+        self.assertEqual(self._mirrored(all_wreaths), [True, True])
+
+        parent.remove_widget(all_wreaths)
+        self.assertFalse(self.app.wreaths_registry.get_property_observers('goals_complete'))
+        self.main.WreathImage()
+        self.assertEqual(self._mirrored(all_wreaths), [True, True])
@@ -0,0 +1,102 @@
+from unittest import TestCase
+
+
+class TestGenerateBank(TestCase):
+
+    def setUp(self):
+        import tempfile
+        import question_bank
+
+        self.question_bank = question_bank
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def _read_questions(self, out_dir, manifest):
+        import json
+        import os
+
+        lst = []
+        for shard in manifest['shards']:
+            with open(os.path.join(out_dir, shard['file'])) as f:
+                lst.extend(json.loads(line) for line in f)
+        return lst
+
+    def test_manifest(self):
+        import json
+        import os
+
+        out_dir = os.path.join(self.temp_dir.name, 'bank')
+        manifest = self.question_bank.generate_bank(out_dir=out_dir, count=250, seed=3, difficulty_lvls=['1', '3'],
+                                                    shard_size=100, workers=1)
+        with open(os.path.join(out_dir, self.question_bank.MANIFEST_FILE_NAME)) as f:
+            self.assertEqual(json.load(f)['total_count'], 2 * 2 * 250)
+        self.assertEqual(len(manifest['shards']), 2 * 2 * 3)
+
+    def test_independent_of_shard_size(self):
+        import os
+
+        out_dir_1 = os.path.join(self.temp_dir.name, 'bank_1')
+        out_dir_2 = os.path.join(self.temp_dir.name, 'bank_2')
+        manifest_1 = self.question_bank.generate_bank(out_dir=out_dir_1, count=120, seed=3, difficulty_lvls=['2'],
+                                                      op_types=['addition'], shard_size=7, workers=1)
+        manifest_2 = self.question_bank.generate_bank(out_dir=out_dir_2, count=120, seed=3, difficulty_lvls=['2'],
+                                                      op_types=['addition'], shard_size=120, workers=1)
+        self.assertEqual(self._read_questions(out_dir_1, manifest_1), self._read_questions(out_dir_2, manifest_2))
+
+    def test_questions_reproducible_from_manifest(self):
+        import os
+
+        out_dir = os.path.join(self.temp_dir.name, 'bank')
+        manifest = self.question_bank.generate_bank(out_dir=out_dir, count=50, seed=11, difficulty_lvls=['3'],
+                                                    op_types=['multiplication'], workers=1)
+        stream_seed = manifest['shards'][0]['stream_seed']
+        batch = self.question_bank.bank_block(stream_seed=stream_seed, block_number=0,
+                                              difficulty_lvl='3', op_type='multiplication')
+        for record in self._read_questions(out_dir, manifest):
+            self.assertEqual(batch.question_str(record['id']), record['question'])
+            self.assertEqual(batch.answer_str(record['id']), record['answer'])
+
+    def test_shards_spanning_blocks(self):
+        import json
+        import os
+
+        self.question_bank.BANK_BLOCK_SIZE, block_size = 16, self.question_bank.BANK_BLOCK_SIZE
+        self.addCleanup(setattr, self.question_bank, 'BANK_BLOCK_SIZE', block_size)
+        # (in this process, so that it uses the patched block size)
+        self.question_bank._write_shard(out_dir=self.temp_dir.name, file_name='shard.jsonl', fmt='jsonl',
+                                        stream_seed=5, difficulty_lvl='1', op_type='addition', start=10, count=30)
+        with open(os.path.join(self.temp_dir.name, 'shard.jsonl')) as f:
+            records = [json.loads(line) for line in f]
+
+        self.assertEqual([r['id'] for r in records], list(range(10, 40)))
+        batches = [self.question_bank.bank_block(stream_seed=5, block_number=b, difficulty_lvl='1',
+                                                 op_type='addition')
+                   for b in range(3)]
+        self.assertEqual([r['question'] for r in records],
+                         [batches[n // 16].question_str(n % 16) for n in range(10, 40)])
+
+    def test_invalid_sizes(self):
+        import os
+
+        out_dir = os.path.join(self.temp_dir.name, 'bank')
+        with self.assertRaises(ValueError):
+            self.question_bank.generate_bank(out_dir=out_dir, count=10, seed=1, shard_size=0, workers=1)
+        for args in (['--shard-size', '0'], ['--count', '0'], ['--count', 'x']):
+            with self.assertRaises(SystemExit):
+                self.question_bank.main([out_dir, '--count', '10'] + args)
+
+    def test_bank_graded_end_to_end(self):
+        import os
+        import grading
+
+        out_dir = os.path.join(self.temp_dir.name, 'bank')
+        manifest = self.question_bank.generate_bank(out_dir=out_dir, count=20, seed=4, difficulty_lvls=['3'],
+                                                    op_types=['multiplication'], workers=1)
+        stream_seed = manifest['shards'][0]['stream_seed']
+        records = self._read_questions(out_dir, manifest)
+
+        grader = grading.bank_grader(difficulty_lvl='3', op_type='multiplication')
+        result = grader.grade([((stream_seed, r['id']), r['answer']) for r in records])
+        self.assertEqual(result.counts, {'correct': 20, 'wrong': 0, 'skipped': 0})
+        result = grader.grade([((stream_seed, r['id']), r['answer'] + '1') for r in records])
+        self.assertEqual(result.counts['correct'], 0)
@@ -0,0 +1,91 @@
+from unittest import TestCase
+
+
+class TestQuestionSpaceIndex(TestCase):
+
+    def setUp(self):
+        import random
+        import arithmetics
+        from question_space import QuestionSpaceIndex
+
+        self.arithmetics = arithmetics
+        self.QuestionSpaceIndex = QuestionSpaceIndex
+        self.rng = random.Random(0)
+        self.index = QuestionSpaceIndex(difficulty_lvl='1', op_type='addition')
+
+    def test_size(self):
+        outcomes_per_term = 2 * (self.arithmetics.Terms.MAX_ABS_VALUE + 1)
+        self.assertEqual(len(self.index), outcomes_per_term ** 2)
+        self.assertEqual(len(self.QuestionSpaceIndex(difficulty_lvl='2', op_type='addition')), outcomes_per_term ** 3)
+
+    def test_float_difficulty_not_allowed(self):
+        with self.assertRaises(ValueError):
+            self.QuestionSpaceIndex(difficulty_lvl='3', op_type='addition')
+
+    def test_all_questions_distinct(self):
+        strs = {self.index.question_str(i) for i in range(len(self.index))}
+        self.assertEqual(len(strs), len(self.index))
+
+    def test_lookups_match_question(self):
+        for i in range(len(self.index)):
+            q = self.index.question(i)
+            self.assertEqual(q.question_str, self.index.question_str(i))
+            self.assertEqual(q.answer, self.index.answer(i))
+
+    def test_ids_with_answer(self):
+        ids = self.index.ids_with_answer(-3)
+        self.assertTrue(ids)
+        expected = [i for i in range(len(self.index)) if self.index.answer(i) == -3]
+        self.assertEqual(sorted(ids), expected)
+        self.assertFalse(self.index.ids_with_answer(1000))
+
+    def test_sample_without_replacement(self):
+        questions = self.index.sample_without_replacement(k=len(self.index), rng=self.rng)
+        self.assertEqual(len(set(questions)), len(self.index))
+
+    def test_sample_without_replacement_counter_random(self):
+        ids = self.index.sample_ids_without_replacement(k=100, rng=self.arithmetics.CounterRandom(seed=1))
+        self.assertEqual(len(set(ids)), 100)
+        self.assertTrue(all(0 <= i < len(self.index) for i in ids))
+        self.assertEqual(ids, self.index.sample_ids_without_replacement(k=100,
+                                                                        rng=self.arithmetics.CounterRandom(seed=1)))
+
+    def test_sample_too_large(self):
+        with self.assertRaises(ValueError):
+            self.index.sample_ids_without_replacement(k=len(self.index) + 1, rng=self.rng)
+
+    def test_disk_cache(self):
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            index = self.QuestionSpaceIndex(difficulty_lvl='1', op_type='multiplication', cache_dir=cache_dir)
+            expected = [index.question_str(i) for i in range(len(index))]
+            self.assertTrue(os.path.isfile(index.cache_file_path()))
+
+            cached_index = self.QuestionSpaceIndex(difficulty_lvl='1', op_type='multiplication', cache_dir=cache_dir)
+            self.assertEqual([cached_index.question_str(i) for i in range(len(cached_index))], expected)
+
+    def test_invalid_disk_cache_ignored(self):
+        import pickle
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            index = self.QuestionSpaceIndex(difficulty_lvl='1', op_type='addition', cache_dir=cache_dir)
+            expected = [index.answer(i) for i in range(len(index))]
+            with open(index.cache_file_path(), 'r+b') as f:
+                f.truncate(100)
+            self.assertEqual([self.QuestionSpaceIndex(difficulty_lvl='1', op_type='addition',
+                                                      cache_dir=cache_dir).answer(i) for i in range(len(index))],
+                             expected)
+
+            # (never unpickled)
+            with open(index.cache_file_path(), 'wb') as f:
+                pickle.dump({'answers': [0] * len(index)}, f)
+            self.assertEqual(self.QuestionSpaceIndex(difficulty_lvl='1', op_type='addition',
+                                                     cache_dir=cache_dir).answer(1), expected[1])
+
+    def test_no_disk_cache_by_default(self):
+        from question_space import get_index
+
+        self.assertIsNone(get_index(difficulty_lvl='1', op_type='addition').cache_dir)
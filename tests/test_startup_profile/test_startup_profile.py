@@ -0,0 +1,97 @@
+from unittest import TestCase
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 10.
+
+    def __call__(self):
+        return self.now
+
+
+class TestStartupProfiler(TestCase):
+
+    def setUp(self):
+        from startup_profile import StartupProfiler
+
+        self.clock = FakeClock()
+        self.profiler = StartupProfiler(clock=self.clock)
+
+    def test_phases_and_marks(self):
+        with self.profiler.phase('load_kv'):
+            self.clock.now += .2
+        self.profiler.start_phase('load_image')
+        self.clock.now += .1
+        self.profiler.mark('first_frame')
+        self.profiler.end_phase('load_image')
+        # (not started)
+        self.profiler.end_phase('build')
+
+        timeline = self.profiler.timeline(version='1')
+        self.assertEqual(timeline['version'], '1')
+        self.assertEqual([p['name'] for p in timeline['phases']], ['load_kv', 'load_image'])
+        self.assertAlmostEqual(timeline['phases'][0]['duration_ms'], 200)
+        self.assertAlmostEqual(timeline['phases'][1]['start_ms'], 200)
+        self.assertAlmostEqual(timeline['marks'][0]['time_ms'], 300)
+
+    def test_nothing_recorded_after_finish(self):
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.profiler.timeline_path = os.path.join(temp_dir, 'startup_profile.json')
+            self.profiler.finish()
+            self.assertTrue(os.path.exists(self.profiler.timeline_path))
+
+        self.profiler.mark('late')
+        with self.profiler.phase('late'):
+            pass
+        self.assertEqual(self.profiler.marks, [])
+        self.assertEqual(self.profiler.phases, [])
+
+
+class TestImportTimes(TestCase):
+
+    def test_self_and_cumulative_times(self):
+        import json
+        import os
+        import subprocess
+        import sys
+        import tempfile
+
+        repo_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(os.path.join(temp_dir, 'slow_parent.py'), 'w') as f:
+                f.write('import time\ntime.sleep(.05)\nimport slow_child\n')
+            with open(os.path.join(temp_dir, 'slow_child.py'), 'w') as f:
+                f.write('import time\ntime.sleep(.1)\n')
+            timeline_path = os.path.join(temp_dir, 'startup_profile.json')
+
+            env = dict(os.environ, MTM_STARTUP_PROFILE=timeline_path,
+                       PYTHONPATH=os.pathsep.join([repo_dir, temp_dir]))
+            subprocess.check_call(
+                [sys.executable, '-c', 'import startup_profile, slow_parent; startup_profile.profiler.finish()'],
+                env=env)
+            with open(timeline_path) as f:
+                imports = {i['module']: i for i in json.load(f)['imports']}
+
+        self.assertGreaterEqual(imports['slow_child']['self_ms'], 100)
+        self.assertGreaterEqual(imports['slow_parent']['cumulative_ms'], 150)
+        self.assertLess(imports['slow_parent']['self_ms'], imports['slow_parent']['cumulative_ms'] - 90)
+
+
+class TestDisabled(TestCase):
+
+    def test_no_ops(self):
+        import sys
+        import startup_profile
+
+        def func():
+            pass
+
+        self.assertIsNone(startup_profile.profiler)
+        self.assertIs(startup_profile.phased('x')(func), func)
+        with startup_profile.phase('x'):
+            startup_profile.mark('x')
+        self.assertFalse(any(isinstance(f, startup_profile._ImportTimer) for f in sys.meta_path))
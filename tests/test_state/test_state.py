@@ -0,0 +1,59 @@
+from unittest import TestCase
+
+
+class TestState(TestCase):
+
+    def setUp(self):
+        from state import State
+
+        self.state = State({
+            'addition': {'1': 0, '2': 0},
+            'answers': {'correct': 0, 'wrong': 0},
+        })
+        self.notifications = []
+        self.callback = lambda path, value: self.notifications.append(path)
+
+    def test_snapshots_unchanged_by_later_changes(self):
+        snapshot = self.state.snapshot()
+        self.state.set(('answers', 'correct'), 1)
+        self.assertEqual(snapshot['answers']['correct'], 0)
+        self.assertEqual(self.state.get(('answers', 'correct')), 1)
+
+    def test_snapshots_read_only(self):
+        with self.assertRaises(TypeError):
+            self.state.snapshot()['answers']['correct'] = 1
+        with self.assertRaises(TypeError):
+            self.state.snapshot()['answers'] = {}
+
+    def test_unchanged_sections_shared(self):
+        snapshot = self.state.snapshot()
+        self.state.set(('answers', 'correct'), 1)
+        self.assertIs(self.state.snapshot()['addition'], snapshot['addition'])
+        self.assertIsNot(self.state.snapshot()['answers'], snapshot['answers'])
+
+    def test_notified_paths(self):
+        for path in [(), ('answers',), ('answers', 'correct'), ('answers', 'wrong'), ('addition',)]:
+            self.state.bind(path, self.callback)
+        self.state.set(('answers', 'correct'), 1)
+        self.assertEqual(self.notifications, [('answers', 'correct'), ('answers',), ()])
+
+    def test_unchanged_values_not_notified(self):
+        self.state.bind((), self.callback)
+        snapshot = self.state.snapshot()
+        self.state.update('answers', {'correct': 0, 'wrong': 0})
+        self.assertEqual(self.notifications, [])
+        self.assertIs(self.state.snapshot(), snapshot)
+
+    def test_update_sections_single_snapshot(self):
+        snapshots = []
+        self.state.bind((), lambda path, value: snapshots.append(value))
+        self.state.update_sections({'addition': {'1': 1}, 'answers': {'correct': 1}})
+        self.assertEqual(len(snapshots), 1)
+        self.assertEqual(snapshots[0]['addition'], {'1': 1, '2': 0})
+        self.assertEqual(snapshots[0]['answers'], {'correct': 1, 'wrong': 0})
+
+    def test_unbind(self):
+        self.state.bind((), self.callback)
+        self.state.unbind((), self.callback)
+        self.state.set(('answers', 'correct'), 1)
+        self.assertEqual(self.notifications, [])
@@ -0,0 +1,101 @@
+from unittest import TestCase
+
+
+class FakeKivyStore(object):
+    """
+    Implements the parts of a kivy store used by `CoalescingStore`, counting file writes.
+    """
+
+    def __init__(self, data=None):
+        self._data = data or {}
+        self.written_data = dict(self._data)
+        self.syncs_count = 0
+
+    def keys(self):
+        return list(self._data)
+
+    def get(self, key):
+        return self._data[key]
+
+    def store_put(self, key, value):
+        self._data[key] = value
+
+    def store_sync(self):
+        self.syncs_count += 1
+        self.written_data = dict(self._data)
+
+
+class TestCoalescingStore(TestCase):
+
+    def setUp(self):
+        from storage import CoalescingStore
+
+        self.kivy_store = FakeKivyStore(data={'answers': {'correct': 0, 'wrong': 0}})
+        # (long delay, so that only explicit flushes write)
+        self.store = CoalescingStore(store=self.kivy_store, delay=60)
+        self.addCleanup(self.store.flush)
+
+    def test_reads_initial_data(self):
+        self.assertEqual(self.store['answers'], {'correct': 0, 'wrong': 0})
+        self.assertEqual(len(self.store), 1)
+
+    def test_writes_coalesced(self):
+        for i in range(10):
+            self.store['answers'] = {'correct': i, 'wrong': 0}
+            self.store['visiting'] = {'consecutive_days': i}
+        self.assertEqual(self.kivy_store.syncs_count, 0)
+        self.assertEqual(self.store['answers']['correct'], 9)
+
+        self.store.flush()
+        self.assertEqual(self.kivy_store.syncs_count, 1)
+        self.assertEqual(self.kivy_store.written_data['answers']['correct'], 9)
+        self.assertEqual(self.kivy_store.written_data['visiting']['consecutive_days'], 9)
+
+    def test_flush_without_changes(self):
+        self.store.flush()
+        self.assertEqual(self.kivy_store.syncs_count, 0)
+
+    def test_data_copy_is_independent(self):
+        dct = self.store.data_copy()
+        dct['answers']['correct'] = 100
+        self.assertEqual(self.store['answers']['correct'], 0)
+
+    def test_setters_concurrent_with_timer(self):
+        import threading
+        import time
+        from storage import CoalescingStore
+
+        kivy_store = FakeKivyStore(data={'answers': {'correct': 0, 'wrong': 0}})
+        sync = kivy_store.store_sync
+        # (slow writes, so that setters run while the timer thread writes)
+        kivy_store.store_sync = lambda: (time.sleep(.001), sync())
+        store = CoalescingStore(store=kivy_store, delay=.001)
+
+        def set_values():
+            for i in range(300):
+                store['answers'] = {'correct': i, 'wrong': 0}
+                store.record_answer(result='wrong')
+
+        setters = [threading.Thread(target=set_values, daemon=True) for _ in range(2)]
+        for setter in setters:
+            setter.start()
+        for setter in setters:
+            setter.join(timeout=10)
+            self.assertFalse(setter.is_alive(), 'Deadlocked')
+        store.flush()
+        self.assertEqual(kivy_store.written_data, store.data_copy())
+
+
+class TestCoalescedWriter(TestCase):
+
+    def test_delayed_write(self):
+        import threading
+        from storage import CoalescedWriter
+
+        written = threading.Event()
+        writer = CoalescedWriter(write_func=written.set, delay=.01)
+        for _ in range(5):
+            writer.mark_dirty()
+        self.assertTrue(written.wait(timeout=5))
+        writer.flush()
+        self.assertEqual(writer.writes_count, 1)
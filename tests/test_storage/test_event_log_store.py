@@ -0,0 +1,108 @@
+from unittest import TestCase
+
+
+class TestEventLogStore(TestCase):
+
+    def setUp(self):
+        import tempfile
+        from storage import EventLogStore
+
+        self.EventLogStore = EventLogStore
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.initial_data = {
+            'addition': {'1': 0, '2': 0},
+            'answers': {'correct': 0, 'wrong': 0, 'skipped': 0},
+            'visiting': {'last_day': 0, 'consecutive_days': 0},
+        }
+
+    def _new_store(self, **kwargs):
+        store = self.EventLogStore(directory=self.temp_dir.name, initial_data=self.initial_data, **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+    def _record_some_events(self, store):
+        store.record_answer(result='correct', op_type='addition', difficulty_lvl='2')
+        store.record_answer(result='correct', op_type='addition', difficulty_lvl='2')
+        store.record_answer(result='wrong')
+        store.record_answer(result='skipped')
+        store['visiting'] = {'last_day': '2022-03-07', 'consecutive_days': 1}
+
+    def _assert_contents_after_events(self, store):
+        self.assertEqual(store['addition'], {'1': 0, '2': 2})
+        self.assertEqual(store['answers'], {'correct': 2, 'wrong': 1, 'skipped': 1})
+        self.assertEqual(store['visiting']['consecutive_days'], 1)
+
+    def test_in_memory_contents(self):
+        store = self._new_store()
+        self._record_some_events(store)
+        self._assert_contents_after_events(store)
+
+    def test_replay(self):
+        store = self._new_store()
+        self._record_some_events(store)
+        store.close()
+        self._assert_contents_after_events(self._new_store())
+
+    def test_replay_after_compaction(self):
+        store = self._new_store(compact_every=3)
+        self._record_some_events(store)
+        store.close()
+        self._assert_contents_after_events(self._new_store())
+
+    def test_snapshot_rename_synced_before_log_emptied(self):
+        from unittest import mock
+        import os
+        import storage
+
+        store = self._new_store()
+        self._record_some_events(store)
+        log_sizes = []
+        with mock.patch.object(storage, 'fsync_directory',
+                               side_effect=lambda path: log_sizes.append(os.path.getsize(store.log_path))) as fsync:
+            store.compact()
+        fsync.assert_called_once_with(self.temp_dir.name)
+        self.assertGreater(log_sizes[0], 0)
+        self.assertEqual(os.path.getsize(store.log_path), 0)
+
+    def test_unchanged_set_not_logged(self):
+        import os
+
+        store = self._new_store()
+        store['answers'] = dict(self.initial_data['answers'])
+        self.assertEqual(os.path.getsize(store.log_path), 0)
+        self.assertEqual(store.writes_count, 0)
+
+    def test_writes_count(self):
+        store = self._new_store()
+        self._record_some_events(store)
+        # (a single appended event per answer)
+        self.assertEqual(store.writes_count, 5)
+
+    def test_partly_written_event_ignored(self):
+        store = self._new_store()
+        self._record_some_events(store)
+        store.close()
+        with open(store.log_path, 'a') as f:
+            f.write('{"event": "answer", "result": "wro')
+
+        store = self._new_store()
+        self._assert_contents_after_events(store)
+        store.record_answer(result='wrong')
+        store.close()
+        self.assertEqual(self._new_store()['answers']['wrong'], 2)
+
+    def test_events_in_snapshot_not_applied_twice(self):
+        import shutil
+
+        store = self._new_store()
+        self._record_some_events(store)
+        store.flush()
+        # Crash after the snapshot is written, but before the log is emptied.
+        log_copy_path = store.log_path + '.copy'
+        shutil.copy(store.log_path, log_copy_path)
+        store.compact()
+        store.close()
+        shutil.move(log_copy_path, store.log_path)
+
+        self._assert_contents_after_events(self._new_store())
@@ -0,0 +1,133 @@
+from unittest import TestCase
+
+
+class TestSQLiteStore(TestCase):
+
+    def setUp(self):
+        import os
+        import tempfile
+        from storage import SQLiteDatabase
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = os.path.join(self.temp_dir.name, SQLiteDatabase.FILE_NAME)
+        self.initial_data = {
+            'addition': {'1': 0, '2': 0},
+            'answers': {'correct': 0, 'wrong': 0, 'skipped': 0},
+            'visiting': {'last_day': 0, 'consecutive_days': 0},
+        }
+
+    def _new_database(self, **kwargs):
+        from storage import SQLiteDatabase
+
+        database = SQLiteDatabase(path=self.path, **kwargs)
+        self.addCleanup(database.close)
+        return database
+
+    def _record_some_events(self, store):
+        store.record_answer(result='correct', op_type='addition', difficulty_lvl='2')
+        store.record_answer(result='correct', op_type='addition', difficulty_lvl='2')
+        store.record_answer(result='wrong')
+        store['visiting'] = {'last_day': '2022-03-07', 'consecutive_days': 1}
+
+    def _assert_contents_after_events(self, store):
+        self.assertEqual(store['addition'], {'1': 0, '2': 2})
+        self.assertEqual(store['answers'], {'correct': 2, 'wrong': 1, 'skipped': 0})
+        self.assertEqual(store['visiting'], {'last_day': '2022-03-07', 'consecutive_days': 1})
+
+    def test_in_memory_contents(self):
+        store = self._new_database().profile_store(profile='a', initial_data=self.initial_data)
+        self._record_some_events(store)
+        self._assert_contents_after_events(store)
+
+    def test_reopen(self):
+        database = self._new_database()
+        self._record_some_events(database.profile_store(profile='a', initial_data=self.initial_data))
+        database.close()
+
+        store = self._new_database().profile_store(profile='a', initial_data=self.initial_data)
+        self._assert_contents_after_events(store)
+
+    def test_missing_counters_created(self):
+        database = self._new_database()
+        # (e.g. stored before a difficulty was added)
+        database.profile_store(profile='a', initial_data={'answers': {'correct': 0}})
+        database.close()
+
+        store = self._new_database().profile_store(profile='a', initial_data=self.initial_data)
+        store.record_answer(result='correct', op_type='addition', difficulty_lvl='1')
+        store.record_answer(result='skipped')
+        store.close()
+
+        data = self._new_database().read_profile('a')
+        self.assertEqual(data['addition']['1'], 1)
+        self.assertEqual(data['answers']['skipped'], 1)
+
+    def test_uncommitted_changes_not_visible_to_other_connections(self):
+        database = self._new_database(batch_size=1000)
+        store = database.profile_store(profile='a', initial_data=self.initial_data)
+        store.flush()
+        store.record_answer(result='wrong')
+
+        other_database = self._new_database()
+        self.assertEqual(other_database.read_profile('a')['answers']['wrong'], 0)
+        store.flush()
+        self.assertEqual(other_database.read_profile('a')['answers']['wrong'], 1)
+
+    def test_profiles_independent(self):
+        database = self._new_database()
+        store_a = database.profile_store(profile='a', initial_data=self.initial_data)
+        store_b = database.profile_store(profile='b', initial_data=self.initial_data)
+        self._record_some_events(store_a)
+
+        self.assertEqual(sorted(database.profiles()), ['a', 'b'])
+        self.assertEqual(database.read_profile('b'), self.initial_data)
+        self.assertEqual(store_b.data_copy(), self.initial_data)
+
+    def test_close_keeps_shared_database_open(self):
+        database = self._new_database()
+        store = database.profile_store(profile='a', initial_data=self.initial_data)
+        self._record_some_events(store)
+        store.close()
+        self.assertFalse(database.closed)
+        self.assertEqual(database.read_profile('a')['answers']['wrong'], 1)
+
+    def test_wal_mode(self):
+        database = self._new_database()
+        self.assertEqual(database.connection.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+
+
+class TestOpenStore(TestCase):
+
+    def test_backends_equivalent(self):
+        import tempfile
+        from storage import open_store
+
+        initial_data = {'addition': {'1': 0}, 'answers': {'correct': 0, 'wrong': 0, 'skipped': 0}}
+        for backend in ('event_log', 'sqlite'):
+            with tempfile.TemporaryDirectory() as temp_dir:
+                store = open_store(backend=backend, directory=temp_dir, initial_data=initial_data)
+                store.record_answer(result='correct', op_type='addition', difficulty_lvl='1')
+                store.close()
+
+                store = open_store(backend=backend, directory=temp_dir, initial_data=initial_data)
+                self.assertEqual(store.data_copy(), {'addition': {'1': 1},
+                                                     'answers': {'correct': 1, 'wrong': 0, 'skipped': 0}})
+                store.close()
+
+    def test_sqlite_database_closed_with_store(self):
+        import tempfile
+        from storage import open_store
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = open_store(backend='sqlite', directory=temp_dir, initial_data={'answers': {'correct': 0}})
+            store.close()
+            self.assertTrue(store.database.closed)
+
+    def test_unknown_backend(self):
+        import tempfile
+        from storage import open_store
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with self.assertRaises(ValueError):
+                open_store(backend='xml', directory=temp_dir, initial_data={})